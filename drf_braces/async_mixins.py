@@ -0,0 +1,115 @@
+"""
+Async variants of view mixins for validating requests without blocking the event loop.
+
+.. note::
+    This module requires Python 3 and ``asgiref`` (which Django 3.0+ depends on).
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+import asyncio
+import itertools
+from collections import OrderedDict
+
+from rest_framework.exceptions import ValidationError
+
+from .mixins import MapDataViewMixin, MultipleSerializersViewMixin, StreamingListViewMixin
+from .serializers.async_validation import AsyncValidationSerializerMixin, run_sync
+
+
+class AsyncMapDataViewMixin(MapDataViewMixin):
+    """
+    ``MapDataViewMixin`` which parses and maps request data in a worker thread.
+    """
+
+    async def aget_data(self, mapper_class=None):
+        return await run_sync(self.get_data, mapper_class)
+
+
+class AsyncValidationViewMixin(MultipleSerializersViewMixin):
+    """
+    Validate request data with ``ais_valid()`` of serializers.
+
+    Serializers without ``AsyncValidationSerializerMixin``
+    are validated in a worker thread instead.
+    Request data is parsed (and mapped by ``AsyncMapDataViewMixin``)
+    in a worker thread as well.
+
+    ``avalidate()`` is meant to be awaited by async request handlers
+    (e.g. when view is served under ASGI by an async-capable API view)::
+
+        serializer = await self.avalidate(serializer_class=FooSerializer)
+    """
+
+    async def aget_request_data(self):
+        if isinstance(self, AsyncMapDataViewMixin):
+            return await self.aget_data()
+        return await run_sync(lambda: self.request.data)
+
+    async def avalidate(self, data=None, serializer_class=None, raise_exception=True, **kwargs):
+        """
+        Get serializer of request data (or given data) once it is validated.
+        """
+        if data is None:
+            data = await self.aget_request_data()
+
+        serializer = self.get_serializer(data=data, serializer_class=serializer_class, **kwargs)
+
+        if isinstance(serializer, AsyncValidationSerializerMixin):
+            await serializer.ais_valid(raise_exception=raise_exception)
+        else:
+            await run_sync(serializer.is_valid, raise_exception=raise_exception)
+
+        return serializer
+
+
+class AsyncStreamingListViewMixin(StreamingListViewMixin):
+    """
+    ``StreamingListViewMixin`` which validates records concurrently.
+
+    Up to ``validation_concurrency`` records are read from the request
+    (in a worker thread since request body is read synchronously)
+    and validated concurrently at a time, hence memory usage stays bounded.
+    Records are still yielded in order.
+    """
+    validation_concurrency = 100
+
+    async def aget_validated_records(self, records=None):
+        """
+        Async generator of validated data of each record.
+
+        Same as ``get_validated_records()``, errors are collected
+        and ``ValidationError`` keyed by record index is raised
+        once all records are consumed (or at the first invalid record
+        when ``fail_fast`` is set).
+        """
+        if records is None:
+            records = await run_sync(self.get_records)
+        records = iter(records)
+
+        child = self.get_serializer(many=True).child
+        errors = OrderedDict()
+        index = 0
+
+        while True:
+            batch = await run_sync(lambda: list(itertools.islice(records, self.validation_concurrency)))
+            if not batch:
+                break
+
+            results = await asyncio.gather(*[self.avalidate_record(child, i) for i in batch], return_exceptions=True)
+            for result in results:
+                if isinstance(result, ValidationError):
+                    errors[index] = result.detail
+                    if self.fail_fast:
+                        raise ValidationError(errors)
+                elif isinstance(result, BaseException):
+                    raise result
+                else:
+                    yield result
+                index += 1
+
+        if errors:
+            raise ValidationError(errors)
+
+    async def avalidate_record(self, child, record):
+        if isinstance(child, AsyncValidationSerializerMixin):
+            return await child.arun_validation(record)
+        return await run_sync(child.run_validation, record)
@@ -0,0 +1,177 @@
+from __future__ import absolute_import, print_function, unicode_literals
+import zlib
+from collections import deque
+
+import six
+from rest_framework.exceptions import ParseError, UnsupportedMediaType
+
+
+# zlib window bits for each supported content encoding
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+ZLIB_WBITS = zlib.MAX_WBITS
+RAW_DEFLATE_WBITS = -zlib.MAX_WBITS
+
+CONTENT_ENCODINGS = {
+    'gzip': GZIP_WBITS,
+    'x-gzip': GZIP_WBITS,
+    'deflate': ZLIB_WBITS,
+}
+IDENTITY = 'identity'
+
+
+class DecompressionError(ParseError):
+    """
+    Raised when compressed request body is invalid or too large.
+    """
+    default_detail = 'Invalid compressed request body.'
+
+
+class DecompressingStream(object):
+    """
+    File-like object which decompresses another stream as it is read.
+
+    Compressed data is read and decompressed one chunk at a time
+    and each decompression step is limited to ``chunk_size`` output bytes.
+    Hence memory stays proportional to the chunk size regardless
+    of the compression ratio and ``max_size`` is enforced as soon
+    as it is exceeded so that compression bombs are rejected early
+    without being fully decompressed.
+
+    Args:
+        stream: File-like object with ``read(size)`` returning compressed bytes
+        wbits (int): zlib window bits of the compression format.
+            For ``deflate`` both zlib and raw deflate data are accepted
+            since clients are known to send either.
+        max_size (int): Maximum number of decompressed bytes
+        chunk_size (int): Number of bytes read and decompressed at a time
+    """
+    chunk_size = 64 * 1024
+
+    def __init__(self, stream, wbits=GZIP_WBITS, max_size=None, chunk_size=None):
+        self.stream = stream
+        self.wbits = wbits
+        self.max_size = max_size
+        self.chunk_size = chunk_size or self.chunk_size
+
+        self.decompressor = None
+        # decompressed chunks which were not read yet
+        # (collected and joined once so reads are linear in size)
+        self.chunks = deque()
+        # number of bytes of the first chunk which were already read
+        self.offset = 0
+        # number of buffered bytes which were not read yet
+        self.buffered = 0
+        # compressed data left after previous gzip member
+        self.pending = b''
+        # number of decompressed bytes
+        self.size = 0
+        self.eof = False
+
+    def error(self, message):
+        return DecompressionError('Content decoding error - {}'.format(message))
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            while not self.eof:
+                self.fill()
+            size = self.buffered
+        else:
+            while self.buffered < size and not self.eof:
+                self.fill()
+        return self.take(size)
+
+    def take(self, size):
+        """
+        Remove up to ``size`` bytes from the front of the buffered chunks.
+        """
+        size = min(size, self.buffered)
+        self.buffered -= size
+        parts = []
+        while size:
+            chunk = self.chunks[0]
+            available = len(chunk) - self.offset
+            if available > size:
+                parts.append(chunk[self.offset:self.offset + size])
+                self.offset += size
+                break
+            parts.append(chunk[self.offset:] if self.offset else chunk)
+            self.chunks.popleft()
+            self.offset = 0
+            size -= available
+        return b''.join(parts)
+
+    def fill(self):
+        """
+        Decompress next chunk into the buffer.
+        """
+        if self.pending:
+            data, self.pending = self.pending, b''
+        elif self.decompressor is not None and self.decompressor.unconsumed_tail:
+            data = self.decompressor.unconsumed_tail
+        else:
+            data = self.stream.read(self.chunk_size)
+            if not data:
+                self.eof = True
+                if self.decompressor is not None and not self.decompressor.eof:
+                    raise self.error('Truncated compressed data')
+                return
+
+        if self.decompressor is None:
+            self.decompressor = zlib.decompressobj(self.get_wbits(data))
+        elif self.decompressor.eof:
+            # gzip allows multiple concatenated members
+            if self.wbits != GZIP_WBITS:
+                raise self.error('Extra data after compressed data')
+            self.decompressor = zlib.decompressobj(self.wbits)
+
+        try:
+            chunk = self.decompressor.decompress(data, self.chunk_size)
+        except zlib.error as e:
+            raise self.error(six.text_type(e))
+
+        if self.decompressor.eof:
+            self.pending = self.decompressor.unused_data
+
+        self.size += len(chunk)
+        if self.max_size is not None and self.size > self.max_size:
+            raise self.error('Maximum decompressed size of {} bytes exceeded'.format(self.max_size))
+        if chunk:
+            self.chunks.append(chunk)
+            self.buffered += len(chunk)
+
+    def get_wbits(self, data):
+        if self.wbits != ZLIB_WBITS or len(data) < 2:
+            return self.wbits
+        # zlib header has deflate compression method
+        # and its first two bytes are a multiple of 31
+        first, second = six.indexbytes(data, 0), six.indexbytes(data, 1)
+        if first & 0x0f == 8 and (first << 8 | second) % 31 == 0:
+            return ZLIB_WBITS
+        return RAW_DEFLATE_WBITS
+
+
+def get_decompressed_stream(stream, content_encoding, max_size=None, chunk_size=None):
+    """
+    Wrap stream to decompress it according to its ``Content-Encoding``.
+
+    Multiple encodings are decoded in reverse order in which they were applied.
+
+    Raises:
+        UnsupportedMediaType: When any of the encodings is not supported.
+    """
+    encodings = [i.strip().lower() for i in (content_encoding or '').split(',')]
+
+    for encoding in reversed([i for i in encodings if i and i != IDENTITY]):
+        if encoding not in CONTENT_ENCODINGS:
+            raise UnsupportedMediaType(
+                content_encoding,
+                detail='Unsupported content encoding "{}" in request.'.format(encoding),
+            )
+        stream = DecompressingStream(
+            stream,
+            wbits=CONTENT_ENCODINGS[encoding],
+            max_size=max_size,
+            chunk_size=chunk_size,
+        )
+
+    return stream
@@ -1,5 +1,44 @@
 from __future__ import absolute_import, print_function, unicode_literals
+import importlib
+import sys
 
-from ._fields import *  # noqa
-from .custom import *  # noqa
-from .modified import *  # noqa
+
+# submodules in order of precedence as fields in
+# latter submodules overwrite fields with the same name
+SUBMODULES = ['_fields', 'custom', 'modified']
+
+
+def _get_submodules():
+    return [importlib.import_module('.' + i, __name__) for i in SUBMODULES]
+
+
+def __getattr__(name):
+    """
+    Lazily import fields from submodules on first access (PEP 562).
+    """
+    if name == '__all__':
+        value = sorted({i for module in _get_submodules() for i in module.__all__})
+    else:
+        for module in reversed(_get_submodules()):
+            if name in module.__all__:
+                value = getattr(module, name)
+                break
+        else:
+            raise AttributeError(
+                'module {!r} has no attribute {!r}'.format(__name__, name)
+            )
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__getattr__('__all__')))
+
+
+if sys.version_info < (3, 7):
+    # module __getattr__ is not supported
+    # so all fields have to be imported eagerly
+    from ._fields import *  # noqa
+    from .custom import *  # noqa
+    from .modified import *  # noqa
@@ -1,11 +1,15 @@
 from __future__ import absolute_import, print_function, unicode_literals
 import inspect
+import sys
+import threading
 
-from rest_framework import fields
-from rest_framework.fields import *  # noqa
-from rest_framework.fields import _UnvalidatedField  # noqa
+from rest_framework import fields as drf_fields
 
-from .mixins import AllowBlankNullFieldMixin, EmptyStringFieldMixin
+from .mixins import (
+    AllowBlankNullFieldMixin,
+    EmptyStringFieldMixin,
+    SharedValidatorsFieldMixin,
+)
 
 
 FIELDS = [
@@ -32,18 +36,74 @@ FIELDS = [
     'UUIDField',
 ]
 
+# fields which construct regex-based validators
+# which are then interned in the shared validator registry
+REGEX_FIELDS = [
+    'EmailField',
+    'IPAddressField',
+    'RegexField',
+    'SlugField',
+    'URLField',
+]
+
+BASE_CLASSES = (EmptyStringFieldMixin, AllowBlankNullFieldMixin)
+
+_lock = threading.Lock()
+
 
 def get_updated_fields(fields, base_classes):
-    fields = [globals()[i] for i in fields]
     return {
-        field.__name__: type(field.__name__, base_classes + (field,), {})
-        for field in fields
+        name: type(str(name), base_classes + (getattr(drf_fields, name),), {})
+        for name in fields
     }
 
 
-locals().update(
-    get_updated_fields(FIELDS, (EmptyStringFieldMixin, AllowBlankNullFieldMixin))
-)
+def get_updated_field(name):
+    """
+    Generate braces version of DRF field by adding braces mixins to it.
+    """
+    base_classes = BASE_CLASSES
+    if name in REGEX_FIELDS:
+        base_classes = (SharedValidatorsFieldMixin,) + base_classes
+    return get_updated_fields([name], base_classes)[name]
+
+
+def __getattr__(name):
+    """
+    Lazily generate braces fields on first access (PEP 562).
+
+    Any other attribute is looked up in DRF fields as this module
+    is meant to be used as drop-in replacement for ``rest_framework.fields``.
+    """
+    if name in FIELDS:
+        with _lock:
+            if name not in globals():
+                globals()[name] = get_updated_field(name)
+        return globals()[name]
+
+    try:
+        return getattr(drf_fields, name)
+    except AttributeError:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name)
+        )
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+__all__ = sorted(set(FIELDS) | {
+    name for name, value in vars(drf_fields).items()
+    if not name.startswith('_') and inspect.isclass(value) and issubclass(value, drf_fields.Field)
+})
+
+
+if sys.version_info < (3, 7):
+    # module __getattr__ is not supported
+    # so all fields have to be generated eagerly
+    from rest_framework.fields import *  # noqa
+    from rest_framework.fields import _UnvalidatedField  # noqa
 
-__all__ = [name for name, value in locals().items()
-           if inspect.isclass(value) and issubclass(value, fields.Field)]
+    for _name in FIELDS:
+        globals()[_name] = get_updated_field(_name)
@@ -1,11 +1,17 @@
 from __future__ import absolute_import, print_function, unicode_literals
-import inspect
+import json
 from decimal import Decimal, getcontext
 
-import pytz
 import six
 from django.utils.translation import gettext as _
-
+from rest_framework.fields import empty
+
+from ..jsonbackends import RawJSON
+from ..uploads import (
+    IMAGE_CONTENT_TYPES,
+    StreamingUploadValidator,
+    UploadRejected,
+)
 from . import _fields as fields
 from .mixins import ValueAsTextFieldMixin
 
@@ -36,6 +42,8 @@ class UTCDateTimeField(fields.DateTimeField):
     """
 
     def __init__(self, *args, **kwargs):
+        import pytz
+
         kwargs.setdefault('default_timezone', pytz.utc)
         super(UTCDateTimeField, self).__init__(*args, **kwargs)
 
@@ -103,5 +111,139 @@ class RoundedDecimalField(fields.DecimalField):
         )
 
 
-__all__ = [name for name, value in locals().items()
-           if inspect.isclass(value) and issubclass(value, fields.Field)]
+class StreamingFileField(fields.FileField):
+    """
+    FileField which validates the upload by streaming it in chunks.
+
+    Size limit and content type (as sniffed from the leading bytes
+    of the file rather than trusting client-provided content type)
+    are checked while the file is being read chunk by chunk
+    so invalid files are rejected as soon as possible.
+
+    When used together with ``StreamingValidationUploadHandler``,
+    the same checks are done while the request is being received
+    and uploads it rejected are reported by this field.
+    """
+    default_error_messages = {
+        'max_upload_size': _('Ensure this file size is not greater than {max_upload_size} bytes.'),
+        'invalid_content_type': _('Unsupported file type.'),
+    }
+    chunk_size = 64 * 1024
+    validate_image = False
+
+    def __init__(self, max_upload_size=None, allowed_content_types=None, *args, **kwargs):
+        self.max_upload_size = max_upload_size
+        self.allowed_content_types = allowed_content_types
+        super(StreamingFileField, self).__init__(*args, **kwargs)
+
+    def get_stream_validator(self):
+        return StreamingUploadValidator(
+            max_size=self.max_upload_size,
+            allowed_content_types=self.allowed_content_types,
+            image=self.validate_image,
+        )
+
+    def validate_empty_values(self, data):
+        if data is empty:
+            request = self.context.get('request')
+            rejected = getattr(request, 'rejected_uploads', {})
+            if self.field_name in rejected:
+                self.fail_rejected(rejected[self.field_name])
+        return super(StreamingFileField, self).validate_empty_values(data)
+
+    def to_internal_value(self, data):
+        data = super(StreamingFileField, self).to_internal_value(data)
+
+        # size of uploaded files is known upfront
+        # so when its within limit, only the header needs to be read
+        size = getattr(data, 'size', None)
+        if self.max_upload_size is not None and size is not None and size > self.max_upload_size:
+            self.fail('max_upload_size', max_upload_size=self.max_upload_size)
+        size_verified = self.max_upload_size is None or size is not None
+
+        validator = self.get_stream_validator()
+        try:
+            for chunk in data.chunks(self.chunk_size):
+                validator.feed(chunk)
+                if size_verified and not validator.needs_header:
+                    break
+            validator.finish()
+        except UploadRejected as e:
+            self.fail_rejected(e)
+        finally:
+            data.seek(0)
+
+        self.validate_stream_result(validator)
+        return data
+
+    def validate_stream_result(self, validator):
+        """
+        Hook for additional validation once upload is streamed.
+        """
+
+    def fail_rejected(self, error):
+        self.fail(error.code, **error.params)
+
+
+class StreamingImageField(StreamingFileField):
+    """
+    Same as ``StreamingFileField`` except it requires a valid image.
+
+    Unlike DRF's ``ImageField``, image is validated by only parsing
+    its header (which includes image dimensions) rather than decoding
+    the whole image hence Pillow is not required.
+    Supported formats are PNG, GIF, JPEG, BMP and WEBP.
+    """
+    default_error_messages = {
+        'invalid_image': _(
+            'Upload a valid image. The file you uploaded was either '
+            'not an image or a corrupted image.'
+        ),
+        'max_image_pixels': _('Ensure this image has at most {max_image_pixels} pixels.'),
+    }
+    validate_image = True
+
+    def __init__(self, max_image_pixels=None, *args, **kwargs):
+        self.max_image_pixels = max_image_pixels
+        kwargs.setdefault('allowed_content_types', IMAGE_CONTENT_TYPES)
+        super(StreamingImageField, self).__init__(*args, **kwargs)
+
+    def get_stream_validator(self):
+        validator = super(StreamingImageField, self).get_stream_validator()
+        validator.max_image_pixels = self.max_image_pixels
+        return validator
+
+
+class RawJSONField(fields.Field):
+    """
+    Field for JSON which is stored already encoded (e.g. in a text column).
+
+    Stored JSON is represented as ``RawJSON`` which drf-braces renderers
+    output verbatim without decoding and re-encoding it.
+    Input can be any JSON value which is encoded to JSON text.
+    """
+    default_error_messages = {
+        'invalid': _('Value must be valid JSON.'),
+    }
+
+    def to_internal_value(self, data):
+        try:
+            return json.dumps(data)
+        except (TypeError, ValueError):
+            self.fail('invalid')
+
+    def to_representation(self, value):
+        return RawJSON(value)
+
+
+__all__ = [
+    'NonValidatingChoiceField',
+    'NumericField',
+    'PositiveIntegerField',
+    'RawJSONField',
+    'RoundedDecimalField',
+    'StreamingFileField',
+    'StreamingImageField',
+    'UTCDateTimeField',
+    'UnvalidatedField',
+]
@@ -1,7 +1,11 @@
 from __future__ import absolute_import, print_function, unicode_literals
+import re
 
 import six
-from rest_framework.fields import CharField, empty
+from django.core.validators import MaxValueValidator, MinValueValidator
+from rest_framework.fields import CharField, IntegerField, empty
+
+from .validators import shared_validators
 
 
 class EmptyStringFieldMixin(object):
@@ -36,7 +40,21 @@ class AllowBlankNullFieldMixin(object):
                 self.allow_null = True
 
 
+# digit strings which survive int/text round-trip unchanged
+# hence no sign, whitespace, decimals or leading zeros
+CANONICAL_DIGITS = re.compile(r'^[1-9][0-9]*\Z')
+
+
+def _is_stock_method(klass, name, reference):
+    return (six.get_unbound_function(getattr(klass, name))
+            is six.get_unbound_function(getattr(reference, name)))
+
+
 class ValueAsTextFieldMixin(object):
+    # when mixed into IntegerField, canonical digit strings
+    # are validated without the int/text round-trip
+    digit_string_fast_path = True
+
     def to_string_value(self, data):
         if data:
             return six.text_type(data)
@@ -51,8 +69,101 @@ class ValueAsTextFieldMixin(object):
             return value
 
         value = self.prepare_value_for_validation(value)
+        if self.is_valid_digit_string(value):
+            return six.text_type(value)
+
         value = self.to_internal_value(value)
         self.run_validators(value)
         value = self.to_string_value(value)
 
         return value
+
+    def is_valid_digit_string(self, value):
+        """
+        Check whether value is a canonical digit string which passes validation.
+
+        Canonical digit strings are returned unchanged by the int/text
+        round-trip done in ``run_validation`` so when such value is
+        within the field bounds, the round-trip can be skipped altogether.
+        Any other value, including digit strings out of bounds,
+        goes through regular validation which then reports any errors.
+        """
+        if not self.digit_string_fast_path or not isinstance(value, six.string_types):
+            return False
+        if len(value) > getattr(self, 'MAX_STRING_LENGTH', 0) or not CANONICAL_DIGITS.match(value):
+            return False
+
+        bounds = self.get_digit_string_bounds()
+        if bounds is None:
+            return False
+
+        length = len(value)
+        for is_min, limit in bounds:
+            if is_min:
+                if length < len(limit) or (length == len(limit) and value < limit):
+                    return False
+            elif length > len(limit) or (length == len(limit) and value > limit):
+                return False
+
+        return True
+
+    def get_digit_string_bounds(self):
+        """
+        Get bounds of canonical digit strings as ``[(is_min, digits)]``.
+
+        Bounds are derived from the field validators and are cached
+        until validators change. ``None`` is returned when validation
+        cannot be done on digit strings alone such as when the field
+        has custom validators or overrides conversion methods.
+        """
+        validators = tuple(self.validators)
+        cached = self.__dict__.get('_digit_string_bounds')
+        if cached is not None and cached[0] == validators:
+            return cached[1]
+
+        bounds = self._compute_digit_string_bounds(validators)
+        self._digit_string_bounds = (validators, bounds)
+        return bounds
+
+    def _compute_digit_string_bounds(self, validators):
+        klass = type(self)
+        if not all([isinstance(self, IntegerField),
+                    _is_stock_method(klass, 'to_internal_value', IntegerField),
+                    _is_stock_method(klass, 'run_validators', IntegerField),
+                    _is_stock_method(klass, 'to_string_value', ValueAsTextFieldMixin)]):
+            return None
+
+        bounds = []
+        for validator in validators:
+            limit = getattr(validator, 'limit_value', None)
+            if any([type(validator) not in (MinValueValidator, MaxValueValidator),
+                    isinstance(limit, bool),
+                    not isinstance(limit, six.integer_types)]):
+                return None
+
+            if type(validator) is MinValueValidator:
+                # all canonical digit strings are >= 1
+                if limit > 1:
+                    bounds.append((True, six.text_type(limit)))
+            else:
+                # no canonical digit string can be valid
+                if limit < 1:
+                    return None
+                bounds.append((False, six.text_type(limit)))
+
+        return bounds
+
+
+class SharedValidatorsFieldMixin(object):
+    """
+    Field mixin which interns field validators in a shared registry.
+
+    Identical validators (and their compiled regexes) are then shared
+    between all field instances, including copies serializers make,
+    instead of each instance constructing and compiling its own.
+    """
+    validator_registry = shared_validators
+
+    def __init__(self, *args, **kwargs):
+        super(SharedValidatorsFieldMixin, self).__init__(*args, **kwargs)
+        self.validators = self.validator_registry.intern_all(self.validators)
@@ -1,5 +1,4 @@
 from __future__ import absolute_import, print_function, unicode_literals
-import inspect
 
 from . import _fields as fields
 
@@ -37,5 +36,8 @@ class DateTimeField(fields.DateTimeField):
                 self.default_timezone = kwargs['default_timezone']
 
 
-__all__ = [name for name, value in locals().items()
-           if inspect.isclass(value) and issubclass(value, fields.Field)]
+__all__ = [
+    'BooleanField',
+    'DateTimeField',
+    'DecimalField',
+]
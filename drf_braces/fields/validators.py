@@ -0,0 +1,113 @@
+from __future__ import absolute_import, print_function, unicode_literals
+import re
+
+import six
+from django.core.validators import RegexValidator
+from django.utils.functional import Promise
+
+from ..utils import LRUCache
+
+
+REGEX_TYPE = type(re.compile(''))
+
+# static validators (email, url, slug, etc) only produce a handful
+# of distinct keys so the limit is mostly relevant
+# for dynamically supplied RegexField patterns
+DEFAULT_REGISTRY_SIZE = 512
+
+
+def _freeze(value):
+    """
+    Convert validator constructor argument to a hashable registry key.
+
+    Lazy translation strings are keyed by their identity
+    since evaluating them depends on the currently active language.
+    DRF fields get them from class-level ``default_error_messages``
+    hence all instances of the same field share the same objects.
+    """
+    if isinstance(value, REGEX_TYPE):
+        return ('pattern', value.pattern, value.flags)
+    if isinstance(value, Promise):
+        return ('promise', id(value))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return (type(value).__name__,) + tuple(_freeze(i) for i in value)
+    if isinstance(value, dict):
+        return ('dict',) + tuple(sorted(
+            (k, _freeze(v)) for k, v in value.items()
+        ))
+    try:
+        hash(value)
+    except TypeError:
+        return ('id', id(value))
+    return value
+
+
+class ValidatorRegistry(object):
+    """
+    Registry which interns identical validator instances and compiled regexes.
+
+    Django validators are immutable once constructed hence identical
+    validators can be safely shared between all field instances.
+    That includes field copies DRF makes when instantiating serializers
+    since ``Field.__deepcopy__`` re-instantiates the field.
+
+    Only deconstructible validators (all Django validators are) are interned.
+    Any other validators (e.g. plain functions) are returned as-is.
+
+    Args:
+        maxsize (int): Maximum number of validators and compiled patterns
+            to keep. Least recently used ones are evicted first.
+    """
+
+    def __init__(self, maxsize=DEFAULT_REGISTRY_SIZE):
+        self.validators = LRUCache(maxsize)
+        self.patterns = LRUCache(maxsize)
+
+    def compile(self, regex, flags=0):
+        """
+        Get compiled regex from the registry.
+        """
+        if isinstance(regex, REGEX_TYPE):
+            return regex
+        return self.patterns.get_or_set(
+            (regex, flags), lambda: re.compile(regex, flags)
+        )
+
+    def get_key(self, validator):
+        try:
+            args, kwargs = validator._constructor_args
+        except AttributeError:
+            return None
+        return (type(validator), _freeze(args), _freeze(kwargs))
+
+    def intern(self, validator):
+        """
+        Get canonical validator instance identical to the given ``validator``.
+        """
+        key = self.get_key(validator)
+        if key is None:
+            return validator
+
+        return self.validators.get_or_set(key, lambda: self._prepare(validator))
+
+    def intern_all(self, validators):
+        return [self.intern(i) for i in validators]
+
+    def clear(self):
+        self.validators.clear()
+        self.patterns.clear()
+
+    def _prepare(self, validator):
+        if not isinstance(validator, RegexValidator):
+            return validator
+
+        # RegexValidator lazily compiles regex per instance
+        # so we replace it with a shared compiled pattern instead
+        args, kwargs = validator._constructor_args
+        regex = kwargs.get('regex', args[0] if args else None)
+        if isinstance(regex, six.string_types):
+            validator.regex = self.compile(regex, getattr(validator, 'flags', 0) or 0)
+        return validator
+
+
+shared_validators = ValidatorRegistry()
@@ -1,7 +1,6 @@
 from __future__ import absolute_import, print_function, unicode_literals
 
 import six
-from dateutil.parser import parse
 from django import forms
 from rest_framework import ISO_8601
 
@@ -12,6 +11,8 @@ class ISO8601DateTimeField(forms.DateTimeField):
             return
 
         if isinstance(value, six.string_types) and ISO_8601 in self.input_formats:
+            from dateutil.parser import parse
+
             try:
                 return parse(value)
             except ValueError:
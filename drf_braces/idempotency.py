@@ -0,0 +1,147 @@
+from __future__ import absolute_import, print_function, unicode_literals
+import threading
+import time
+import uuid
+
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .utils import LRUCache
+
+
+class IdempotencyConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _('Request with the same idempotency key is still in progress.')
+    default_code = 'idempotency_conflict'
+
+
+class LocalMemoryIdempotencyStore(object):
+    """
+    In-process store of completed idempotent responses.
+
+    Concurrent duplicates wait for the request which
+    acquired the key to complete. Since locks are in-process,
+    this store only coalesces duplicates handled by the same process.
+
+    Args:
+        maxsize (int): Maximum number of stored responses
+        timeout (int): Number of seconds responses are stored for
+        lock_timeout (int): Number of seconds after which lock expires
+            in case the request holding it never completes
+    """
+
+    def __init__(self, maxsize=1024, timeout=24 * 60 * 60, lock_timeout=60):
+        self.timeout = timeout
+        self.lock_timeout = lock_timeout
+        self._responses = LRUCache(maxsize=maxsize)
+        self._events = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        entry = self._responses.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.time():
+            self._responses.pop(key)
+            return None
+        return value
+
+    def set(self, key, value):
+        self._responses.set(key, (time.time() + self.timeout, value))
+
+    def acquire(self, key):
+        """
+        Acquire lock of the key returning its token or ``None`` when it is already locked.
+        """
+        with self._lock:
+            if key in self._events and self._events[key][0] > time.time():
+                return None
+            token = uuid.uuid4().hex
+            self._events[key] = (time.time() + self.lock_timeout, threading.Event(), token)
+            return token
+
+    def release(self, key, token):
+        """
+        Release lock of the key unless it expired and was acquired by another request.
+        """
+        with self._lock:
+            if self._events.get(key, (None, None, None))[2] != token:
+                return
+            event = self._events.pop(key)[1]
+        event.set()
+
+    def wait(self, key, timeout):
+        """
+        Wait for the request which acquired the key and return its stored response.
+        """
+        with self._lock:
+            expires, event, _ = self._events.get(key, (None, None, None))
+        if event is not None:
+            event.wait(min(timeout, max(expires - time.time(), 0)))
+        return self.get(key)
+
+
+class DjangoCacheIdempotencyStore(object):
+    """
+    Store of completed idempotent responses in Django cache.
+
+    Keys are acquired with atomic ``cache.add()`` hence concurrent
+    duplicates are coalesced across processes when the cache is shared
+    (e.g. memcached or redis). Lock expires after ``lock_timeout``
+    in case the process holding it dies. Lock is only released by
+    the request holding its token although since Django cache has
+    no atomic compare-and-delete, lock which expires right when
+    it is being released can still be released by its previous holder.
+
+    Args:
+        alias (str): Alias of the cache in ``CACHES`` setting
+        timeout (int): Number of seconds responses are stored for
+        lock_timeout (int): Number of seconds after which lock expires
+        poll_interval (float): Number of seconds between checks while waiting
+        key_prefix (str): Prefix of all cache keys
+    """
+
+    def __init__(self, alias='default', timeout=24 * 60 * 60, lock_timeout=60,
+                 poll_interval=0.05, key_prefix='drf-braces-idempotency'):
+        self.alias = alias
+        self.timeout = timeout
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get(self, key):
+        return self.cache.get('{}:{}'.format(self.key_prefix, key))
+
+    def set(self, key, value):
+        self.cache.set('{}:{}'.format(self.key_prefix, key), value, self.timeout)
+
+    def acquire(self, key):
+        token = uuid.uuid4().hex
+        if self.cache.add('{}:lock:{}'.format(self.key_prefix, key), token, self.lock_timeout):
+            return token
+        return None
+
+    def release(self, key, token):
+        lock_key = '{}:lock:{}'.format(self.key_prefix, key)
+        if self.cache.get(lock_key) == token:
+            self.cache.delete(lock_key)
+
+    def wait(self, key, timeout):
+        """
+        Poll until the request which acquired the key completes and return its stored response.
+        """
+        deadline = time.time() + timeout
+        lock_key = '{}:lock:{}'.format(self.key_prefix, key)
+        while self.cache.get(lock_key) is not None and time.time() < deadline:
+            time.sleep(self.poll_interval)
+        return self.get(key)
+
+
+default_idempotency_store = LocalMemoryIdempotencyStore()
@@ -0,0 +1,219 @@
+from __future__ import absolute_import, print_function, unicode_literals
+import json
+import re
+import sys
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+
+JSON_BACKEND_SETTING = 'DRF_BRACES_JSON_BACKEND'
+DEFAULT_JSON_BACKEND = 'drf_braces.jsonbackends.StdlibJSONBackend'
+
+# dicts preserve insertion order since Python 3.7
+ORDERED_DICTS = sys.version_info >= (3, 7)
+
+# integers with this many digits might not fit into 64 bits
+# which some backends parse into floats instead
+BIG_INTEGER = re.compile(r'\d{19}')
+
+_backends = {}
+_lock = threading.Lock()
+
+
+def get_json_backend(path=None):
+    """
+    Get JSON backend instance.
+
+    Args:
+        path (str): Dotted path of the backend class.
+            By default ``DRF_BRACES_JSON_BACKEND`` setting is used
+            which defaults to the stdlib ``json`` backend.
+    """
+    path = path or getattr(settings, JSON_BACKEND_SETTING, DEFAULT_JSON_BACKEND)
+
+    try:
+        return _backends[path]
+    except KeyError:
+        pass
+
+    with _lock:
+        if path not in _backends:
+            try:
+                _backends[path] = import_string(path)()
+            except ImportError as e:
+                raise ImproperlyConfigured(
+                    'Could not load JSON backend {!r}: {}'.format(path, e)
+                )
+        return _backends[path]
+
+
+class RawJSON(object):
+    """
+    Pre-encoded JSON fragment which drf-braces renderers output verbatim.
+
+    Fragment is neither validated nor decoded hence it must be valid JSON.
+
+    Args:
+        json (str): Encoded JSON either as text or UTF-8 bytes
+    """
+    __slots__ = ['json']
+
+    def __init__(self, json):
+        if isinstance(json, bytes):
+            json = json.decode('utf-8')
+        self.json = json
+
+    def __eq__(self, other):
+        return isinstance(other, RawJSON) and self.json == other.json
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.json)
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.json)
+
+
+class JSONBackendMixin(object):
+    """
+    Mixin for parsers and renderers which use configurable JSON backend.
+    """
+    # dotted path of JSON backend class
+    # or None to use DRF_BRACES_JSON_BACKEND setting
+    json_backend = None
+
+    def get_json_backend(self):
+        return get_json_backend(self.json_backend)
+
+
+class BaseJSONBackend(object):
+    """
+    Interface of JSON backends used by parsers and renderers.
+
+    All backends must behave identically to the stdlib ``json`` module
+    as far as the decoded and encoded values are concerned.
+    That includes preserving order of objects, using encoder's
+    ``default()`` for any non-JSON types (e.g. ``Decimal`` and ``datetime``
+    with DRF's encoder) and applying encoder's ``transform()``
+    if it has one (e.g. big integers as strings).
+    Only insignificant formatting such as float notation can differ.
+    """
+
+    def loads(self, s, object_pairs_hook=None):
+        """
+        Decode JSON text.
+        """
+        raise NotImplementedError
+
+    def dumps(self, data, encoder_class=None, indent=None,
+              ensure_ascii=True, allow_nan=True, separators=None):
+        """
+        Encode data into UTF-8 encoded JSON bytes.
+
+        Arguments have the same meaning as in ``json.dumps()``.
+        """
+        raise NotImplementedError
+
+
+class StdlibJSONBackend(BaseJSONBackend):
+    """
+    Backend using the stdlib ``json`` module.
+    """
+
+    def loads(self, s, object_pairs_hook=None):
+        return json.loads(s, object_pairs_hook=object_pairs_hook)
+
+    def dumps(self, data, encoder_class=None, indent=None,
+              ensure_ascii=True, allow_nan=True, separators=None):
+        return json.dumps(
+            data,
+            cls=encoder_class,
+            indent=indent,
+            ensure_ascii=ensure_ascii,
+            allow_nan=allow_nan,
+            separators=separators,
+        ).encode('utf-8')
+
+
+class OrjsonJSONBackend(BaseJSONBackend):
+    """
+    Backend using ``orjson`` which needs to be installed separately.
+
+    ``orjson`` does not support everything the stdlib does
+    in which case this backend falls back to the stdlib backend:
+
+    * parsing into anything else than plain dicts
+      (e.g. ``OrderedDict`` or on Python < 3.7)
+    * parsing integers which do not fit into 64 bits
+      (``orjson`` parses them into floats)
+    * parsing invalid JSON or ``NaN``/``Infinity`` so that
+      errors are reported the same way as the stdlib
+    * encoding with ``ensure_ascii``, indent other than 2 or separators
+      which differ from the ``orjson`` output
+    * encoding integers which do not fit into 64 bits
+      or non-string object keys
+
+    Unlike the stdlib, non-finite floats are always encoded as ``null``.
+    """
+    # separators orjson outputs with and without indent
+    separators = {
+        None: (',', ':'),
+        2: (',', ': '),
+    }
+
+    def __init__(self):
+        import orjson
+
+        self.orjson = orjson
+        self.fallback = StdlibJSONBackend()
+
+    def loads(self, s, object_pairs_hook=None):
+        if any([object_pairs_hook not in (None, dict),
+                not ORDERED_DICTS,
+                BIG_INTEGER.search(s)]):
+            return self.fallback.loads(s, object_pairs_hook=object_pairs_hook)
+
+        try:
+            return self.orjson.loads(s)
+        except ValueError:
+            return self.fallback.loads(s, object_pairs_hook=object_pairs_hook)
+
+    def dumps(self, data, encoder_class=None, indent=None,
+              ensure_ascii=True, allow_nan=True, separators=None):
+        kwargs = dict(
+            encoder_class=encoder_class,
+            indent=indent,
+            ensure_ascii=ensure_ascii,
+            allow_nan=allow_nan,
+            separators=separators,
+        )
+        if any([ensure_ascii,
+                indent not in self.separators,
+                tuple(separators or ()) != self.separators.get(indent)]):
+            return self.fallback.dumps(data, **kwargs)
+
+        encoder = (encoder_class or json.JSONEncoder)(
+            ensure_ascii=ensure_ascii,
+            allow_nan=allow_nan,
+            indent=indent,
+            separators=separators,
+        )
+        option = self.orjson.OPT_PASSTHROUGH_DATETIME | self.orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent:
+            option |= self.orjson.OPT_INDENT_2
+
+        transform = getattr(encoder, 'transform', None)
+
+        try:
+            return self.orjson.dumps(
+                transform(data) if transform else data,
+                default=encoder.default,
+                option=option,
+            )
+        except TypeError:
+            return self.fallback.dumps(data, **kwargs)
@@ -0,0 +1,479 @@
+from __future__ import absolute_import, print_function, unicode_literals
+import codecs
+import json
+import re
+from collections import OrderedDict
+from json.decoder import scanstring
+
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+NUMBER = re.compile(r'(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?')
+# string contents up to the closing quote
+# which are only validated without being decoded
+STRING_BODY = re.compile(r'(?:[^"\\\x00-\x1f]+|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*')
+
+CONSTANTS = {
+    'true': True,
+    'false': False,
+    'null': None,
+    'NaN': float('nan'),
+    'Infinity': float('inf'),
+    '-Infinity': float('-inf'),
+}
+CONSTANT_PREFIXES = {k[0]: k for k in CONSTANTS if k[0] != '-'}
+# longest constant, used to know how much data to look ahead
+MAX_CONSTANT_LENGTH = max(len(i) for i in CONSTANTS)
+
+
+class JSONStreamError(ValueError):
+    """
+    Raised when streamed JSON is invalid or exceeds configured limits.
+    """
+
+
+# returned by ``decode_path()`` when path is not found
+MISSING = object()
+
+# decoder used to validate and skip values, plain dicts are the fastest to build
+_skipping_decoder = json.JSONDecoder()
+
+
+def find_path(text, path, decoder=None):
+    """
+    Find the value at the given path of object keys in JSON text.
+
+    Unlike ``JSONStreamDecoder.decode_path()``, the whole text has to be
+    in memory however members which are not on the path are skipped
+    with the C-accelerated stdlib scanner. Hence when the value is
+    decoded from its text (e.g. by another JSON backend), it costs
+    a fraction of decoding the whole document. The whole document
+    is still validated. Same as ``json.loads()``, when a key
+    is duplicated its last occurrence wins.
+
+    Args:
+        text (str): JSON document
+        path (list): Keys of nested objects to descend into
+        decoder (json.JSONDecoder): Decoder of the found value
+
+    Returns:
+        ``(start, end, value)`` tuple of the span of the value in the text
+        and the decoded value or ``None`` when path is not in the document.
+    """
+    decoder = decoder or _skipping_decoder
+    end, found = _find_path(text, WHITESPACE.match(text, 0).end(), list(path), decoder)
+    end = WHITESPACE.match(text, end).end()
+    if end != len(text):
+        raise ValueError('Extra data: char {}'.format(end))
+    return found
+
+
+def _find_path(text, index, path, decoder):
+    if not path:
+        value, end = decoder.raw_decode(text, index)
+        return end, (index, end, value)
+
+    if text[index:index + 1] != '{':
+        return _skipping_decoder.raw_decode(text, index)[1], None
+
+    found = None
+    index = WHITESPACE.match(text, index + 1).end()
+    if text[index:index + 1] == '}':
+        return index + 1, found
+
+    while True:
+        if text[index:index + 1] != '"':
+            raise ValueError('Expecting property name enclosed in double quotes: char {}'.format(index))
+        key, index = scanstring(text, index + 1)
+        index = WHITESPACE.match(text, index).end()
+        if text[index:index + 1] != ':':
+            raise ValueError("Expecting ':' delimiter: char {}".format(index))
+        index = WHITESPACE.match(text, index + 1).end()
+
+        if key == path[0]:
+            index, value = _find_path(text, index, path[1:], decoder)
+            if value is not None:
+                found = value
+        else:
+            index = _skipping_decoder.raw_decode(text, index)[1]
+
+        index = WHITESPACE.match(text, index).end()
+        char = text[index:index + 1]
+        if char == '}':
+            return index + 1, found
+        elif char != ',':
+            raise ValueError("Expecting ',' delimiter: char {}".format(index))
+        index = WHITESPACE.match(text, index + 1).end()
+
+
+class _Frame(object):
+    """
+    Container which is being decoded.
+
+    Skipped containers only count their members without keeping them.
+    """
+    __slots__ = ['items', 'key', 'is_object', 'count']
+
+    def __init__(self, is_object, skip=False):
+        self.items = None if skip else []
+        self.key = None
+        self.is_object = is_object
+        self.count = 0
+
+
+class JSONStreamDecoder(object):
+    """
+    Incremental JSON decoder which reads the stream in chunks.
+
+    Unlike ``json.loads()`` which needs the whole document in memory
+    as bytes and decoded text before building the result, this decoder
+    reads and decodes the stream chunk by chunk and builds the result
+    as it goes. Therefore peak memory is roughly the size of the result
+    plus a single chunk.
+
+    The decoder enforces limits while parsing so that oversized
+    or pathological documents fail as soon as limits are exceeded.
+    Nesting is tracked with an explicit stack so deeply nested documents
+    cannot exhaust the interpreter stack even without ``max_depth``.
+
+    Decoded values are identical to ``json.loads()`` with given hooks.
+    All errors are raised as ``JSONStreamError`` which is a ``ValueError``
+    just like ``json.loads()`` errors.
+
+    Args:
+        stream: File-like object with ``read(size)`` returning bytes
+        encoding (str): Encoding of the stream
+        chunk_size (int): Number of bytes to read at a time
+        max_size (int): Maximum number of bytes allowed to be read
+        max_depth (int): Maximum nesting depth of arrays and objects
+        max_members (int): Maximum number of members in a single array or object
+        object_pairs_hook (callable): Called with list of ``(key, value)``
+            pairs of each decoded object
+    """
+    chunk_size = 64 * 1024
+
+    def __init__(self, stream, encoding='utf-8', chunk_size=None,
+                 max_size=None, max_depth=None, max_members=None,
+                 object_pairs_hook=OrderedDict):
+        self.stream = stream
+        self.chunk_size = chunk_size or self.chunk_size
+        self.max_size = max_size
+        self.max_depth = max_depth
+        self.max_members = max_members
+        self.object_pairs_hook = object_pairs_hook
+
+        self.decoder = codecs.getincrementaldecoder(encoding)('strict')
+        self.buffer = ''
+        self.position = 0
+        # number of bytes read from the stream
+        self.size = 0
+        # number of characters discarded from the buffer
+        self.offset = 0
+        self.eof = False
+        # whether to keep consumed text in the buffer
+        self.retain = False
+        # repeated object keys share the same string
+        # which is what json.loads() does as well
+        self.memo = {}
+
+    def decode(self):
+        """
+        Decode the whole stream as single JSON document.
+        """
+        value = self.decode_value()
+        if self.peek():
+            raise self.error('Extra data')
+        return value
+
+    def decode_path(self, path):
+        """
+        Decode only the value at the given path of object keys.
+
+        All other members of the document are skipped while tokenizing
+        so no Python objects are built for them although the whole
+        document is still validated.
+        Same as ``json.loads()``, when a key is duplicated its last
+        occurrence wins.
+
+        When ``retain`` is set, the consumed text is kept in the buffer
+        until the path is found so that the whole document can still be
+        decoded from ``buffer`` when it is not.
+
+        Args:
+            path (list): Keys of nested objects to descend into
+
+        Returns:
+            Decoded value or ``MISSING`` when path is not in the document.
+        """
+        value = self._decode_path(list(path), 0)
+        if self.peek():
+            raise self.error('Extra data')
+        return value
+
+    def _decode_path(self, path, depth):
+        if not path:
+            value = self.decode_value(depth)
+            # consumed text is only needed when path is not found
+            self.retain = False
+            return value
+
+        if self.peek() != '{':
+            self.decode_value(depth, skip=True)
+            return MISSING
+
+        self.position += 1
+        self.check_depth(depth)
+        frame = _Frame(is_object=True, skip=True)
+        value = MISSING
+
+        if self.peek() == '}':
+            self.position += 1
+            return value
+
+        while True:
+            self.add(frame, None)
+            if self.decode_key() == path[0]:
+                found = self._decode_path(path[1:], depth + 1)
+                if found is not MISSING:
+                    value = found
+            else:
+                self.decode_value(depth + 1, skip=True)
+
+            char = self.peek()
+            self.position += 1
+            if char == '}':
+                return value
+            elif char != ',':
+                self.position -= 1
+                raise self.error("Expecting ',' delimiter")
+
+    def error(self, message):
+        return JSONStreamError('{}: char {}'.format(message, self.offset + self.position))
+
+    def fill(self):
+        """
+        Read next chunk from the stream into the buffer.
+
+        Already consumed part of the buffer is discarded
+        so the buffer only holds data which is being decoded.
+
+        Returns:
+            ``False`` when stream is exhausted.
+        """
+        if self.eof:
+            return False
+
+        chunk = self.stream.read(self.chunk_size)
+        if chunk:
+            self.size += len(chunk)
+            if self.max_size is not None and self.size > self.max_size:
+                raise self.error('Maximum size of {} bytes exceeded'.format(self.max_size))
+            text = self.decoder.decode(chunk)
+        else:
+            self.eof = True
+            text = self.decoder.decode(b'', True)
+
+        if self.position and not self.retain:
+            self.offset += self.position
+            self.buffer = self.buffer[self.position:]
+            self.position = 0
+        self.buffer += text
+
+        return True
+
+    def ensure(self, length):
+        """
+        Make sure buffer has at least ``length`` characters after current position
+        unless stream is exhausted.
+        """
+        while len(self.buffer) - self.position < length and self.fill():
+            pass
+
+    def peek(self):
+        """
+        Skip whitespace and return next character without consuming it.
+
+        Returns:
+            Next character or empty string when stream is exhausted.
+        """
+        while True:
+            self.position = WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill():
+                return ''
+
+    def expect(self, char, message):
+        if self.peek() != char:
+            raise self.error(message)
+        self.position += 1
+
+    def decode_value(self, depth=0, skip=False):
+        """
+        Decode single JSON value at the current position.
+
+        Args:
+            depth (int): Nesting depth of the value within the document
+            skip (bool): Only validate the value without building it
+
+        Returns:
+            Decoded value or ``None`` when skipping.
+        """
+        stack = []
+
+        while True:
+            char = self.peek()
+
+            if char == '{' or char == '[':
+                self.position += 1
+                self.check_depth(depth + len(stack))
+                frame = _Frame(is_object=char == '{', skip=skip)
+                stack.append(frame)
+
+                if self.peek() != ('}' if frame.is_object else ']'):
+                    if frame.is_object:
+                        frame.key = self.decode_key(skip)
+                    continue
+
+                self.position += 1
+                value = self.build(stack.pop())
+
+            elif skip and char == '"':
+                value = self.skip_string()
+
+            else:
+                value = self.decode_scalar(char)
+
+            # value is decoded so add it to its container
+            # and close all containers which end after it
+            while stack:
+                frame = stack[-1]
+                self.add(frame, value)
+
+                char = self.peek()
+                self.position += 1
+                if char == ',':
+                    if frame.is_object:
+                        frame.key = self.decode_key(skip)
+                    break
+                elif char == ('}' if frame.is_object else ']'):
+                    value = self.build(stack.pop())
+                else:
+                    self.position -= 1
+                    raise self.error("Expecting ',' delimiter")
+            else:
+                return value
+
+    def check_depth(self, depth):
+        if self.max_depth is not None and depth >= self.max_depth:
+            raise self.error('Maximum nesting depth of {} exceeded'.format(self.max_depth))
+
+    def add(self, frame, value):
+        if self.max_members is not None and frame.count >= self.max_members:
+            raise self.error('Maximum number of {} members exceeded'.format(self.max_members))
+        frame.count += 1
+        if frame.items is None:
+            return
+        if frame.is_object:
+            frame.items.append((frame.key, value))
+        else:
+            frame.items.append(value)
+
+    def build(self, frame):
+        if frame.items is None:
+            return None
+        if frame.is_object:
+            return self.object_pairs_hook(frame.items)
+        return frame.items
+
+    def decode_key(self, skip=False):
+        if self.peek() != '"':
+            raise self.error('Expecting property name enclosed in double quotes')
+        if skip:
+            key = self.skip_string()
+        else:
+            key = self.decode_string()
+            key = self.memo.setdefault(key, key)
+        self.expect(':', "Expecting ':' delimiter")
+        return key
+
+    def decode_scalar(self, char):
+        if char == '"':
+            return self.decode_string()
+        elif char == '-' or '0' <= char <= '9':
+            return self.decode_number()
+        elif char in CONSTANT_PREFIXES:
+            return self.decode_constant(CONSTANT_PREFIXES[char])
+        raise self.error('Expecting value')
+
+    def decode_string(self):
+        while True:
+            try:
+                value, end = scanstring(self.buffer, self.position + 1, True)
+            except ValueError as e:
+                if self.eof or not self._is_incomplete(e):
+                    raise self.error(getattr(e, 'msg', 'Invalid string'))
+                self._fill_string()
+            else:
+                self.position = end
+                return value
+
+    def skip_string(self):
+        """
+        Validate string at the current position without decoding it.
+        """
+        # relative to position since buffer is compacted while filling
+        scanned = 1
+        while True:
+            end = STRING_BODY.match(self.buffer, self.position + scanned).end()
+            if end < len(self.buffer) and self.buffer[end] == '"':
+                self.position = end + 1
+                return None
+            # string or escape sequence might continue in the next chunk
+            if end + 6 > len(self.buffer) and not self.eof:
+                scanned = end - self.position
+                self.fill()
+                continue
+            self.position = end
+            raise self.error('Invalid string' if end < len(self.buffer) else 'Unterminated string')
+
+    def _is_incomplete(self, error):
+        message = getattr(error, 'msg', '')
+        position = getattr(error, 'pos', None)
+        return any([message.startswith('Unterminated'),
+                    position is None,
+                    # escape sequence might be cut off by the end of buffer
+                    position is not None and position >= len(self.buffer) - 6])
+
+    def _fill_string(self):
+        # only retry decoding the string once there is another quote
+        # to avoid re-scanning long strings for every chunk
+        scanned = len(self.buffer) - self.position
+        while self.fill():
+            if self.buffer.find('"', self.position + scanned) != -1:
+                return
+            scanned = len(self.buffer) - self.position
+
+    def decode_number(self):
+        while True:
+            match = NUMBER.match(self.buffer, self.position)
+            end = match.end() if match else self.position
+            # number might continue in the next chunk
+            if end + MAX_CONSTANT_LENGTH > len(self.buffer) and self.fill():
+                continue
+            break
+
+        if match is None:
+            return self.decode_constant('-Infinity')
+
+        integer, fraction, exponent = match.groups()
+        self.position = match.end()
+        if fraction or exponent:
+            return float(integer + (fraction or '') + (exponent or ''))
+        return int(integer)
+
+    def decode_constant(self, name):
+        self.ensure(len(name))
+        if not self.buffer.startswith(name, self.position):
+            raise self.error('Expecting value')
+        self.position += len(name)
+        return CONSTANTS[name]
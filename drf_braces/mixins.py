@@ -1,9 +1,90 @@
 from __future__ import absolute_import, print_function, unicode_literals
+import hashlib
+import threading
+from collections import OrderedDict
 
-from .parsers import StrippingJSONParser
+import django
+import six
+from django.db.models import Count, Max, Q
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import ParseError, ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
 
+from .idempotency import IdempotencyConflict, default_idempotency_store
+from .parsers import NDJSONParser, StrippingJSONParser
+from .querysets import get_cached_related_lookups, optimize_queryset
+from .serializers.sparse import REQUESTED_FIELDS, parse_requested_fields
+from .utils import LRUCache
+
+
+try:
+    from collections.abc import Iterator
+except ImportError:  # pragma: no cover
+    from collections import Iterator
+
+
+class MemoizedViewMixin(object):
+    """
+    Request-scoped memoization of view methods.
+
+    Values are memoized for the current ``self.request`` only
+    so a view instance never returns values computed for another request.
+    Memoized values can be explicitly invalidated when whatever
+    they were computed from changes during the request
+    (e.g. after modifying ``request.data``).
+    """
+
+    def _get_memo(self):
+        request = getattr(self, 'request', None)
+        memo = self.__dict__.get('_request_memo')
+        if memo is None or memo[0] is not request:
+            memo = self.__dict__['_request_memo'] = (request, {})
+        return memo[1]
+
+    def memoize(self, key, func, *args, **kwargs):
+        """
+        Call ``func`` once per request and return its memoized value after.
+
+        Iterators are never memoized since they can only be consumed once.
+        """
+        memo = self._get_memo()
+        try:
+            return memo[key]
+        except KeyError:
+            pass
+
+        value = func(*args, **kwargs)
+        if not isinstance(value, Iterator):
+            memo[key] = value
+        return value
+
+    def invalidate_memoized(self, *keys):
+        """
+        Invalidate memoized values with given keys or all values when no keys given.
+        """
+        memo = self._get_memo()
+        if not keys:
+            memo.clear()
+        for key in keys:
+            memo.pop(key, None)
+
+
+class MultipleSerializersViewMixin(MemoizedViewMixin):
+    """
+    Allow to get serializer of any class.
+
+    Serializer context is only constructed once per request
+    and all serializers share it.
+    """
+
+    def get_serializer_context(self):
+        return self.memoize(
+            'serializer_context', super(MultipleSerializersViewMixin, self).get_serializer_context
+        )
 
-class MultipleSerializersViewMixin(object):
     def get_serializer(self, *args, **kwargs):
         serializer_class = kwargs.pop('serializer_class', None)
         if serializer_class is None:
@@ -14,13 +95,77 @@ class MultipleSerializersViewMixin(object):
         return serializer_class(*args, **kwargs)
 
 
-class MapDataViewMixin(object):
-    # Configuration for data mapper.
+class OptimizedQuerysetViewMixin(object):
+    """
+    Avoid N+1 queries by applying related lookups which view serializer needs.
+
+    Lookups are derived from the serializer fields (including nested
+    serializers and fields swapped by ``SwappingSerializerMixin``)
+    once per serializer class and are then applied to ``get_queryset()``
+    as ``select_related()`` and ``prefetch_related()``.
+    Lookups already applied to the queryset are kept as they are.
+    """
+    optimize_queryset = True
+
+    def get_queryset(self):
+        queryset = super(OptimizedQuerysetViewMixin, self).get_queryset()
+        if self.optimize_queryset:
+            queryset = optimize_queryset(queryset, self.get_related_lookups(queryset.model))
+        return queryset
+
+    def get_related_lookups(self, model):
+        requested_fields = None
+        if isinstance(self, SparseFieldsetViewMixin):
+            requested_fields = self.get_requested_fields()
+        return get_cached_related_lookups(
+            self.get_serializer_class(), model, self.get_serializer, requested_fields
+        )
+
+
+class SparseFieldsetViewMixin(object):
+    """
+    Only render fields requested by the ``fields`` query parameter.
+
+    Requested fields such as ``?fields=id,author.name`` are passed
+    to serializers with ``SparseFieldsetSerializerMixin`` via their context.
+    Combined with ``OptimizedQuerysetViewMixin``, queryset only loads
+    columns which requested fields need via ``QuerySet.only()``.
+
+    Fields are only restricted for safe methods since
+    other methods need all fields to validate the input.
+    """
+    fields_query_param = 'fields'
+
+    def get_requested_fields(self):
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        value = request.query_params.get(self.fields_query_param)
+        if not value:
+            return None
+        return parse_requested_fields(value)
+
+    def get_serializer_context(self):
+        context = super(SparseFieldsetViewMixin, self).get_serializer_context()
+        context[REQUESTED_FIELDS] = self.get_requested_fields()
+        return context
+
+
+class MapDataViewMixin(MemoizedViewMixin):
+    """
+    Map request data before it is serialized.
+
+    Mapper context and mapped data of each mapper class are only
+    computed once per request. Call ``invalidate_memoized()``
+    to map data again (e.g. after modifying ``request.data``).
+    Lazily mapped data (iterators) is mapped each time.
+    """
+    # Configuration for data mapper such as drf_braces.mappers.DataMapper.
     # Leave None if you don't require mapping
     data_mapper_class = None
 
     def get_mapper_context(self):
-        return self.get_serializer_context()
+        return self.memoize('mapper_context', self.get_serializer_context)
 
     def get_data(self, mapper_class=None):
         """
@@ -30,10 +175,13 @@ class MapDataViewMixin(object):
             mapper_class = self.data_mapper_class
 
         if mapper_class is not None:
-            return mapper_class(context=self.get_mapper_context())(self.request.data)
+            return self.memoize(('data', mapper_class), self.map_data, mapper_class)
 
         return self.request.data
 
+    def map_data(self, mapper_class):
+        return mapper_class(context=self.get_mapper_context())(self.request.data)
+
 
 class StrippingJSONViewMixin(object):
     parser_classes = (StrippingJSONParser,)
@@ -50,3 +198,489 @@ class StrippingJSONViewMixin(object):
         context = super(StrippingJSONViewMixin, self).get_parser_context(http_request)
         context.update({'parse_root': self.parser_root})
         return context
+
+
+class StreamingListViewMixin(object):
+    """
+    Validate bulk list payloads one record at a time.
+
+    Records which ``NDJSONParser`` lazily parses from the request body
+    are fed one by one to the child of the view's list serializer.
+    Hence memory usage stays constant regardless of the upload size
+    and each record is validated as soon as it is received.
+
+    Example::
+
+        class BulkCreateView(StreamingListViewMixin, GenericAPIView):
+            serializer_class = FooSerializer
+
+            def post(self, request):
+                with transaction.atomic():
+                    for data in self.get_validated_records():
+                        Foo.objects.create(**data)
+                return Response(status=201)
+    """
+    parser_classes = (NDJSONParser,)
+
+    # stop at the first invalid record instead of validating all of them
+    fail_fast = False
+
+    def get_records(self):
+        # records are lazily mapped by mappers such as DataMapper
+        if isinstance(self, MapDataViewMixin):
+            return self.get_data()
+        return self.request.data
+
+    def get_validated_records(self, records=None):
+        """
+        Lazily validate records and yield validated data of each record.
+
+        Invalid records are not yielded. Instead their errors are collected
+        and ``ValidationError`` with errors keyed by record index is raised
+        once all records are consumed (or at the first invalid record
+        when ``fail_fast`` is set).
+        """
+        if records is None:
+            records = self.get_records()
+
+        child = self.get_serializer(many=True).child
+        errors = OrderedDict()
+
+        for index, record in enumerate(records):
+            try:
+                yield child.run_validation(record)
+            except ValidationError as e:
+                errors[index] = e.detail
+                if self.fail_fast:
+                    break
+
+        if errors:
+            raise ValidationError(errors)
+
+
+class StreamingResponseViewMixin(object):
+    """
+    Stream responses rendered by streaming renderers.
+
+    Responses rendered by renderers with ``streaming = True``
+    (e.g. ``StreamingDoubleAsStrJsonRenderer``) are returned as
+    ``StreamingHttpResponse`` hence JSON is sent as it is being rendered.
+
+    ``list()`` serializes queryset rows lazily via ``queryset.iterator()``
+    so combined with a streaming renderer, neither the queryset,
+    its serialized data nor the rendered JSON are ever fully in memory.
+    Hence time-to-first-byte and peak memory do not depend on
+    the number of rows. Note that responses are not paginated.
+
+    Since the status code is sent before data is serialized,
+    any errors while streaming can only abort the response.
+
+    Example::
+
+        class ExportView(StreamingResponseViewMixin, ListAPIView):
+            renderer_classes = (StreamingDoubleAsStrJsonRenderer,)
+            serializer_class = FooSerializer
+            queryset = Foo.objects.all()
+    """
+    # number of rows fetched from the database at a time
+    iterator_chunk_size = 2000
+
+    def get_streaming_data(self, queryset=None):
+        """
+        Get generator of serialized queryset rows.
+        """
+        if queryset is None:
+            queryset = self.filter_queryset(self.get_queryset())
+
+        child = self.get_serializer(many=True).child
+
+        if hasattr(queryset, 'iterator'):
+            # chunk_size is only supported since Django 2.0
+            if django.VERSION >= (2, 0):
+                queryset = queryset.iterator(chunk_size=self.iterator_chunk_size)
+            else:
+                queryset = queryset.iterator()
+
+        return (child.to_representation(i) for i in queryset)
+
+    def list(self, request, *args, **kwargs):
+        return Response(self.get_streaming_data())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super(StreamingResponseViewMixin, self).finalize_response(
+            request, response, *args, **kwargs
+        )
+
+        renderer = getattr(response, 'accepted_renderer', None)
+        if not isinstance(response, Response) or not getattr(renderer, 'streaming', False):
+            return response
+
+        return self.get_streaming_response(response)
+
+    def get_streaming_response(self, response):
+        renderer = response.accepted_renderer
+        content = renderer.render(
+            response.data,
+            response.accepted_media_type,
+            response.renderer_context,
+        )
+
+        content_type = response.content_type
+        if content_type is None and renderer.charset is not None:
+            content_type = '{}; charset={}'.format(renderer.media_type, renderer.charset)
+        elif content_type is None:
+            content_type = renderer.media_type
+
+        streaming_response = StreamingHttpResponse(
+            content,
+            status=response.status_code,
+            content_type=content_type,
+        )
+        for header, value in response.items():
+            if header.lower() != 'content-type':
+                streaming_response[header] = value
+        streaming_response.cookies = response.cookies
+
+        return streaming_response
+
+
+class KeysetStreamingResponseViewMixin(StreamingResponseViewMixin):
+    """
+    Stream responses of queryset fetched in keyset paginated chunks.
+
+    Instead of offsets (which get slower with each page) or a single
+    database cursor, queryset is ordered by ``keyset_fields`` and each chunk
+    of ``iterator_chunk_size`` rows is fetched with a filter on the keys
+    of the last row of the previous chunk. Hence every chunk costs the same
+    regardless of how far the export got and, unlike ``queryset.iterator()``,
+    ``prefetch_related()`` lookups (e.g. of ``OptimizedQuerysetViewMixin``)
+    are applied to each chunk.
+
+    Each chunk is serialized at once by ``streaming_serializer_class``
+    (or the view serializer). Only a single chunk is in memory at a time.
+
+    ``keyset_fields`` must be non-nullable and unique together.
+    Fields prefixed with ``-`` are ordered descending.
+    Any ordering of the queryset is replaced by the keyset ordering.
+    """
+    keyset_fields = ('pk',)
+    streaming_serializer_class = None
+
+    def get_streaming_serializer(self):
+        serializer_class = self.streaming_serializer_class
+        if serializer_class is None:
+            return self.get_serializer(many=True)
+        return serializer_class(many=True, context=self.get_serializer_context())
+
+    def get_keyset_filter(self, last):
+        """
+        Get filter of rows after the ``last`` row in the keyset ordering.
+        """
+        condition = None
+        equal = Q()
+        for field in self.keyset_fields:
+            name = field.lstrip('-')
+            value = getattr(last, name)
+            after = equal & Q(**{'{}__{}'.format(name, 'lt' if field.startswith('-') else 'gt'): value})
+            condition = after if condition is None else condition | after
+            equal &= Q(**{name: value})
+        return condition
+
+    def get_keyset_chunks(self, queryset):
+        """
+        Get generator of lists of queryset rows in keyset ordering.
+        """
+        queryset = queryset.order_by(*self.keyset_fields)
+        chunk = list(queryset[:self.iterator_chunk_size])
+        while chunk:
+            yield chunk
+            if len(chunk) < self.iterator_chunk_size:
+                return
+            chunk = list(queryset.filter(self.get_keyset_filter(chunk[-1]))[:self.iterator_chunk_size])
+
+    def get_streaming_data(self, queryset=None):
+        if queryset is None:
+            queryset = self.filter_queryset(self.get_queryset())
+
+        serializer = self.get_streaming_serializer()
+
+        return (
+            row
+            for chunk in self.get_keyset_chunks(queryset)
+            for row in serializer.to_representation(chunk)
+        )
+
+
+_rendered_caches = {}
+_rendered_caches_lock = threading.Lock()
+
+
+class ConditionalGetViewMixin(object):
+    """
+    Answer conditional GET requests before data is serialized.
+
+    ``get_fingerprint()`` cheaply computes version of the data
+    which view would render. ETag is derived from it hence requests
+    with matching ``If-None-Match`` get ``304 Not Modified`` without
+    querying, serializing nor rendering any data.
+
+    By default fingerprint is computed from ``fingerprint_field``
+    (e.g. ``updated_at``) with a single query: its value on the object
+    for detail views and its max value along with the number of objects
+    for list views. Override ``get_fingerprint()`` for anything else.
+
+    Detail views always fetch the object with ``get_object()`` (once for
+    both the fingerprint and the response) hence object permissions
+    are checked before answering from ETag or cached content.
+
+    Optionally rendered content is cached per ETag in memory so that
+    clients without the matching ETag still skip serialization and rendering.
+    ETags and hence cached content vary by user (see ``get_etag_vary()``).
+    Memory is bounded by ``rendered_cache_maxsize`` responses of at most
+    ``rendered_cache_max_length`` bytes each.
+
+    Example::
+
+        class FooView(ConditionalGetViewMixin, RetrieveAPIView):
+            serializer_class = FooSerializer
+            queryset = Foo.objects.all()
+            fingerprint_field = 'updated_at'
+            rendered_cache_maxsize = 1000
+    """
+    fingerprint_field = None
+
+    # number of cached rendered responses per view class
+    rendered_cache_maxsize = 0
+    # responses longer than this are not cached
+    rendered_cache_max_length = 1024 * 1024
+
+    def get_fingerprint(self):
+        """
+        Get version of the data which view renders or ``None`` to disable conditional requests.
+        """
+        if self.fingerprint_field is None:
+            return None
+
+        if self.is_detail_request():
+            return getattr(self.get_object(), self.fingerprint_field)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return tuple(sorted(queryset.aggregate(
+            count=Count('pk'),
+            last=Max(self.fingerprint_field),
+        ).items()))
+
+    def is_detail_request(self):
+        return (self.lookup_url_kwarg or self.lookup_field) in self.kwargs
+
+    def get_object(self):
+        # object is fetched once for both the fingerprint and the response
+        if '_conditional_object' not in vars(self):
+            self._conditional_object = super(ConditionalGetViewMixin, self).get_object()
+        return self._conditional_object
+
+    def get_etag_vary(self):
+        """
+        Get anything besides the fingerprint which rendered content depends on.
+
+        By default responses vary by the authenticated user since
+        querysets and serializers are commonly user-specific.
+        """
+        user = getattr(self.request, 'user', None)
+        return [user.pk if user is not None and user.is_authenticated else None]
+
+    def get_etag(self, fingerprint):
+        """
+        Get ETag of the response for the fingerprint.
+
+        ETag depends on the view, full path, accepted media type
+        and ``get_etag_vary()`` as those determine the rendered content
+        along with the data. Since rendered content is cached per ETag,
+        cached responses vary by the same parts.
+        """
+        parts = [
+            type(self).__module__,
+            type(self).__name__,
+            self.request.get_full_path(),
+            self.request.accepted_media_type,
+            self.get_etag_vary(),
+            fingerprint,
+        ]
+        digest = hashlib.md5(six.text_type(parts).encode('utf-8')).hexdigest()
+        return quote_etag(digest)
+
+    def get_rendered_cache(self):
+        if not self.rendered_cache_maxsize:
+            return None
+        view_class = type(self)
+        with _rendered_caches_lock:
+            if view_class not in _rendered_caches:
+                _rendered_caches[view_class] = LRUCache(maxsize=self.rendered_cache_maxsize)
+            return _rendered_caches[view_class]
+
+    def get(self, request, *args, **kwargs):
+        fingerprint = self.get_fingerprint()
+        if fingerprint is None:
+            return super(ConditionalGetViewMixin, self).get(request, *args, **kwargs)
+
+        if self.is_detail_request():
+            # object permissions have to pass before answering from ETag or cache
+            self.get_object()
+
+        etag = self.get_etag(fingerprint)
+
+        if_none_match = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        if '*' in if_none_match or etag in [i[2:] if i.startswith('W/') else i for i in if_none_match]:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        cache = self.get_rendered_cache()
+        if cache is not None:
+            cached = cache.get(etag)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                response['ETag'] = etag
+                return response
+
+        response = super(ConditionalGetViewMixin, self).get(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+        response['ETag'] = etag
+        if cache is not None and isinstance(response, Response):
+            response.add_post_render_callback(lambda r: self.cache_rendered(cache, etag, r))
+        return response
+
+    def cache_rendered(self, cache, etag, response):
+        if len(response.content) <= self.rendered_cache_max_length:
+            cache.set(etag, (response.content, response['Content-Type']))
+
+
+class _IdempotentReplay(Exception):
+    def __init__(self, response):
+        super(_IdempotentReplay, self).__init__()
+        self.response = response
+
+
+class IdempotentViewMixin(object):
+    """
+    Replay responses of requests retried with the same ``Idempotency-Key`` header.
+
+    Rendered response of the first request with a given key is stored
+    in ``idempotency_store`` (``LocalMemoryIdempotencyStore`` or
+    ``DjangoCacheIdempotencyStore``) and retries are answered
+    with it right after authentication and permission checks,
+    without parsing nor validating the request body
+    and without executing the handler again.
+
+    Concurrent duplicates wait up to ``idempotency_wait_timeout``
+    seconds for the first request to complete and are then
+    answered with its response or with ``409 Conflict``.
+    When the first request fails without storing its response,
+    one of the waiting duplicates is handled instead.
+
+    Keys are scoped to the view, method, full path and user.
+    Server errors are never stored so that they can be retried.
+    Replayed responses have ``Idempotent-Replayed: true`` header.
+    """
+    idempotency_store = default_idempotency_store
+    idempotency_header = 'Idempotency-Key'
+    idempotent_methods = ('POST', 'PUT', 'PATCH', 'DELETE')
+    idempotency_key_max_length = 255
+    idempotency_wait_timeout = 10
+
+    def get_idempotency_key(self, request):
+        if request.method not in self.idempotent_methods:
+            return None
+
+        value = request.META.get('HTTP_{}'.format(self.idempotency_header.upper().replace('-', '_')))
+        if not value:
+            return None
+        if len(value) > self.idempotency_key_max_length:
+            raise ParseError('{} must be at most {} characters long.'.format(
+                self.idempotency_header, self.idempotency_key_max_length
+            ))
+
+        user = getattr(request, 'user', None)
+        parts = [
+            type(self).__module__,
+            type(self).__name__,
+            request.method,
+            request.get_full_path(),
+            user.pk if user is not None and user.is_authenticated else None,
+            value,
+        ]
+        return hashlib.md5(six.text_type(parts).encode('utf-8')).hexdigest()
+
+    def initial(self, request, *args, **kwargs):
+        super(IdempotentViewMixin, self).initial(request, *args, **kwargs)
+
+        key = self.get_idempotency_key(request)
+        if key is None:
+            return
+
+        store = self.idempotency_store
+        stored = store.get(key)
+        if stored is None:
+            token = store.acquire(key)
+            if token is None:
+                stored = store.wait(key, self.idempotency_wait_timeout)
+                if stored is None:
+                    # request holding the key could have failed without storing
+                    # its response in which case this request runs instead
+                    token = store.acquire(key)
+                    if token is None:
+                        raise IdempotencyConflict()
+
+            if token is not None:
+                # duplicate could have completed before the key was acquired
+                stored = store.get(key)
+                if stored is None:
+                    self._idempotency_lock = (key, token)
+                    return
+                store.release(key, token)
+
+        raise _IdempotentReplay(self.get_replayed_response(stored))
+
+    def get_replayed_response(self, stored):
+        status_code, content, headers = stored
+        response = HttpResponse(content, status=status_code)
+        for header, value in headers:
+            response[header] = value
+        response['Idempotent-Replayed'] = 'true'
+        return response
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _IdempotentReplay):
+            return exc.response
+        try:
+            return super(IdempotentViewMixin, self).handle_exception(exc)
+        except Exception:
+            # unhandled errors never reach finalize_response()
+            lock = self.__dict__.pop('_idempotency_lock', None)
+            if lock is not None:
+                self.idempotency_store.release(*lock)
+            raise
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super(IdempotentViewMixin, self).finalize_response(request, response, *args, **kwargs)
+
+        lock = self.__dict__.pop('_idempotency_lock', None)
+        if lock is None:
+            return response
+
+        renderer = getattr(response, 'accepted_renderer', None)
+        if response.status_code >= 500 or response.streaming or getattr(renderer, 'streaming', False):
+            self.idempotency_store.release(*lock)
+        elif isinstance(response, Response) and not response.is_rendered:
+            response.add_post_render_callback(lambda r: self.store_idempotent_response(lock, r))
+        else:
+            self.store_idempotent_response(lock, response)
+        return response
+
+    def store_idempotent_response(self, lock, response):
+        key, token = lock
+        try:
+            self.idempotency_store.set(key, (response.status_code, response.content, list(response.items())))
+        finally:
+            self.idempotency_store.release(key, token)
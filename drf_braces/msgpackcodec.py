@@ -0,0 +1,378 @@
+from __future__ import absolute_import, print_function, unicode_literals
+import struct
+from collections import OrderedDict
+
+import six
+
+from .jsonbackends import ORDERED_DICTS
+
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # pragma: no cover
+    from collections import Mapping
+
+
+# formats of fixed-size MessagePack values
+UINT8 = struct.Struct(str('>B'))
+UINT16 = struct.Struct(str('>H'))
+UINT32 = struct.Struct(str('>I'))
+UINT64 = struct.Struct(str('>Q'))
+INT8 = struct.Struct(str('>b'))
+INT16 = struct.Struct(str('>h'))
+INT32 = struct.Struct(str('>i'))
+INT64 = struct.Struct(str('>q'))
+FLOAT32 = struct.Struct(str('>f'))
+FLOAT64 = struct.Struct(str('>d'))
+
+# type byte -> (struct, kind) of values with fixed-size header
+HEADERS = {
+    0xc4: (UINT8, 'bin'),
+    0xc5: (UINT16, 'bin'),
+    0xc6: (UINT32, 'bin'),
+    0xca: (FLOAT32, 'value'),
+    0xcb: (FLOAT64, 'value'),
+    0xcc: (UINT8, 'value'),
+    0xcd: (UINT16, 'value'),
+    0xce: (UINT32, 'value'),
+    0xcf: (UINT64, 'value'),
+    0xd0: (INT8, 'value'),
+    0xd1: (INT16, 'value'),
+    0xd2: (INT32, 'value'),
+    0xd3: (INT64, 'value'),
+    0xd9: (UINT8, 'str'),
+    0xda: (UINT16, 'str'),
+    0xdb: (UINT32, 'str'),
+    0xdc: (UINT16, 'array'),
+    0xdd: (UINT32, 'array'),
+    0xde: (UINT16, 'map'),
+    0xdf: (UINT32, 'map'),
+}
+CONSTANTS = {
+    0xc0: None,
+    0xc2: False,
+    0xc3: True,
+}
+
+
+class MsgPackError(ValueError):
+    """
+    Raised when MessagePack data is invalid or cannot be encoded.
+    """
+
+
+class _Frame(object):
+    """
+    Array or map which is being unpacked.
+    """
+    __slots__ = ['items', 'is_map', 'remaining']
+
+    def __init__(self, is_map, length):
+        self.items = []
+        self.is_map = is_map
+        # maps hold a key and a value per member
+        self.remaining = length * 2 if is_map else length
+
+
+class Unpacker(object):
+    """
+    Pure-Python MessagePack decoder.
+
+    Nesting is tracked with an explicit stack so deeply nested data
+    cannot exhaust the interpreter stack.
+    Declared lengths are checked against the remaining data
+    before anything is allocated for them.
+
+    Extension types are not supported.
+
+    Args:
+        data (bytes): Packed data
+        object_pairs_hook (callable): Called with list of ``(key, value)``
+            pairs of each unpacked map
+        max_depth (int): Maximum nesting depth of arrays and maps
+    """
+
+    def __init__(self, data, object_pairs_hook=OrderedDict, max_depth=None):
+        self.data = data
+        self.object_pairs_hook = object_pairs_hook
+        self.max_depth = max_depth
+        self.position = 0
+
+    def error(self, message):
+        return MsgPackError('{}: byte {}'.format(message, self.position))
+
+    def unpack(self):
+        stack = []
+
+        while True:
+            kind, value = self.read()
+
+            if kind == 'array' or kind == 'map':
+                if self.max_depth is not None and len(stack) >= self.max_depth:
+                    raise self.error('Maximum nesting depth of {} exceeded'.format(self.max_depth))
+                if value:
+                    self.check_length(value)
+                    stack.append(_Frame(kind == 'map', value))
+                    continue
+                value = self.build(_Frame(kind == 'map', 0))
+
+            # value is unpacked so add it to its container
+            # and close all containers which end after it
+            while stack:
+                frame = stack[-1]
+                frame.items.append(value)
+                frame.remaining -= 1
+                if frame.remaining:
+                    break
+                value = self.build(stack.pop())
+            else:
+                if self.position != len(self.data):
+                    raise self.error('Extra data')
+                return value
+
+    def build(self, frame):
+        if not frame.is_map:
+            return frame.items
+        items = frame.items
+        try:
+            return self.object_pairs_hook(list(zip(items[::2], items[1::2])))
+        except TypeError:
+            raise self.error('Invalid map key')
+
+    def check_length(self, length):
+        if length > len(self.data) - self.position:
+            raise self.error('Truncated data')
+
+    def take(self, length):
+        self.check_length(length)
+        start = self.position
+        self.position += length
+        return self.data[start:self.position]
+
+    def read(self):
+        """
+        Read next value or header of a container.
+
+        Returns:
+            ``(kind, value)`` where value of arrays and maps
+            is their number of members.
+        """
+        self.check_length(1)
+        byte = six.indexbytes(self.data, self.position)
+        self.position += 1
+
+        if byte <= 0x7f:
+            return 'value', byte
+        elif byte >= 0xe0:
+            return 'value', byte - 0x100
+        elif byte <= 0x8f:
+            return 'map', byte & 0x0f
+        elif byte <= 0x9f:
+            return 'array', byte & 0x0f
+        elif byte <= 0xbf:
+            return 'value', self.read_str(byte & 0x1f)
+        elif byte in CONSTANTS:
+            return 'value', CONSTANTS[byte]
+        elif byte not in HEADERS:
+            self.position -= 1
+            raise self.error('Unsupported type 0x{:02x}'.format(byte))
+
+        header, kind = HEADERS[byte]
+        value, = header.unpack(self.take(header.size))
+        if kind == 'str':
+            return 'value', self.read_str(value)
+        elif kind == 'bin':
+            return 'value', bytes(self.take(value))
+        return kind, value
+
+    def read_str(self, length):
+        try:
+            return self.take(length).decode('utf-8')
+        except UnicodeDecodeError:
+            raise self.error('Invalid UTF-8 string')
+
+
+class Packer(object):
+    """
+    Pure-Python MessagePack encoder.
+
+    Values are packed into the smallest representation
+    hence the output is identical to the ``msgpack`` package.
+
+    Args:
+        default (callable): Called with objects which cannot be packed
+            and should return a value which can be
+        is_big_int (callable): Called with each integer and when it returns
+            ``True`` the integer is packed as a string
+    """
+
+    def __init__(self, default=None, is_big_int=None):
+        self.default = default
+        self.is_big_int = is_big_int
+
+    def pack(self, data):
+        chunks = []
+        self._pack(data, chunks.append)
+        return b''.join(chunks)
+
+    def _pack(self, o, write):
+        if o is None:
+            write(b'\xc0')
+        elif o is True:
+            write(b'\xc3')
+        elif o is False:
+            write(b'\xc2')
+        elif isinstance(o, six.integer_types):
+            self.pack_int(o, write)
+        elif isinstance(o, float):
+            write(b'\xcb' + FLOAT64.pack(o))
+        elif isinstance(o, six.text_type):
+            self.pack_str(o, write)
+        elif isinstance(o, (bytes, bytearray)):
+            self.pack_header(len(o), b'', b'\xc4', b'\xc5', b'\xc6', write)
+            write(bytes(o))
+        elif isinstance(o, (list, tuple)):
+            self.pack_header(len(o), b'\x90', None, b'\xdc', b'\xdd', write)
+            for i in o:
+                self._pack(i, write)
+        elif isinstance(o, Mapping):
+            self.pack_header(len(o), b'\x80', None, b'\xde', b'\xdf', write)
+            for k, v in o.items():
+                self._pack(k, write)
+                self._pack(v, write)
+        elif self.default is not None:
+            self._pack(self.default(o), write)
+        else:
+            raise TypeError('Object of type {} is not MessagePack serializable'.format(type(o).__name__))
+
+    def pack_int(self, o, write):
+        o = int(o)
+        if self.is_big_int is not None and self.is_big_int(o):
+            self.pack_str(six.text_type(o), write)
+        elif o >= 0:
+            if o <= 0x7f:
+                write(UINT8.pack(o))
+            elif o <= 0xff:
+                write(b'\xcc' + UINT8.pack(o))
+            elif o <= 0xffff:
+                write(b'\xcd' + UINT16.pack(o))
+            elif o <= 0xffffffff:
+                write(b'\xce' + UINT32.pack(o))
+            elif o <= 0xffffffffffffffff:
+                write(b'\xcf' + UINT64.pack(o))
+            else:
+                raise MsgPackError('Integer {} does not fit into 64 bits'.format(o))
+        elif o >= -0x20:
+            write(INT8.pack(o))
+        elif o >= -0x80:
+            write(b'\xd0' + INT8.pack(o))
+        elif o >= -0x8000:
+            write(b'\xd1' + INT16.pack(o))
+        elif o >= -0x80000000:
+            write(b'\xd2' + INT32.pack(o))
+        elif o >= -0x8000000000000000:
+            write(b'\xd3' + INT64.pack(o))
+        else:
+            raise MsgPackError('Integer {} does not fit into 64 bits'.format(o))
+
+    def pack_str(self, o, write):
+        o = o.encode('utf-8')
+        self.pack_header(len(o), b'\xa0', b'\xd9', b'\xda', b'\xdb', write)
+        write(o)
+
+    def pack_header(self, length, fix, header8, header16, header32, write):
+        """
+        Write header of a value with given length using the smallest
+        of the given headers which fits it.
+        Fixed header holds up to 31 string bytes or 15 members.
+        """
+        if fix and length <= (0x1f if fix == b'\xa0' else 0x0f):
+            write(UINT8.pack(six.indexbytes(fix, 0) | length))
+        elif header8 and length <= 0xff:
+            write(header8 + UINT8.pack(length))
+        elif length <= 0xffff:
+            write(header16 + UINT16.pack(length))
+        elif length <= 0xffffffff:
+            write(header32 + UINT32.pack(length))
+        else:
+            raise MsgPackError('Length {} does not fit into 32 bits'.format(length))
+
+
+def unpackb(data, object_pairs_hook=OrderedDict, max_depth=None):
+    """
+    Unpack single MessagePack value.
+
+    ``msgpack`` package is used when it is installed and nesting
+    is not limited, otherwise the data is unpacked in pure Python.
+    Either way all errors are raised as ``MsgPackError``.
+    """
+    if msgpack is None or max_depth is not None:
+        return Unpacker(data, object_pairs_hook=object_pairs_hook, max_depth=max_depth).unpack()
+
+    try:
+        return msgpack.unpackb(
+            data,
+            raw=False,
+            strict_map_key=False,
+            object_pairs_hook=object_pairs_hook,
+            ext_hook=_reject_ext,
+        )
+    except (msgpack.ExtraData, msgpack.FormatError, msgpack.StackError,
+            ValueError, TypeError) as e:
+        raise MsgPackError(six.text_type(e) or type(e).__name__)
+
+
+def _reject_ext(code, data):
+    raise MsgPackError('Unsupported extension type {}'.format(code))
+
+
+def packb(data, default=None, is_big_int=None):
+    """
+    Pack data into MessagePack bytes.
+
+    ``msgpack`` package is used when it is installed, otherwise
+    or whenever it cannot pack the data, data is packed in pure Python.
+    Big integers are packed as strings with either implementation.
+    """
+    if msgpack is None or not ORDERED_DICTS:
+        return Packer(default=default, is_big_int=is_big_int).pack(data)
+
+    if is_big_int is not None:
+        transform = _BigIntTransform(is_big_int)
+        data = transform(data)
+        if default is not None:
+            default = transform.wrap(default)
+
+    try:
+        return msgpack.packb(data, default=default, use_bin_type=True)
+    except (TypeError, ValueError, OverflowError):
+        return Packer(default=default, is_big_int=is_big_int).pack(data)
+
+
+class _BigIntTransform(object):
+    """
+    Convert big integers within the data to strings
+    for the ``msgpack`` package which cannot do that while packing.
+    """
+
+    def __init__(self, is_big_int):
+        self.is_big_int = is_big_int
+
+    def __call__(self, o):
+        if isinstance(o, Mapping):
+            return {self(k): self(v) for k, v in o.items()}
+        elif isinstance(o, (list, tuple)):
+            return [self(i) for i in o]
+        elif isinstance(o, six.integer_types) and not isinstance(o, bool):
+            if self.is_big_int(o):
+                return six.text_type(o)
+        return o
+
+    def wrap(self, default):
+        return lambda o: self(default(o))
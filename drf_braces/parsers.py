@@ -6,11 +6,68 @@ import six
 from django.conf import settings
 from rest_framework import parsers
 
+from .compression import get_decompressed_stream
+from .jsonbackends import ORDERED_DICTS, JSONBackendMixin, StdlibJSONBackend
+from .jsonstream import MISSING, JSONStreamDecoder, find_path
+from .msgpackcodec import MsgPackError, unpackb
 
-class SortedJSONParser(parsers.JSONParser):
+
+class DecompressingParserMixin(object):
+    """
+    Transparently decompress request body according to its ``Content-Encoding``.
+
+    ``gzip`` and ``deflate`` encodings are decompressed incrementally
+    while the parser reads the request stream (see ``DecompressingStream``)
+    so the body never has to be decompressed into memory upfront.
+    Decompressed size is limited by ``max_decompressed_size`` which
+    defaults to ``DATA_UPLOAD_MAX_MEMORY_SIZE`` setting.
+    """
+    # maximum size of the decompressed request body in bytes
+    max_decompressed_size = None
+
+    def get_max_decompressed_size(self):
+        if self.max_decompressed_size is not None:
+            return self.max_decompressed_size
+        return settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+
+    def get_stream(self, stream, parser_context):
+        request = (parser_context or {}).get('request')
+        content_encoding = getattr(request, 'META', {}).get('HTTP_CONTENT_ENCODING')
+        return get_decompressed_stream(
+            stream,
+            content_encoding,
+            max_size=self.get_max_decompressed_size(),
+            chunk_size=getattr(self, 'chunk_size', None),
+        )
+
+
+class SortedJSONParser(DecompressingParserMixin, JSONBackendMixin, parsers.JSONParser):
     """
     Parses JSON-serialized data into OrderedDict.
+
+    When ``streaming`` is enabled, the request stream is decoded
+    incrementally in chunks via ``JSONStreamDecoder`` instead of reading
+    and decoding the whole body upfront. That keeps peak memory
+    close to the size of the parsed data and allows to enforce
+    ``max_size``, ``max_depth`` and ``max_members`` limits while parsing
+    so oversized or pathological payloads fail early.
+
+    When ``compact`` is enabled, objects are parsed into plain dicts
+    where dicts preserve order (Python 3.7+) which are considerably
+    smaller than ``OrderedDict``. That adds up for bulk payloads
+    with thousands of objects. Repeated object keys within a payload
+    are always interned so all objects share the same key strings.
     """
+    streaming = False
+    compact = False
+    # bytes read from the request stream at a time
+    chunk_size = 64 * 1024
+    # maximum size of the request body in bytes
+    max_size = None
+    # maximum nesting depth of arrays and objects
+    max_depth = None
+    # maximum number of members in a single array or object
+    max_members = None
 
     def parse(self, stream, media_type=None, parser_context=None):
         """
@@ -18,37 +75,74 @@ class SortedJSONParser(parsers.JSONParser):
         """
         parser_context = parser_context or {}
         encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        stream = self.get_stream(stream, parser_context)
 
         try:
+            if self.streaming:
+                return self.get_stream_decoder(stream, encoding).decode()
             data = stream.read().decode(encoding)
-            return json.loads(data, object_pairs_hook=OrderedDict)
+            return self.get_json_backend().loads(data, object_pairs_hook=self.get_object_pairs_hook())
         except ValueError as exc:
             raise parsers.ParseError('JSON parse error - %s' % six.text_type(exc))
 
+    def get_object_pairs_hook(self):
+        if self.compact and ORDERED_DICTS:
+            return dict
+        return OrderedDict
 
-# TODO Create a Renderer that does the opposite of this parser.
-class StrippingJSONParser(parsers.JSONParser):
+    def get_stream_decoder(self, stream, encoding):
+        return JSONStreamDecoder(
+            stream,
+            encoding=encoding,
+            chunk_size=self.chunk_size,
+            max_size=self.max_size,
+            max_depth=self.max_depth,
+            max_members=self.max_members,
+            object_pairs_hook=self.get_object_pairs_hook(),
+        )
+
+
+class StrippingJSONParser(SortedJSONParser):
     """
-    Strip the outer layer of JSON, returning only inner layer.
+    Strip the outer layers of JSON, returning only the inner layer.
 
     This is a convenience class, so that API creators do not need
     to wrap their serializers in a "parent serializer" for the sole
     purpose of stripping out the top-level node.
 
-    Place desired root into parser-context as 'parse-root'.
-    Only supports descending one level of nesting.
+    Place desired root into parser-context as 'parse_root'.
+    Nested roots can be selected by a list of keys
+    such as ``["envelope", "dt_application"]``.
+    When the root is not found, the whole document is returned
+    unless ``fallback_to_document`` is disabled in which case
+    ``ParseError`` is raised.
+
+    Only the selected root is decoded into Python objects.
+    All other members are only validated and skipped:
+
+    * by default with the C-accelerated stdlib scanner (see ``find_path()``)
+      after which the text of the root is decoded with the configured
+      JSON backend
+    * when ``streaming`` is enabled, while incrementally tokenizing
+      the stream (see ``JSONStreamDecoder.decode_path()``).
+      With ``fallback_to_document`` disabled, memory usage is then
+      proportional to the size of the root rather than the whole
+      document since the document text is not kept for the fallback.
 
     Caller is expected to add 'parse_root' to the parser's
     context; a convenient place to do this is in a GenericApiView
     subclass's `get_parser_context()` method.
 
+    Use ``WrappingJSONRenderer`` to wrap responses in the same root.
+
     Example, for parse_root of "dt_application"::
 
         input json:
             {
                 "dt_application": {
                     "node1": 1234
-                }
+                },
+                "audit": [...]
             }
         output dictionary:
             {
@@ -56,17 +150,163 @@ class StrippingJSONParser(parsers.JSONParser):
             }
     """
 
+    # return the whole document when root is not found
+    fallback_to_document = True
+
     def parse(self, stream, media_type=None, parser_context=None):
-        data = super(StrippingJSONParser, self).parse(
-            stream, media_type=media_type, parser_context=parser_context
-        )
+        parser_context = parser_context if parser_context is not None else {}
+        root = parser_context.pop('parse_root', None)
+
+        if root is None:
+            return super(StrippingJSONParser, self).parse(
+                stream, media_type=media_type, parser_context=parser_context
+            )
+
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        stream = self.get_stream(stream, parser_context)
+        path = self.get_root_path(root)
 
         try:
-            root = parser_context.pop('parse_root')
-        except KeyError:
-            pass
-        else:
-            if root in data:
-                return data[root]
+            if self.streaming:
+                return self.parse_root_streaming(stream, encoding, path)
+            return self.parse_root(stream.read().decode(encoding), path)
+        except ValueError as exc:
+            raise parsers.ParseError('JSON parse error - %s' % six.text_type(exc))
+
+    def get_root_path(self, root):
+        """
+        Get keys of the root which is either a single key or a list of keys.
+        """
+        if isinstance(root, six.string_types):
+            return [root]
+        return list(root)
+
+    def root_not_found(self, path):
+        return ValueError('root "{}" not found'.format('.'.join(path)))
+
+    def parse_root(self, text, path):
+        backend = self.get_json_backend()
+        object_pairs_hook = self.get_object_pairs_hook()
 
+        # stdlib decodes the root right away while finding it
+        stdlib = type(backend) is StdlibJSONBackend
+        found = find_path(text, path, json.JSONDecoder(object_pairs_hook=object_pairs_hook) if stdlib else None)
+
+        if found is None:
+            if not self.fallback_to_document:
+                raise self.root_not_found(path)
+            return backend.loads(text, object_pairs_hook=object_pairs_hook)
+        if stdlib:
+            return found[2]
+        return backend.loads(text[found[0]:found[1]], object_pairs_hook=object_pairs_hook)
+
+    def parse_root_streaming(self, stream, encoding, path):
+        decoder = self.get_stream_decoder(stream, encoding)
+        # keep the document text in case root is not found
+        decoder.retain = self.fallback_to_document
+
+        data = decoder.decode_path(path)
+        if data is MISSING:
+            if not self.fallback_to_document:
+                raise self.root_not_found(path)
+            return self.get_json_backend().loads(decoder.buffer, object_pairs_hook=self.get_object_pairs_hook())
         return data
+
+
+class NDJSONParser(DecompressingParserMixin, JSONBackendMixin, parsers.BaseParser):
+    """
+    Parses newline-delimited JSON (NDJSON) into a lazy iterator of records.
+
+    Records are parsed one line at a time while the request stream is read
+    in chunks so only a single record is held in memory at a time
+    regardless of the upload size. Since nothing is parsed until records
+    are iterated over, consumers such as ``StreamingListViewMixin``
+    can validate each record as the body is being received.
+
+    Empty lines are ignored.
+    Any parse errors are raised as ``ParseError`` while iterating.
+    """
+    media_type = 'application/x-ndjson'
+    # bytes read from the request stream at a time
+    chunk_size = 64 * 1024
+    # maximum size of a single record in bytes
+    max_line_size = None
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        return self.iter_records(self.get_stream(stream, parser_context), encoding)
+
+    def iter_records(self, stream, encoding):
+        backend = self.get_json_backend()
+        for number, line in enumerate(self.iter_lines(stream), 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield backend.loads(line.decode(encoding), object_pairs_hook=OrderedDict)
+            except ValueError as exc:
+                raise parsers.ParseError(
+                    'NDJSON parse error - line %s: %s' % (number, six.text_type(exc))
+                )
+
+    def iter_lines(self, stream):
+        buffer = b''
+        while True:
+            chunk = stream.read(self.chunk_size)
+            if not chunk:
+                break
+
+            lines = (buffer + chunk).split(b'\n')
+            buffer = lines.pop()
+            for line in lines:
+                yield line
+
+            if self.max_line_size is not None and len(buffer) > self.max_line_size:
+                raise parsers.ParseError(
+                    'NDJSON parse error - maximum line size of %s bytes exceeded' % self.max_line_size
+                )
+
+        if buffer:
+            yield buffer
+
+
+class MsgPackParser(DecompressingParserMixin, parsers.BaseParser):
+    """
+    Parses MessagePack data into OrderedDict.
+
+    Compact binary counterpart of ``SortedJSONParser`` for service-to-service
+    calls which is considerably cheaper to decode than JSON.
+    ``msgpack`` package is used when installed, otherwise data is decoded
+    by the bundled pure-Python implementation.
+
+    Same as ``SortedJSONParser``, ``compact`` parses maps into plain dicts
+    where dicts preserve order (Python 3.7+).
+    """
+    media_type = 'application/msgpack'
+    compact = False
+    # maximum size of the request body in bytes
+    max_size = None
+    # maximum nesting depth of arrays and maps
+    max_depth = None
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        stream = self.get_stream(stream, parser_context)
+        if self.max_size is None:
+            data = stream.read()
+        else:
+            data = stream.read(self.max_size + 1)
+            if len(data) > self.max_size:
+                raise parsers.ParseError(
+                    'MessagePack parse error - maximum size of %s bytes exceeded' % self.max_size
+                )
+
+        try:
+            return unpackb(data, object_pairs_hook=self.get_object_pairs_hook(), max_depth=self.max_depth)
+        except MsgPackError as exc:
+            raise parsers.ParseError('MessagePack parse error - %s' % six.text_type(exc))
+
+    def get_object_pairs_hook(self):
+        if self.compact and ORDERED_DICTS:
+            return dict
+        return OrderedDict
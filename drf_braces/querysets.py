@@ -0,0 +1,188 @@
+from __future__ import absolute_import, print_function, unicode_literals
+from collections import namedtuple
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import relations, serializers
+
+from .utils import LRUCache
+
+
+RelatedLookups = namedtuple('RelatedLookups', ['select_related', 'prefetch_related', 'only'])
+RelatedLookups.__new__.__defaults__ = (None,)
+
+_lookups = LRUCache(maxsize=512)
+
+
+def _get_model_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        pass
+    # reverse relations are accessed by their accessor name
+    for related in model._meta.related_objects:
+        if related.get_accessor_name() == name:
+            return related
+    return None
+
+
+def _needs_related_object(field):
+    """
+    Whether field needs related object itself rather than only its foreign key.
+    """
+    if isinstance(field, (serializers.BaseSerializer, relations.ManyRelatedField)):
+        return True
+    if isinstance(field, relations.RelatedField):
+        # pk-only fields use the foreign key value of the instance
+        return not field.use_pk_only_optimization()
+    return False
+
+
+class _LookupsCollector(object):
+    """
+    Walk serializer fields and collect lookups of model fields they access.
+    """
+
+    def __init__(self):
+        self.select = set()
+        self.prefetch = set()
+        # fields of the model and selected related models
+        self.only = set()
+        # whether only() can be used which is not the case when
+        # fields access anything which cannot be resolved to model fields
+        self.restrictable = True
+
+    def use(self, path, prefetched):
+        if not prefetched:
+            self.only.add('__'.join(path))
+
+    def unknown(self, prefetched):
+        if not prefetched:
+            self.restrictable = False
+
+    def walk(self, serializer, model, path, prefetched):
+        if isinstance(serializer, serializers.ListSerializer):
+            serializer = serializer.child
+
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+
+            if field.source == '*':
+                if isinstance(field, serializers.BaseSerializer):
+                    self.walk(field, model, path, prefetched)
+                elif isinstance(field, relations.HyperlinkedIdentityField):
+                    self.use(path + [field.lookup_field], prefetched)
+                else:
+                    self.unknown(prefetched)
+                continue
+
+            self.walk_field(field, model, path, prefetched)
+
+    def walk_field(self, field, model, path, prefetched):
+        attrs = field.source_attrs
+        needs_related_object = _needs_related_object(field)
+        path = list(path)
+
+        for index, attr in enumerate(attrs):
+            model_field = _get_model_field(model, attr)
+            # properties and methods cannot be optimized
+            if model_field is None:
+                self.unknown(prefetched)
+                return
+            if not model_field.is_relation:
+                self.use(path + [attr], prefetched)
+                return
+            if index == len(attrs) - 1 and not needs_related_object:
+                self.use(path + [attr], prefetched)
+                return
+
+            if model_field.concrete and not model_field.many_to_many:
+                self.use(path + [attr], prefetched)
+
+            path.append(attr)
+            prefetched = prefetched or any([
+                model_field.many_to_many,
+                model_field.one_to_many,
+                # generic foreign keys can only be prefetched
+                model_field.related_model is None,
+            ])
+            (self.prefetch if prefetched else self.select).add('__'.join(path))
+
+            model = model_field.related_model
+            if model is None:
+                self.unknown(prefetched)
+                return
+
+        if isinstance(field, serializers.BaseSerializer):
+            self.walk(field, model, path, prefetched)
+
+
+def get_related_lookups(serializer, model, only=False):
+    """
+    Get related lookups which avoid N+1 queries when serializing model instances.
+
+    Serializer fields are walked recursively and each relation which
+    the serializer accesses (nested serializers, related fields
+    which need more than foreign key or dotted sources) is resolved
+    against the model. Forward single relations are selected
+    while any relations after a many relation are prefetched.
+
+    When ``only`` is requested, model fields which serializer
+    accesses of the model and of the selected related models are
+    collected for ``QuerySet.only()`` unless serializer accesses
+    anything which cannot be resolved to model fields (e.g. properties).
+
+    Args:
+        serializer: Serializer instance. Instance is needed rather than class
+            since fields can be modified when serializer is initialized
+            (e.g. by ``SwappingSerializerMixin`` or ``SparseFieldsetSerializerMixin``).
+        model: Model of serialized instances
+        only (bool): Whether to collect ``only`` lookups
+
+    Returns:
+        ``RelatedLookups`` of ``select_related``, ``prefetch_related``
+        and ``only`` lookups where ``only`` is ``None`` when fields
+        cannot be restricted.
+    """
+    collector = _LookupsCollector()
+    collector.walk(serializer, model, [], False)
+    return RelatedLookups(
+        sorted(collector.select),
+        sorted(collector.prefetch),
+        sorted(collector.only) if only and collector.restrictable else None,
+    )
+
+
+def get_cached_related_lookups(serializer_class, model, get_serializer, requested_fields=None):
+    """
+    Same as ``get_related_lookups`` however computed once per
+    serializer class, model and requested fields.
+
+    ``only`` lookups are only collected for sparse fieldsets
+    (when ``requested_fields`` are given).
+    ``get_serializer`` is only called to initialize the serializer
+    when lookups are not cached yet.
+    """
+    return _lookups.get_or_set(
+        (serializer_class, model, _freeze(requested_fields)),
+        lambda: get_related_lookups(get_serializer(), model, only=requested_fields is not None),
+    )
+
+
+def _freeze(tree):
+    if tree is None:
+        return None
+    return tuple(sorted((name, _freeze(value)) for name, value in tree.items()))
+
+
+def optimize_queryset(queryset, lookups):
+    """
+    Apply related lookups to the queryset.
+    """
+    if lookups.select_related:
+        queryset = queryset.select_related(*lookups.select_related)
+    if lookups.prefetch_related:
+        queryset = queryset.prefetch_related(*lookups.prefetch_related)
+    if lookups.only:
+        queryset = queryset.only(*lookups.only)
+    return queryset
@@ -1,29 +1,598 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, print_function, unicode_literals
-from collections import Mapping
+import itertools
+import json
+import re
+import uuid
+from collections import OrderedDict
+from json.encoder import (
+    INFINITY,
+    encode_basestring,
+    encode_basestring_ascii,
+)
+from types import GeneratorType
 
 import six
-from rest_framework.renderers import JSONRenderer
+from rest_framework import fields, relations, serializers
+from rest_framework.compat import (
+    INDENT_SEPARATORS,
+    LONG_SEPARATORS,
+    SHORT_SEPARATORS,
+)
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.utils.encoders import JSONEncoder
 
+from .jsonbackends import ORDERED_DICTS, JSONBackendMixin, RawJSON
+from .msgpackcodec import packb
+from .utils import LRUCache
+
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # pragma: no cover
+    from collections import Mapping
+
+
+LINE_SEPARATOR = '\u2028'.encode('utf-8')
+PARAGRAPH_SEPARATOR = '\u2029'.encode('utf-8')
+
+# path plan markers for big integers stringification
+# any member of a list or any value of a dict
+ANY = '*'
+# whole subtree has to be scanned since it could contain anything
+SCAN = object()
+
+# fields which never output integers
+SAFE_FIELDS = tuple(filter(None, [
+    fields.BooleanField,
+    fields.CharField,
+    fields.DateField,
+    fields.DateTimeField,
+    fields.DecimalField,
+    fields.DurationField,
+    fields.FileField,
+    fields.FloatField,
+    fields.HiddenField,
+    getattr(fields, 'NullBooleanField', None),
+    fields.TimeField,
+    fields.UUIDField,
+    relations.HyperlinkedRelatedField,
+    relations.StringRelatedField,
+]))
+
+# fields which output values which can be integers
+VALUE_FIELDS = (
+    fields.IntegerField,
+    fields.ChoiceField,
+    relations.PrimaryKeyRelatedField,
+    relations.SlugRelatedField,
+)
+
+_declared_plans = LRUCache(maxsize=512)
+
 
 class DoubleAsStrJsonEncoder(JSONEncoder):
-    def _encode(self, o):
+    """
+    DRF JSON encoder which encodes big integers as strings.
+
+    Integers which take at least 15 characters to write (including sign)
+    are encoded as strings. That is checked by magnitude while encoding
+    the data in a single pass so neither the data is copied nor
+    integers are converted to text just to measure them.
+
+    Besides dicts and lists (including DRF ``ReturnDict`` and ``ReturnList``),
+    any mappings, tuples and generators are encoded directly as well.
+    ``RawJSON`` fragments are output verbatim.
+    Any other values are encoded by DRF encoder ``default()``
+    and its result is then encoded the same way.
+    """
+    # big integers are either >= max_int or <= min_int
+    max_int = 10 ** 14
+    min_int = -10 ** 13
+
+    def is_big_int(self, o):
+        return o >= self.max_int or o <= self.min_int
+
+    def transform(self, o):
+        """
+        Convert big integers within the data to strings.
+
+        Only needed by JSON backends which cannot use ``iterencode()``.
+        """
         if isinstance(o, Mapping):
-            return {k: self._encode(v) for k, v in o.items()}
-        elif isinstance(o, (list, tuple)):
-            return [self._encode(i) for i in o]
-        elif isinstance(o, six.integer_types):
-            int_str = six.text_type(o)
-            if len(int_str) >= 15:
-                o = int_str
+            return {k: self.transform(v) for k, v in o.items()}
+        elif isinstance(o, (list, tuple, GeneratorType)):
+            return [self.transform(i) for i in o]
+        elif isinstance(o, six.integer_types) and not isinstance(o, bool):
+            if self.is_big_int(o):
+                o = six.text_type(o)
         return o
 
     def encode(self, o):
-        return super(DoubleAsStrJsonEncoder, self).encode(self._encode(o))
+        return ''.join(self.iterencode(o, _one_shot=True))
+
+    def iterencode(self, o, _one_shot=False):
+        """
+        Encode the given object and yield its chunks.
+
+        Each member of the top-level list or dict is yielded separately
+        so that large responses can be written incrementally.
+        """
+        return self.make_encoder()(o)
+
+    def make_encoder(self):
+        """
+        Make function which yields encoded chunks of a value.
+
+        Mirrors pure-Python encoder from the stdlib ``json`` module
+        including its output format. Nested containers are joined
+        into a single chunk as soon as they are encoded which keeps
+        the number of intermediate strings low.
+        """
+        markers = {} if self.check_circular else None
+        encode_str = encode_basestring_ascii if self.ensure_ascii else encode_basestring
+        indent = self.indent
+        if indent is not None and not isinstance(indent, six.string_types):
+            indent = ' ' * indent
+        key_separator = self.key_separator
+        item_separator = self.item_separator
+        allow_nan = self.allow_nan
+        sort_keys = self.sort_keys
+        skipkeys = self.skipkeys
+        default = self.default
+        max_int = self.max_int
+        min_int = self.min_int
+        text_type = six.text_type
+        join = ''.join
+
+        def encode_float(o):
+            if o != o:
+                text = 'NaN'
+            elif o == INFINITY:
+                text = 'Infinity'
+            elif o == -INFINITY:
+                text = '-Infinity'
+            else:
+                return float.__repr__(o)
+
+            if not allow_nan:
+                raise ValueError(
+                    'Out of range float values are not JSON compliant: ' + repr(o)
+                )
+            return text
+
+        def encode_int(o):
+            if o >= max_int or o <= min_int:
+                return '"' + text_type(int(o)) + '"'
+            return text_type(int(o))
+
+        def encode_key(key):
+            if isinstance(key, six.string_types):
+                return key
+            elif key is True:
+                return 'true'
+            elif key is False:
+                return 'false'
+            elif key is None:
+                return 'null'
+            elif isinstance(key, float):
+                return encode_float(key)
+            elif isinstance(key, six.integer_types):
+                return text_type(int(key))
+            raise TypeError(
+                'keys must be str, int, float, bool or None, not {}'.format(type(key).__name__)
+            )
+
+        def mark(o):
+            if markers is None:
+                return None
+            marker = id(o)
+            if marker in markers:
+                raise ValueError('Circular reference detected')
+            markers[marker] = o
+            return marker
+
+        def iter_list(o, level):
+            marker = mark(o)
+            level += 1
+            if indent is not None:
+                newline_indent = '\n' + indent * level
+                separator = item_separator + newline_indent
+            else:
+                newline_indent = ''
+                separator = item_separator
+
+            first = True
+            for value in o:
+                if first:
+                    yield '[' + newline_indent
+                    first = False
+                else:
+                    yield separator
+                # inlined fast path for the most common values
+                if type(value) is text_type:
+                    yield encode_str(value)
+                else:
+                    yield encode(value, level)
+
+            if first:
+                yield '[]'
+            elif indent is not None:
+                yield '\n' + indent * (level - 1) + ']'
+            else:
+                yield ']'
+
+            if marker is not None:
+                del markers[marker]
+
+        def iter_dict(o, level):
+            marker = mark(o)
+            level += 1
+            if indent is not None:
+                newline_indent = '\n' + indent * level
+                separator = item_separator + newline_indent
+            else:
+                newline_indent = ''
+                separator = item_separator
+
+            items = o.items()
+            if sort_keys:
+                items = sorted(items)
+
+            first = True
+            for key, value in items:
+                try:
+                    key = encode_key(key)
+                except TypeError:
+                    if skipkeys:
+                        continue
+                    raise
+                if first:
+                    yield '{' + newline_indent
+                    first = False
+                else:
+                    yield separator
+                yield encode_str(key)
+                yield key_separator
+                # inlined fast path for the most common values
+                if type(value) is text_type:
+                    yield encode_str(value)
+                elif type(value) is int:
+                    yield encode_int(value)
+                else:
+                    yield encode(value, level)
+
+            if first:
+                yield '{}'
+            elif indent is not None:
+                yield '\n' + indent * (level - 1) + '}'
+            else:
+                yield '}'
+
+            if marker is not None:
+                del markers[marker]
+
+        def iter_encode(o, level=0):
+            if isinstance(o, (list, tuple, GeneratorType)):
+                return iter_list(o, level)
+            elif isinstance(o, Mapping):
+                return iter_dict(o, level)
+            return [encode(o, level)]
+
+        def encode(o, level):
+            if isinstance(o, six.string_types):
+                return encode_str(o)
+            elif o is None:
+                return 'null'
+            elif o is True:
+                return 'true'
+            elif o is False:
+                return 'false'
+            elif isinstance(o, six.integer_types):
+                return encode_int(o)
+            elif isinstance(o, float):
+                return encode_float(o)
+            elif isinstance(o, (list, tuple, GeneratorType)):
+                return join(iter_list(o, level))
+            elif isinstance(o, Mapping):
+                return join(iter_dict(o, level))
+            elif isinstance(o, RawJSON):
+                return o.json
+
+            marker = mark(o)
+            text = encode(default(o), level)
+            if marker is not None:
+                del markers[marker]
+            return text
+
+        return iter_encode
+
+
+def _get_known_base(field, bases):
+    """
+    Get base class of the field if it does not customize the representation.
+    """
+    for base in type(field).__mro__:
+        if base in bases:
+            if six.get_unbound_function(type(field).to_representation) is six.get_unbound_function(base.to_representation):
+                return base
+            return None
+    return None
 
 
-class DoubleAsStrJsonRenderer(JSONRenderer):
+def _parse_declared_plan(paths):
+    plan = {}
+    for path in paths:
+        node = plan
+        keys = path.split('.')
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = True
+    return plan
+
+
+class DerivedPlan(dict):
+    """
+    Plan derived from serializer field types.
+
+    Serializer data can be modified after it is serialized
+    (e.g. ``data['total'] = total``) hence any key which is not
+    in the plan is scanned. Fields which never output integers
+    are in the plan with ``None`` plan.
+    """
+
+
+def get_field_plan(field):
+    """
+    Get big integers stringification plan for serializer field output.
+
+    Returns:
+        ``None`` when output can never contain integers, ``True`` when output
+        can be an integer, ``SCAN`` when output can contain anything
+        or dict of plans of members of the output where ``ANY`` key
+        applies to all members.
+    """
+    if isinstance(field, (serializers.ListSerializer, fields.ListField, fields.DictField)):
+        if _get_known_base(field, (serializers.ListSerializer, fields.ListField, fields.DictField)) is None:
+            return SCAN
+        child = get_field_plan(field.child)
+        return child and {ANY: child}
+
+    if isinstance(field, relations.ManyRelatedField):
+        if _get_known_base(field, (relations.ManyRelatedField,)) is None:
+            return SCAN
+        child = get_field_plan(field.child_relation)
+        return child and {ANY: child}
+
+    if isinstance(field, serializers.Serializer):
+        return get_serializer_plan(field)
+
+    if isinstance(field, fields.MultipleChoiceField):
+        return SCAN
+    if _get_known_base(field, SAFE_FIELDS) is not None:
+        return None
+    if _get_known_base(field, VALUE_FIELDS) is not None:
+        return True
+
+    return SCAN
+
+
+def get_serializer_plan(serializer):
+    """
+    Get big integers stringification plan for serializer output.
+
+    Paths can be declared in serializer ``Meta.double_as_str_fields``
+    as dotted paths where ``*`` matches all members of a list::
+
+        class Meta:
+            double_as_str_fields = ['id', 'account.number', 'items.*.id']
+
+    Otherwise the plan is derived from serializer field types
+    (see ``DerivedPlan``). Any fields which can output anything
+    (e.g. ``SerializerMethodField``) are scanned completely.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        return get_field_plan(serializer)
+
+    meta = getattr(serializer, 'Meta', None)
+    declared = getattr(meta, 'double_as_str_fields', None)
+    if declared is not None:
+        return _declared_plans.get_or_set(
+            (type(serializer), tuple(declared)),
+            lambda: _parse_declared_plan(declared),
+        )
+
+    if _get_known_base(serializer, (serializers.Serializer,)) is None:
+        return SCAN
+
+    plan = DerivedPlan()
+    for name, field in serializer.fields.items():
+        if not field.write_only:
+            plan[name] = get_field_plan(field) or None
+    return plan
+
+
+def get_data_plan(data):
+    """
+    Get big integers stringification plan for the rendered data.
+
+    Plan can only be determined when data is the output of a serializer
+    (DRF ``ReturnDict`` or ``ReturnList``) or a dict with such values
+    (e.g. paginated response).
+
+    Returns:
+        Plan or ``None`` when data has to be scanned completely.
+    """
+    serializer = getattr(data, 'serializer', None)
+    if serializer is not None:
+        return get_serializer_plan(serializer)
+
+    if not isinstance(data, Mapping):
+        return None
+
+    plan = {}
+    found = False
+    for key, value in data.items():
+        serializer = getattr(value, 'serializer', None)
+        if serializer is not None:
+            found = True
+            value_plan = get_serializer_plan(serializer)
+            if value_plan:
+                plan[key] = value_plan
+        elif not isinstance(value, (six.string_types, bool, float, type(None))):
+            plan[key] = SCAN
+
+    return plan if found else None
+
+
+def apply_plan(data, plan, encoder):
+    """
+    Stringify big integers only at the paths of the plan.
+
+    Containers are copied only when any of their values is changed
+    hence data is never modified.
+    """
+    if plan is None:
+        return data
+
+    if plan is True:
+        if type(data) is int or isinstance(data, six.integer_types) and not isinstance(data, bool):
+            if encoder.is_big_int(data):
+                return six.text_type(data)
+        return data
+
+    if plan is SCAN:
+        return encoder.transform(data)
+
+    if isinstance(data, Mapping):
+        changed = None
+        derived = isinstance(plan, DerivedPlan)
+        if ANY in plan or derived:
+            items = data.items()
+        else:
+            items = ((k, data[k]) for k in plan if k in data)
+        default = plan.get(ANY, SCAN if derived else None)
+        for key, value in items:
+            new_value = apply_plan(value, plan.get(key, default), encoder)
+            if new_value is not value:
+                if changed is None:
+                    changed = dict(data) if ORDERED_DICTS else OrderedDict(data)
+                changed[key] = new_value
+        return data if changed is None else changed
+
+    if isinstance(data, (list, tuple)) and ANY in plan:
+        changed = None
+        child_plan = plan[ANY]
+        for index, value in enumerate(data):
+            new_value = apply_plan(value, child_plan, encoder)
+            if new_value is not value:
+                if changed is None:
+                    changed = list(data)
+                changed[index] = new_value
+        return data if changed is None else changed
+
+    if isinstance(data, GeneratorType):
+        return encoder.transform(data)
+
+    return data
+
+
+class RawJSONSplicer(object):
+    """
+    Splice ``RawJSON`` fragments into JSON encoded by any encoder or backend.
+
+    Wrapped encoder ``default()`` replaces fragments with unique placeholder
+    strings which are then replaced by the fragments in the encoded JSON.
+    """
+
+    def __init__(self):
+        self.token = uuid.uuid4().hex
+        self.fragments = []
+        self.pattern = re.compile(
+            b'"\\\\u0000' + self.token.encode('ascii') + b'-([0-9]+)"'
+        )
+
+    def wrap(self, encoder_class):
+        splicer = self
+
+        class Encoder(encoder_class):
+            def default(self, o):
+                if isinstance(o, RawJSON):
+                    return splicer.add(o)
+                return super(Encoder, self).default(o)
+
+        return Encoder
+
+    def add(self, fragment):
+        self.fragments.append(fragment)
+        return '\x00{}-{}'.format(self.token, len(self.fragments) - 1)
+
+    def splice(self, content):
+        if not self.fragments:
+            return content
+        return self.pattern.sub(
+            lambda match: self.fragments[int(match.group(1))].json.encode('utf-8'),
+            content,
+        )
+
+
+class BackendJSONRenderer(JSONBackendMixin, JSONRenderer):
+    """
+    Regular DRF JSON renderer except JSON is encoded with the backend
+    configured by ``DRF_BRACES_JSON_BACKEND`` setting unless ``json_backend``
+    is set on the renderer.
+
+    ``RawJSON`` fragments (e.g. from ``RawJSONField``) are output verbatim
+    without being decoded or re-encoded.
+    """
+
+    def get_encoder_kwargs(self, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+
+        if indent is None:
+            separators = SHORT_SEPARATORS if self.compact else LONG_SEPARATORS
+        else:
+            separators = INDENT_SEPARATORS
+
+        return {
+            'indent': indent,
+            'ensure_ascii': self.ensure_ascii,
+            'allow_nan': not self.strict,
+            'separators': separators,
+        }
+
+    def escape(self, content):
+        """
+        Same as DRF, always fully escape line and paragraph separators
+        so that output is a strict javascript subset.
+        """
+        return content.replace(LINE_SEPARATOR, b'\\u2028').replace(PARAGRAPH_SEPARATOR, b'\\u2029')
+
+    def dumps(self, data, encoder_class, accepted_media_type=None, renderer_context=None):
+        """
+        Encode `data` with the given encoder, returning a bytestring.
+        """
+        splicer = RawJSONSplicer()
+        content = self.get_json_backend().dumps(
+            data,
+            encoder_class=splicer.wrap(encoder_class),
+            **self.get_encoder_kwargs(accepted_media_type, renderer_context)
+        )
+
+        return self.escape(splicer.splice(content))
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into JSON, returning a bytestring.
+        """
+        if data is None:
+            return b''
+
+        return self.dumps(data, self.encoder_class, accepted_media_type, renderer_context)
+
+
+class DoubleAsStrJsonRenderer(BackendJSONRenderer):
     """
     Regular Json renderer except big integers are converted to strings
 
@@ -31,7 +600,202 @@ class DoubleAsStrJsonRenderer(JSONRenderer):
     all big integers to strings for compatibility reasons.
 
     For usage, custom ``Accept: application/json; double=str`` needs to be passed.
+
+    Same as ``BackendJSONRenderer``, JSON is encoded with the configured
+    JSON backend and ``RawJSON`` fragments are output verbatim.
+
+    When data is serializer output, big integers are only stringified
+    at the paths where the serializer can output integers
+    (see ``get_serializer_plan()``) instead of scanning the whole data.
+    Data is then encoded with regular (and faster) ``plan_encoder_class``.
     """
     encoder_class = DoubleAsStrJsonEncoder
+    # encoder used when big integers are stringified by a plan
+    plan_encoder_class = JSONEncoder
     media_type = 'application/json; double=str'
     format = 'json'
+    # only stringify big integers where serializers can output them
+    use_serializer_plan = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into JSON, returning a bytestring.
+        """
+        if data is None:
+            return b''
+
+        encoder_class = self.encoder_class
+        plan = get_data_plan(data) if self.use_serializer_plan else None
+        if plan is not None:
+            data = apply_plan(data, plan, self.encoder_class())
+            encoder_class = self.plan_encoder_class
+
+        return self.dumps(data, encoder_class, accepted_media_type, renderer_context)
+
+
+class StreamingDoubleAsStrJsonRenderer(DoubleAsStrJsonRenderer):
+    """
+    Same as ``DoubleAsStrJsonRenderer`` except JSON is rendered incrementally.
+
+    ``render()`` returns an iterator of bytes chunks which are encoded
+    as data is being iterated over hence it should be used with
+    ``StreamingHttpResponse`` (e.g. via ``StreamingResponseViewMixin``).
+    When data is a generator (e.g. of serialized queryset rows),
+    neither the data nor the rendered JSON is ever fully in memory.
+
+    Since streaming relies on ``DoubleAsStrJsonEncoder.iterencode()``,
+    JSON backends are not used.
+    """
+    streaming = True
+    # minimum size of yielded chunks in characters
+    chunk_size = 64 * 1024
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into JSON, returning an iterator of bytestrings.
+        """
+        if data is None:
+            return iter([])
+
+        encoder = self.encoder_class(**self.get_encoder_kwargs(accepted_media_type, renderer_context))
+        return self.iter_chunks(encoder.iterencode(data))
+
+    def iter_chunks(self, chunks):
+        """
+        Buffer encoded chunks up to ``chunk_size`` and yield them as bytes.
+        """
+        buffer = []
+        size = 0
+
+        for chunk in chunks:
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= self.chunk_size:
+                yield self.escape(''.join(buffer).encode('utf-8'))
+                buffer = []
+                size = 0
+
+        if buffer:
+            yield self.escape(''.join(buffer).encode('utf-8'))
+
+
+class WrappingJSONRendererMixin(object):
+    """
+    Wrap rendered JSON in the root object which is the opposite
+    of what ``StrippingJSONParser`` does.
+
+    Root is taken from the view ``parser_root`` (see ``StrippingJSONViewMixin``)
+    and can be either a single key or a list of keys of nested roots.
+
+    Instead of wrapping data in an extra dict, the envelope prefix and suffix
+    are written around the rendered JSON hence this also works with streaming
+    renderers. Only when the output is indented, data is wrapped in a dict
+    so that the whole output is consistently indented.
+
+    Error responses are not wrapped.
+
+    Example, for parser_root of "dt_application"::
+
+        data:
+            {"node1": 1234}
+        output:
+            {"dt_application":{"node1":1234}}
+    """
+
+    def get_root_path(self, renderer_context):
+        view = renderer_context.get('view')
+        root = getattr(view, 'parser_root', None)
+        if not root:
+            return None
+        if isinstance(root, six.string_types):
+            return [root]
+        return list(root)
+
+    def get_envelope(self, path):
+        """
+        Get prefix and suffix bytes of the envelope for the given root path.
+        """
+        key_separator = ':' if self.compact else ': '
+        prefix = ''.join(
+            '{' + json.dumps(key, ensure_ascii=self.ensure_ascii) + key_separator
+            for key in path
+        )
+        prefix = prefix.encode('utf-8').replace(LINE_SEPARATOR, b'\\u2028').replace(PARAGRAPH_SEPARATOR, b'\\u2029')
+        return prefix, ('}' * len(path)).encode('utf-8')
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        response = renderer_context.get('response')
+        path = self.get_root_path(renderer_context)
+
+        if data is None or not path or getattr(response, 'exception', False):
+            return super(WrappingJSONRendererMixin, self).render(
+                data, accepted_media_type, renderer_context
+            )
+
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            for key in reversed(path):
+                data = OrderedDict([(key, data)])
+            return super(WrappingJSONRendererMixin, self).render(
+                data, accepted_media_type, renderer_context
+            )
+
+        content = super(WrappingJSONRendererMixin, self).render(
+            data, accepted_media_type, renderer_context
+        )
+        prefix, suffix = self.get_envelope(path)
+
+        if isinstance(content, bytes):
+            return b''.join([prefix, content, suffix])
+        return itertools.chain([prefix], content, [suffix])
+
+
+class WrappingJSONRenderer(WrappingJSONRendererMixin, BackendJSONRenderer):
+    """
+    ``BackendJSONRenderer`` which wraps data in the root object.
+    """
+
+
+class WrappingDoubleAsStrJsonRenderer(WrappingJSONRendererMixin, DoubleAsStrJsonRenderer):
+    """
+    ``DoubleAsStrJsonRenderer`` which wraps data in the root object.
+    """
+
+
+class StreamingWrappingDoubleAsStrJsonRenderer(WrappingJSONRendererMixin, StreamingDoubleAsStrJsonRenderer):
+    """
+    ``StreamingDoubleAsStrJsonRenderer`` which wraps data in the root object.
+    """
+
+
+class MsgPackRenderer(BaseRenderer):
+    """
+    Renderer which serializes data into MessagePack.
+
+    Compact binary counterpart of ``DoubleAsStrJsonRenderer``
+    for service-to-service calls which is considerably cheaper to encode
+    than JSON. ``msgpack`` package is used when installed, otherwise data
+    is encoded by the bundled pure-Python implementation.
+
+    Same as ``DoubleAsStrJsonRenderer``, big integers are rendered
+    as strings and any other types are rendered via ``encoder_class``.
+    ``RawJSON`` fragments are decoded and rendered as regular data.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    encoder_class = DoubleAsStrJsonEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        encoder = self.encoder_class()
+
+        def default(o):
+            if isinstance(o, RawJSON):
+                return json.loads(o.json)
+            return encoder.default(o)
+
+        return packb(data, default=default, is_big_int=encoder.is_big_int)
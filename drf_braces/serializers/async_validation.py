@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+"""
+Asyncio-native validation of serializers.
+
+.. note::
+    This module requires Python 3 and ``asgiref`` (which Django 3.0+ depends on).
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+import asyncio
+import inspect
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core import validators as django_validators
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import fields, validators as drf_validators
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import SkipField, empty, get_error_detail, set_value
+from rest_framework.serializers import BaseSerializer, ListSerializer, Serializer, as_serializer_error
+from rest_framework.settings import api_settings
+from rest_framework.utils import html
+
+from .form_serializer import LazyLoadingValidationsMixin
+
+
+# fields and validators which never do any I/O hence fields of exactly
+# these classes with only these validators are validated on the event loop
+# while any other field (e.g. related field) is validated in a worker thread
+IO_FREE_FIELDS = frozenset(filter(None, [
+    fields.BooleanField,
+    fields.CharField,
+    fields.ChoiceField,
+    fields.DateField,
+    fields.DateTimeField,
+    fields.DecimalField,
+    fields.EmailField,
+    fields.FloatField,
+    fields.IntegerField,
+    getattr(fields, 'NullBooleanField', None),
+    fields.TimeField,
+    fields.UUIDField,
+]))
+IO_FREE_VALIDATORS = frozenset(filter(None, [
+    django_validators.EmailValidator,
+    django_validators.MaxLengthValidator,
+    django_validators.MaxValueValidator,
+    django_validators.MinLengthValidator,
+    django_validators.MinValueValidator,
+    django_validators.RegexValidator,
+    getattr(django_validators, 'ProhibitNullCharactersValidator', None),
+    getattr(drf_validators, 'ProhibitSurrogateCharactersValidator', None),
+]))
+# serializer methods which ais_valid() reimplements asynchronously
+# hence serializers overriding them with anything else are validated
+# by running their own run_validation() in a worker thread
+ASYNC_REIMPLEMENTED_METHODS = {
+    'run_validation': frozenset([
+        Serializer.run_validation,
+    ]),
+    'to_internal_value': frozenset([
+        Serializer.to_internal_value,
+        LazyLoadingValidationsMixin.to_internal_value,
+    ]),
+}
+
+
+def is_io_free_field(field):
+    return type(field) in IO_FREE_FIELDS and all(type(i) in IO_FREE_VALIDATORS for i in field.validators)
+
+
+def is_async_callable(func):
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(getattr(func, '__call__', None))
+
+
+def overrides_validation(serializer_class):
+    """
+    Check whether serializer customizes validation beyond what ``ais_valid()`` reimplements.
+    """
+    return any(
+        getattr(serializer_class, name) not in methods
+        for name, methods in ASYNC_REIMPLEMENTED_METHODS.items()
+    )
+
+
+def run_sync(func, *args, **kwargs):
+    """
+    Run sync callable in a worker thread without blocking the event loop.
+
+    Thread-sensitive callables (``thread_sensitive=True`` by default)
+    run one at a time in the same thread which is safe for anything
+    using thread-local state such as Django database connections.
+    """
+    thread_sensitive = kwargs.pop('thread_sensitive', True)
+    return sync_to_async(func, thread_sensitive=thread_sensitive)(*args, **kwargs)
+
+
+class SyncValidator(object):
+    """
+    Sync wrapper of async validator so that sync validation such as ``is_valid()`` awaits it.
+    """
+
+    def __init__(self, validator):
+        self.validator = validator
+        self.requires_context = getattr(validator, 'requires_context', False)
+
+    def __call__(self, *args):
+        return async_to_sync(self.validator)(*args)
+
+
+def wrap_async_validators(obj):
+    """
+    Wrap async validators of the field or serializer with ``SyncValidator``.
+
+    Otherwise DRF calls async validators without awaiting them
+    which silently skips their validation.
+    """
+    if any(is_async_callable(i) for i in obj.validators):
+        obj.validators = [SyncValidator(i) if is_async_callable(i) else i for i in obj.validators]
+
+
+def pop_async_validators(obj):
+    """
+    Separate async validators of the field or serializer from its sync validators.
+
+    Sync validators are left in ``obj.validators`` so that DRF
+    keeps running them while async validators are returned.
+    """
+    if '_async_validators' not in vars(obj):
+        validators = list(obj.validators)
+        obj._async_validators = [
+            i.validator if isinstance(i, SyncValidator) else i
+            for i in validators
+            if isinstance(i, SyncValidator) or is_async_callable(i)
+        ]
+        if obj._async_validators:
+            obj.validators = [
+                i for i in validators
+                if not isinstance(i, SyncValidator) and not is_async_callable(i)
+            ]
+    return obj._async_validators
+
+
+async def arun_validators(validators, value, context):
+    """
+    Concurrently run async validators with same semantics as ``Field.run_validators()``.
+    """
+    results = await asyncio.gather(*[
+        validator(value, context) if getattr(validator, 'requires_context', False) else validator(value)
+        for validator in validators
+    ], return_exceptions=True)
+
+    errors = []
+    for result in results:
+        if isinstance(result, ValidationError):
+            if isinstance(result.detail, dict):
+                raise result
+            errors.extend(result.detail)
+        elif isinstance(result, DjangoValidationError):
+            errors.extend(get_error_detail(result))
+        elif isinstance(result, BaseException):
+            raise result
+    if errors:
+        raise ValidationError(errors)
+
+
+class AsyncValidationSerializerMixin(BaseSerializer):
+    """
+    Validate serializer without blocking the event loop.
+
+    ``ais_valid()`` is an awaitable equivalent of ``is_valid()``
+    where all fields are validated concurrently:
+
+    * async validators (coroutine functions or objects with
+      async ``__call__``) of fields and of the serializer are awaited
+      concurrently
+    * ``avalidate_<field>()`` and ``avalidate()`` coroutine methods
+      are awaited when defined
+    * sync hooks which can do I/O (validation of fields other than
+      ``IO_FREE_FIELDS`` such as related fields, sync validators,
+      ``validate_<field>()``, ``validate()`` including ``FormSerializer``
+      form validation and ``LazyLoadingValidationsMixin`` choice loading)
+      run in a worker thread
+    * nested serializers with this mixin are validated concurrently as well
+    * serializers overriding ``run_validation()`` or ``to_internal_value()``
+      are validated with their own ``run_validation()`` in a worker thread
+      since their custom validation cannot be reproduced asynchronously
+
+    Sync validation such as ``is_valid()`` awaits async validators and
+    ``avalidate_<field>()``/``avalidate()`` hooks as well hence it cannot
+    be used within a running event loop.
+
+    Sync hooks are thread-sensitive by default hence they run one at a time
+    which is safe for the Django ORM. Set ``async_thread_sensitive = False``
+    to run independent sync hooks concurrently when they are thread-safe.
+
+    For example::
+
+        class PaymentSerializer(AsyncValidationSerializerMixin, LazyLoadingValidationsMixin, FormSerializer):
+            class Meta(object):
+                form = PaymentForm
+
+            async def avalidate_account(self, value):
+                await check_account(value)
+                return value
+
+        serializer = PaymentSerializer(data=data)
+        await serializer.ais_valid(raise_exception=True)
+    """
+    async_thread_sensitive = True
+
+    def run_sync(self, func, *args, **kwargs):
+        return run_sync(func, *args, thread_sensitive=self.async_thread_sensitive, **kwargs)
+
+    def __getattr__(self, name):
+        # sync validation looks up validate_<field>() hooks
+        # which for avalidate_<field>() hooks are awaited instead
+        if name.startswith('validate_'):
+            avalidate_method = getattr(type(self), 'a' + name, None)
+            if avalidate_method is not None:
+                return lambda value: async_to_sync(avalidate_method)(self, value)
+        raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+
+    def get_fields(self):
+        fields = super(AsyncValidationSerializerMixin, self).get_fields()
+        for field in fields.values():
+            wrap_async_validators(field)
+        return fields
+
+    def run_validators(self, value):
+        wrap_async_validators(self)
+        super(AsyncValidationSerializerMixin, self).run_validators(value)
+
+    def validate(self, attrs):
+        if type(self).avalidate is not AsyncValidationSerializerMixin.avalidate:
+            return async_to_sync(self.avalidate)(attrs)
+        return super(AsyncValidationSerializerMixin, self).validate(attrs)
+
+    async def ais_valid(self, raise_exception=False):
+        assert hasattr(self, 'initial_data'), (
+            'Cannot call `.ais_valid()` as no `data=` keyword argument was '
+            'passed when instantiating the serializer instance.'
+        )
+
+        if not hasattr(self, '_validated_data'):
+            try:
+                self._validated_data = await self.arun_validation(self.initial_data)
+            except ValidationError as exc:
+                self._validated_data = {}
+                self._errors = exc.detail
+            else:
+                self._errors = {}
+
+        if self._errors and raise_exception:
+            raise ValidationError(self.errors)
+
+        return not bool(self._errors)
+
+    async def arun_validation(self, data=empty):
+        if overrides_validation(type(self)):
+            return await self.run_sync(self.run_validation, data)
+
+        (is_empty_value, data) = self.validate_empty_values(data)
+        if is_empty_value:
+            return data
+
+        value = await self.ato_internal_value(data)
+        try:
+            await self.arun_validators(value)
+            value = await self.avalidate(value)
+            assert value is not None, '.avalidate() should return the validated data'
+        except (ValidationError, DjangoValidationError) as exc:
+            raise ValidationError(detail=as_serializer_error(exc))
+
+        return value
+
+    async def ato_internal_value(self, data):
+        if not isinstance(data, Mapping):
+            message = self.error_messages['invalid'].format(datatype=type(data).__name__)
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]}, code='invalid')
+
+        if isinstance(self, LazyLoadingValidationsMixin):
+            await self.run_sync(self.repopulate_form_fields)
+
+        writable_fields = list(self._writable_fields)
+        results = await asyncio.gather(*[
+            self._avalidate_field(field, field.get_value(data)) for field in writable_fields
+        ])
+
+        ret = OrderedDict()
+        errors = OrderedDict()
+        for field, (value, error) in zip(writable_fields, results):
+            if error is not None:
+                errors[field.field_name] = error
+            elif value is not empty:
+                set_value(ret, field.source_attrs, value)
+
+        if errors:
+            raise ValidationError(errors)
+
+        return ret
+
+    async def _avalidate_field(self, field, primitive_value):
+        try:
+            return await self.arun_field_validation(field, primitive_value), None
+        except ValidationError as exc:
+            return empty, exc.detail
+        except DjangoValidationError as exc:
+            return empty, get_error_detail(exc)
+        except SkipField:
+            return empty, None
+
+    async def arun_field_validation(self, field, primitive_value):
+        """
+        Validate value of a single field along with its ``(a)validate_<field>()`` hook.
+        """
+        if isinstance(field, AsyncValidationSerializerMixin):
+            value = await field.arun_validation(primitive_value)
+        elif isinstance(field, ListSerializer) and isinstance(field.child, AsyncValidationSerializerMixin):
+            value = await self.arun_list_validation(field, primitive_value)
+        else:
+            async_validators = pop_async_validators(field)
+            if is_io_free_field(field):
+                value = field.run_validation(primitive_value)
+            else:
+                value = await self.run_sync(field.run_validation, primitive_value)
+
+            # same as DRF, validators are not run for empty values
+            if async_validators and not field.validate_empty_values(primitive_value)[0]:
+                try:
+                    await arun_validators(async_validators, value, field)
+                except ValidationError as exc:
+                    # let fields such as enforce validation fields skip invalid values
+                    handle_validation_error = getattr(field, 'handle_validation_error', None)
+                    if handle_validation_error is None:
+                        raise
+                    handle_validation_error(primitive_value, exc)
+
+        avalidate_method = getattr(self, 'avalidate_' + field.field_name, None)
+        validate_method = getattr(self, 'validate_' + field.field_name, None)
+        if avalidate_method is not None:
+            value = await avalidate_method(value)
+        elif validate_method is not None:
+            value = await self.run_sync(validate_method, value)
+
+        return value
+
+    async def arun_list_validation(self, field, data):
+        """
+        Concurrently validate items of many=True nested serializer.
+        """
+        (is_empty_value, data) = field.validate_empty_values(data)
+        if is_empty_value:
+            return data
+
+        if html.is_html_input(data):
+            data = html.parse_html_list(data, default=[])
+        if not isinstance(data, list):
+            message = field.error_messages['not_a_list'].format(input_type=type(data).__name__)
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]}, code='not_a_list')
+        if not field.allow_empty and len(data) == 0:
+            message = field.error_messages['empty']
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]}, code='empty')
+
+        results = await asyncio.gather(*[field.child.arun_validation(i) for i in data], return_exceptions=True)
+
+        errors = []
+        for result in results:
+            if isinstance(result, ValidationError):
+                errors.append(result.detail)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                errors.append({})
+        if any(errors):
+            raise ValidationError(errors)
+
+        try:
+            await self.run_sync(field.run_validators, results)
+            results = await self.run_sync(field.validate, results)
+        except (ValidationError, DjangoValidationError) as exc:
+            raise ValidationError(detail=as_serializer_error(exc))
+        return results
+
+    async def arun_validators(self, value):
+        async_validators = pop_async_validators(self)
+        if self.validators:
+            await self.run_sync(self.run_validators, value)
+        if async_validators:
+            if isinstance(value, dict):
+                to_validate = self._read_only_defaults()
+                to_validate.update(value)
+            else:
+                to_validate = value
+            await arun_validators(async_validators, to_validate, self)
+
+    async def avalidate(self, attrs):
+        """
+        Awaitable equivalent of ``validate()`` which by default runs ``validate()`` in a worker thread.
+        """
+        validate = self.validate
+        if type(self).validate is AsyncValidationSerializerMixin.validate:
+            # sync validate() of the mixin would await overridden avalidate() again
+            validate = super(AsyncValidationSerializerMixin, self).validate
+        return await self.run_sync(validate, attrs)
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, unicode_literals
+import threading
+import time
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_delete, post_save
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from ..utils import LRUCache
+
+
+def _get_class_path(klass):
+    return '{}.{}'.format(klass.__module__, getattr(klass, '__qualname__', klass.__name__))
+
+
+def _get_meta_option(serializer_class, name, default):
+    return getattr(getattr(serializer_class, 'Meta', None), name, default)
+
+
+class LocalMemoryRepresentationCache(object):
+    """
+    In-process LRU cache of serializer representations.
+
+    Cached representations are returned as they are without being copied
+    hence they must be treated as read-only.
+
+    Args:
+        maxsize (int): Maximum number of cached instances
+        timeout (int): Number of seconds after which entries expire
+            or ``None`` to never expire them
+    """
+
+    def __init__(self, maxsize=1024, timeout=None):
+        self.timeout = timeout
+        self._cache = LRUCache(maxsize=maxsize)
+
+    def get(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires is not None and expires < time.time():
+            self._cache.pop(key)
+            return None
+        return value
+
+    def set(self, key, value):
+        expires = time.time() + self.timeout if self.timeout is not None else None
+        self._cache.set(key, (expires, value))
+
+    def delete(self, key):
+        self._cache.pop(key)
+
+    def clear(self):
+        self._cache.clear()
+
+
+class DjangoRepresentationCache(object):
+    """
+    Cache of serializer representations stored in Django cache.
+
+    Args:
+        alias (str): Alias of the cache in ``CACHES`` setting
+        timeout (int): Number of seconds after which entries expire.
+            Defaults to the timeout of the Django cache.
+        key_prefix (str): Prefix of all cache keys
+    """
+    default_timeout = object()
+
+    def __init__(self, alias='default', timeout=default_timeout, key_prefix='drf-braces-repr'):
+        self.alias = alias
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def make_key(self, key):
+        serializer_class, pk = key
+        return '{}:{}:{}'.format(self.key_prefix, _get_class_path(serializer_class), pk)
+
+    def get(self, key):
+        return self.cache.get(self.make_key(key))
+
+    def set(self, key, value):
+        if self.timeout is self.default_timeout:
+            self.cache.set(self.make_key(key), value)
+        else:
+            self.cache.set(self.make_key(key), value, self.timeout)
+
+    def delete(self, key):
+        self.cache.delete(self.make_key(key))
+
+    def clear(self):
+        self.cache.clear()
+
+
+default_representation_cache = LocalMemoryRepresentationCache()
+
+
+class CachedRepresentationSerializerMixin(BaseSerializer):
+    """
+    Cache ``to_representation()`` of model instances.
+
+    Representations are cached per serializer class and instance pk
+    along with the instance version (``updated_at`` by default)
+    hence updated instances are re-serialized without any invalidation.
+    Instances without a version (e.g. ``None`` ``updated_at``) are not cached.
+    Each instance has a single cache entry holding its representations
+    of all variants (e.g. sparse fieldsets) so it is looked up
+    with a single cache read and invalidated with a single delete.
+
+    Cache is configured via ``Meta``::
+
+        class DealerSerializer(CachedRepresentationSerializerMixin, serializers.ModelSerializer):
+            class Meta(object):
+                model = Dealer
+                fields = '__all__'
+                # attribute or callable returning instance version
+                representation_cache_version = 'modified'
+                # LocalMemoryRepresentationCache or DjangoRepresentationCache
+                representation_cache = DjangoRepresentationCache('serializers')
+
+    Any other serializer can be cached with ``cached_representation(SomeSerializer)``
+    including ones swapped by ``SwappingSerializerMixin``::
+
+        class Meta(object):
+            swappable_fields = {
+                VehicleSerializer: cached_representation(HyperlinkedVehicleSerializer),
+            }
+
+    Use ``invalidate_representation()`` or ``invalidate_representation_on_save()``
+    to invalidate instances which change without changing their version.
+    """
+
+    def get_representation_cache(self):
+        return _get_meta_option(type(self), 'representation_cache', default_representation_cache)
+
+    def get_representation_version(self, instance):
+        """
+        Get version of the instance or ``None`` when it is not known
+        (e.g. ``updated_at`` is not set yet) in which case
+        representation of the instance is not cached.
+        """
+        version = _get_meta_option(type(self), 'representation_cache_version', 'updated_at')
+        if callable(version):
+            return version(instance)
+        if not hasattr(instance, version):
+            raise ImproperlyConfigured(
+                '{} cannot cache representation of {} which has no "{}" version attribute. '
+                'Set Meta.representation_cache_version to its version attribute or callable.'
+                ''.format(type(self).__name__, type(instance).__name__, version)
+            )
+        return getattr(instance, version)
+
+    def get_representation_variant(self):
+        """
+        Get variant of the representation which serializer outputs.
+
+        Variant is the tree of readable fields along with classes
+        of nested serializers hence sparse fieldsets and swapped
+        serializers are cached separately. Serializers whose output
+        depends on anything else than the instance (e.g. request)
+        should include it in the variant.
+        """
+        if '_representation_variant' not in vars(self):
+            self._representation_variant = repr(_get_fields_tree(self))
+        return self._representation_variant
+
+    def to_representation(self, instance):
+        pk = getattr(instance, 'pk', None)
+        version = None if pk is None else self.get_representation_version(instance)
+        # cached unversioned representations would never become stale
+        if version is None:
+            return super(CachedRepresentationSerializerMixin, self).to_representation(instance)
+
+        cache = self.get_representation_cache()
+        key = get_representation_cache_key(type(self), pk)
+        variant = self.get_representation_variant()
+
+        entry = cache.get(key)
+        if entry is not None and entry['version'] == version:
+            try:
+                return entry['variants'][variant]
+            except KeyError:
+                pass
+        else:
+            entry = {'version': version, 'variants': {}}
+
+        representation = super(CachedRepresentationSerializerMixin, self).to_representation(instance)
+        # copy variants so that concurrently read entries are not mutated
+        variants = dict(entry['variants'])
+        variants[variant] = representation
+        cache.set(key, {'version': version, 'variants': variants})
+        return representation
+
+
+def _get_fields_tree(serializer):
+    if isinstance(serializer, ListSerializer):
+        serializer = serializer.child
+    return tuple(
+        (name, _get_class_path(type(field)), _get_fields_tree(field))
+        if isinstance(field, BaseSerializer) else name
+        for name, field in serializer.fields.items()
+        if not field.write_only
+    )
+
+
+def get_representation_cache_key(serializer_class, pk):
+    return (serializer_class, pk)
+
+
+_cached_classes = {}
+_lock = threading.Lock()
+
+
+def cached_representation(serializer_class):
+    """
+    Get subclass of the serializer which caches its representations.
+
+    Same subclass is returned for the same serializer class
+    so it can be used in place of the serializer anywhere
+    (e.g. ``swappable_fields`` of ``SwappingSerializerMixin``).
+    """
+    if issubclass(serializer_class, CachedRepresentationSerializerMixin):
+        return serializer_class
+
+    with _lock:
+        if serializer_class not in _cached_classes:
+            _cached_classes[serializer_class] = type(
+                str('Cached{}'.format(serializer_class.__name__)),
+                (CachedRepresentationSerializerMixin, serializer_class),
+                {'__module__': serializer_class.__module__},
+            )
+        return _cached_classes[serializer_class]
+
+
+def invalidate_representation(serializer_class, instance_or_pk):
+    """
+    Invalidate all cached representations of the instance by the serializer.
+    """
+    serializer_class = cached_representation(serializer_class)
+    pk = getattr(instance_or_pk, 'pk', instance_or_pk)
+    cache = _get_meta_option(serializer_class, 'representation_cache', default_representation_cache)
+    cache.delete(get_representation_cache_key(serializer_class, pk))
+
+
+def invalidate_representation_on_save(serializer_class, model=None):
+    """
+    Invalidate cached representations whenever model instance is saved or deleted.
+
+    Args:
+        serializer_class: Serializer class whose representations are invalidated
+        model: Model class. Defaults to ``Meta.model`` of the serializer.
+    """
+    model = model or serializer_class.Meta.model
+
+    def receiver(sender, instance, **kwargs):
+        invalidate_representation(serializer_class, instance)
+
+    dispatch_uid = 'drf-braces-invalidate-{}'.format(_get_class_path(serializer_class))
+    post_save.connect(receiver, sender=model, weak=False, dispatch_uid=dispatch_uid)
+    post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=dispatch_uid)
+    return receiver
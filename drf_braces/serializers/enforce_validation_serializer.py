@@ -22,20 +22,26 @@ class EnforceValidationFieldMixin(object):
         try:
             return super(EnforceValidationFieldMixin, self).run_validation(data)
         except serializers.ValidationError as e:
-            must_validate_fields = getattr(self.parent, 'must_validate_fields', None)
-            field_name = getattr(self, 'field_name')
-
-            # only re-raise validation error when this field must be validated
-            # as defined by must_validate_fields list on the parent serializer
-            # or if must_validate_fields is not defined
-            if must_validate_fields is None or field_name in must_validate_fields:
-                raise
-            else:
-                self.capture_failed_field(field_name, data, e.detail)
-                raise fields.SkipField(
-                    'This field "{}" is being skipped as per enforce validation logic.'
-                    ''.format(field_name)
-                )
+            self.handle_validation_error(data, e)
+
+    def handle_validation_error(self, data, error):
+        """
+        Either re-raise validation error of the field or skip the field.
+        """
+        must_validate_fields = getattr(self.parent, 'must_validate_fields', None)
+        field_name = getattr(self, 'field_name')
+
+        # only re-raise validation error when this field must be validated
+        # as defined by must_validate_fields list on the parent serializer
+        # or if must_validate_fields is not defined
+        if must_validate_fields is None or field_name in must_validate_fields:
+            raise error
+        else:
+            self.capture_failed_field(field_name, data, error.detail)
+            raise fields.SkipField(
+                'This field "{}" is being skipped as per enforce validation logic.'
+                ''.format(field_name)
+            )
 
     def capture_failed_field(self, field_name, field_data, error_msg):
         """
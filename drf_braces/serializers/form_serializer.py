@@ -38,15 +38,21 @@ class FormSerializerFieldMixin(object):
         try:
             return super(FormSerializerFieldMixin, self).run_validation(data)
         except (serializers.ValidationError, forms.ValidationError) as e:
-            # Only handle a ValidationError if the full validation is
-            # requested or if field is in minimum required in the case
-            # of partial validation.
-            if any([not self.parent.partial,
-                    self.parent.Meta.failure_mode == FormSerializerFailure.fail,
-                    self.field_name in self.parent.Meta.minimum_required]):
-                raise
-            self.capture_failed_field(self.field_name, data, e.detail)
-            raise serializers.SkipField
+            self.handle_validation_error(data, e)
+
+    def handle_validation_error(self, data, error):
+        """
+        Either re-raise validation error of the field or skip the field.
+        """
+        # Only handle a ValidationError if the full validation is
+        # requested or if field is in minimum required in the case
+        # of partial validation.
+        if any([not self.parent.partial,
+                self.parent.Meta.failure_mode == FormSerializerFailure.fail,
+                self.field_name in self.parent.Meta.minimum_required]):
+            raise error
+        self.capture_failed_field(self.field_name, data, error.detail)
+        raise serializers.SkipField
 
     def capture_failed_field(self, field_name, field_data, error_msg):
         """
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, unicode_literals
+from collections import OrderedDict
+
+import six
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+
+# serializer context key of requested fields
+REQUESTED_FIELDS = 'requested_fields'
+
+
+def parse_requested_fields(value):
+    """
+    Parse requested fields into a tree of field names.
+
+    Args:
+        value: Comma-separated string or list of field names
+            where nested fields are selected by dotted paths
+            such as ``"id,author.name"``
+
+    Returns:
+        ``OrderedDict`` of field names to either ``None`` when the whole
+        field is requested or tree of its requested nested fields.
+    """
+    if isinstance(value, six.string_types):
+        value = value.split(',')
+
+    tree = OrderedDict()
+    for path in value:
+        path = [i.strip() for i in path.split('.')]
+        if not all(path):
+            continue
+        node = tree
+        for name in path[:-1]:
+            if name in node and node[name] is None:
+                break
+            node = node.setdefault(name, OrderedDict())
+        else:
+            # whole field supersedes any of its nested fields
+            node[path[-1]] = None
+    return tree
+
+
+def restrict_fields(field, requested):
+    """
+    Restrict nested serializer field to only requested fields.
+
+    Serializers with ``SparseFieldsetSerializerMixin`` only build
+    requested fields. Any other serializers are pruned after their fields are built.
+    """
+    if requested is None:
+        return
+    if isinstance(field, ListSerializer):
+        field = field.child
+    if not isinstance(field, BaseSerializer):
+        return
+
+    if isinstance(field, SparseFieldsetSerializerMixin):
+        field._requested_fields = requested
+        return
+
+    for name in list(field.fields):
+        if name not in requested:
+            del field.fields[name]
+        else:
+            restrict_fields(field.fields[name], requested[name])
+
+
+class SparseFieldsetSerializerMixin(BaseSerializer):
+    """
+    Only build and render requested fields.
+
+    Requested fields are taken from ``requested_fields`` serializer context
+    (see ``parse_requested_fields()``) which ``SparseFieldsetViewMixin``
+    populates from the request query parameters.
+    Nested fields can be requested by dotted paths such as ``"author.name"``.
+
+    Unlike removing fields once serializer is initialized, fields which
+    are not requested are never copied (declared fields) nor built
+    (``ModelSerializer`` fields) hence serializers with many fields
+    are considerably cheaper when only few fields are needed.
+    Unknown fields are ignored.
+
+    For example::
+
+        class BookSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+            author = AuthorSerializer()
+
+            class Meta(object):
+                model = Book
+                fields = '__all__'
+
+        BookSerializer(book, context={'requested_fields': parse_requested_fields('id,author.name')})
+    """
+
+    def get_requested_fields(self):
+        if '_requested_fields' in vars(self):
+            return self._requested_fields
+
+        # only the root serializer uses context since nested serializers share it
+        parent = self.parent
+        if parent is None or (isinstance(parent, ListSerializer) and parent.parent is None):
+            requested = self.context.get(REQUESTED_FIELDS)
+            if requested is not None and not isinstance(requested, dict):
+                requested = parse_requested_fields(requested)
+            return requested
+
+        return None
+
+    def get_fields(self):
+        requested = self.get_requested_fields()
+        if requested is None:
+            return super(SparseFieldsetSerializerMixin, self).get_fields()
+
+        # shadow declared fields so that only requested ones are copied
+        self._declared_fields = OrderedDict(
+            (name, field) for name, field in type(self)._declared_fields.items()
+            if name in requested
+        )
+        try:
+            fields = super(SparseFieldsetSerializerMixin, self).get_fields()
+        finally:
+            del self._declared_fields
+
+        fields = OrderedDict((name, field) for name, field in fields.items() if name in requested)
+        for name, field in fields.items():
+            restrict_fields(field, requested[name])
+        return fields
+
+    def get_field_names(self, declared_fields, info):
+        """
+        Only build requested fields of ``ModelSerializer``.
+        """
+        field_names = super(SparseFieldsetSerializerMixin, self).get_field_names(declared_fields, info)
+        requested = self.get_requested_fields()
+        if requested is None:
+            return field_names
+        return [i for i in field_names if i in requested]
@@ -0,0 +1,47 @@
+from __future__ import absolute_import, print_function, unicode_literals
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountTestMixin(object):
+    """
+    ``TestCase`` mixin with assertions about number of executed queries.
+    """
+
+    def assertConstantQueries(self, func, grow, steps=2, using=DEFAULT_DB_ALIAS):
+        """
+        Assert that number of queries ``func()`` executes does not depend
+        on the amount of data, i.e. that it does not do N+1 queries.
+
+        ``func()`` is called ``steps`` times and before each call
+        ``grow()`` is called to add more data. Since queries for empty
+        data can be skipped (e.g. prefetching), data is grown before
+        the first call as well.
+
+        Example::
+
+            def test_list(self):
+                self.assertConstantQueries(
+                    lambda: self.client.get('/books/'),
+                    lambda: BookFactory.create_batch(5),
+                )
+        """
+        counts = []
+        captured = []
+
+        for _ in range(steps):
+            grow()
+            with CaptureQueriesContext(connections[using]) as context:
+                func()
+            counts.append(len(context))
+            captured.append(context.captured_queries)
+
+        if len(set(counts)) > 1:
+            queries = '\n'.join(
+                '{}. {}'.format(i, query['sql']) for i, query in enumerate(captured[-1], 1)
+            )
+            self.fail(
+                'Number of queries grows with data: {}\n'
+                'Queries of the last call:\n{}'.format(counts, queries)
+            )
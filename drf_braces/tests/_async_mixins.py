@@ -0,0 +1,139 @@
+from __future__ import absolute_import, print_function, unicode_literals
+import asyncio
+import unittest
+
+from asgiref.sync import async_to_sync
+from rest_framework import serializers, status
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from ..async_mixins import (
+    AsyncMapDataViewMixin,
+    AsyncStreamingListViewMixin,
+    AsyncValidationViewMixin,
+)
+from ..mappers import DataMapper, Map
+from ..serializers.async_validation import AsyncValidationSerializerMixin
+
+
+async def positive(value):
+    await asyncio.sleep(0)
+    if value <= 0:
+        raise serializers.ValidationError('Must be positive.')
+
+
+class Serializer(AsyncValidationSerializerMixin, serializers.Serializer):
+    id = serializers.IntegerField(validators=[positive])
+
+
+class SyncSerializer(serializers.Serializer):
+    id = serializers.IntegerField(min_value=1)
+
+
+class TestAsyncValidationViewMixin(unittest.TestCase):
+    def setUp(self):
+        super(TestAsyncValidationViewMixin, self).setUp()
+
+        class Mapper(DataMapper):
+            id = Map('record.pk')
+
+        class View(AsyncValidationViewMixin, GenericAPIView):
+            serializer_class = Serializer
+
+            def post(self, request):
+                serializer_class = SyncSerializer if request.query_params.get('sync') else None
+                serializer = async_to_sync(self.avalidate)(serializer_class=serializer_class)
+                return Response(serializer.validated_data, status=status.HTTP_201_CREATED)
+
+        class MappedView(AsyncMapDataViewMixin, View):
+            data_mapper_class = Mapper
+
+        self.view = View.as_view()
+        self.mapped_view = MappedView.as_view()
+        self.factory = APIRequestFactory()
+
+    def test_avalidate(self):
+        response = self.view(self.factory.post('/', {'id': 1}, format='json'))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {'id': 1})
+
+    def test_avalidate_invalid(self):
+        response = self.view(self.factory.post('/', {'id': 0}, format='json'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'id': ['Must be positive.']})
+
+    def test_avalidate_sync_serializer(self):
+        response = self.view(self.factory.post('/?sync=1', {'id': 0}, format='json'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.data), ['id'])
+
+    def test_avalidate_mapped(self):
+        response = self.mapped_view(self.factory.post('/', {'record': {'pk': 5}}, format='json'))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {'id': 5})
+
+
+class TestAsyncStreamingListViewMixin(unittest.TestCase):
+    def setUp(self):
+        super(TestAsyncStreamingListViewMixin, self).setUp()
+
+        class View(AsyncStreamingListViewMixin, GenericAPIView):
+            serializer_class = Serializer
+            validation_concurrency = 2
+
+            def post(self, request):
+                self.validated = []
+                async_to_sync(self.consume)()
+                return Response(status=status.HTTP_201_CREATED)
+
+            async def consume(self):
+                async for data in self.aget_validated_records():
+                    self.validated.append(data)
+
+        self.view_class = View
+        self.factory = APIRequestFactory()
+
+    def post(self, content, **initkwargs):
+        request = self.factory.post('/', content, content_type='application/x-ndjson')
+        views = []
+
+        class View(self.view_class):
+            def initial(self, *args, **kwargs):
+                views.append(self)
+                return super(View, self).initial(*args, **kwargs)
+
+        response = View.as_view(**initkwargs)(request)
+        return response, views[0]
+
+    def test_aget_validated_records(self):
+        response, view = self.post(b'{"id": 1}\n{"id": "2"}\n{"id": 3}\n')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(view.validated, [{'id': 1}, {'id': 2}, {'id': 3}])
+
+    def test_aget_validated_records_invalid(self):
+        response, view = self.post(b'{"id": 1}\n{"id": 0}\n{"id": 3}\n{"id": -1}\n')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {1: {'id': ['Must be positive.']}, 3: {'id': ['Must be positive.']}})
+        self.assertEqual(view.validated, [{'id': 1}, {'id': 3}])
+
+    def test_fail_fast(self):
+        response, view = self.post(b'{"id": 1}\n{"id": 0}\n{"id": 3}\n', fail_fast=True)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.data), [1])
+        self.assertEqual(view.validated, [{'id': 1}])
+
+    def test_sync_serializer(self):
+        self.view_class.serializer_class = SyncSerializer
+
+        response, view = self.post(b'{"id": 1}\n{"id": 0}\n')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(view.validated, [{'id': 1}])
@@ -5,14 +5,23 @@ from decimal import ROUND_DOWN, Decimal
 
 import mock
 import pytz
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework import serializers
+from rest_framework.fields import ValidationError, empty
 
 from ...fields.custom import (
     NonValidatingChoiceField,
     PositiveIntegerField,
+    RawJSONField,
     RoundedDecimalField,
+    StreamingFileField,
+    StreamingImageField,
     UTCDateTimeField,
     UnvalidatedField,
 )
+from ...jsonbackends import RawJSON
+from ...uploads import UploadRejected
+from ..test_uploads import png_header
 
 
 class TestUnvalidatedField(unittest.TestCase):
@@ -92,3 +101,95 @@ class TestRoundedDecimalField(unittest.TestCase):
         self.assertEqual(floored_field.to_internal_value(5.2356), Decimal('5.23'))
         self.assertEqual(floored_field.to_internal_value(Decimal('5.2345')), Decimal('5.23'))
         self.assertEqual(floored_field.to_internal_value(Decimal('5.2356')), Decimal('5.23'))
+
+
+class TestStreamingFileField(unittest.TestCase):
+    def test_to_internal_value(self):
+        field = StreamingFileField(max_upload_size=100, allowed_content_types=['application/pdf'])
+        upload = SimpleUploadedFile('foo.pdf', b'%PDF-1.4' + b'\x00' * 50)
+
+        self.assertIs(field.to_internal_value(upload), upload)
+        self.assertEqual(upload.tell(), 0)
+
+    def test_to_internal_value_max_upload_size(self):
+        field = StreamingFileField(max_upload_size=10)
+        upload = SimpleUploadedFile('foo.pdf', b'a' * 50)
+
+        with self.assertRaises(ValidationError) as e:
+            field.to_internal_value(upload)
+
+        self.assertEqual(e.exception.detail[0].code, 'max_upload_size')
+
+    def test_to_internal_value_max_upload_size_unknown_size(self):
+        field = StreamingFileField(max_upload_size=10)
+        field.chunk_size = 5
+        upload = SimpleUploadedFile('foo.pdf', b'a' * 50)
+        upload.size = None
+        upload.chunks = mock.MagicMock(return_value=iter([b'a' * 5] * 10))
+
+        with self.assertRaises(ValidationError):
+            field.to_internal_value(upload)
+
+    def test_to_internal_value_invalid_content_type(self):
+        field = StreamingFileField(allowed_content_types=['application/pdf'])
+        upload = SimpleUploadedFile('foo.pdf', png_header())
+
+        with self.assertRaises(ValidationError) as e:
+            field.to_internal_value(upload)
+
+        self.assertEqual(e.exception.detail[0].code, 'invalid_content_type')
+
+    def test_validate_empty_values_rejected_upload(self):
+        field = StreamingFileField()
+        request = mock.MagicMock(
+            rejected_uploads={'document': UploadRejected('max_upload_size', max_upload_size=10)}
+        )
+        field.bind('document', serializers.Serializer(context={'request': request}))
+
+        with self.assertRaises(ValidationError) as e:
+            field.validate_empty_values(empty)
+
+        self.assertEqual(e.exception.detail[0].code, 'max_upload_size')
+
+
+class TestStreamingImageField(unittest.TestCase):
+    def test_to_internal_value(self):
+        field = StreamingImageField()
+        upload = SimpleUploadedFile('foo.png', png_header())
+
+        self.assertIs(field.to_internal_value(upload), upload)
+
+    def test_to_internal_value_invalid(self):
+        field = StreamingImageField()
+        upload = SimpleUploadedFile('foo.png', png_header()[:20])
+
+        with self.assertRaises(ValidationError) as e:
+            field.to_internal_value(upload)
+
+        self.assertEqual(e.exception.detail[0].code, 'invalid_image')
+
+    def test_to_internal_value_max_image_pixels(self):
+        field = StreamingImageField(max_image_pixels=100)
+        upload = SimpleUploadedFile('foo.png', png_header())
+
+        with self.assertRaises(ValidationError) as e:
+            field.to_internal_value(upload)
+
+        self.assertEqual(e.exception.detail[0].code, 'max_image_pixels')
+
+
+class TestRawJSONField(unittest.TestCase):
+    def setUp(self):
+        super(TestRawJSONField, self).setUp()
+        self.field = RawJSONField()
+
+    def test_to_internal_value(self):
+        self.assertEqual(self.field.to_internal_value({'a': [1]}), '{"a": [1]}')
+
+    def test_to_internal_value_invalid(self):
+        with self.assertRaises(ValidationError):
+            self.field.to_internal_value({'a': object()})
+
+    def test_to_representation(self):
+        self.assertEqual(self.field.to_representation('{"a": [1]}'), RawJSON('{"a": [1]}'))
+        self.assertEqual(self.field.to_representation(b'[1]'), RawJSON('[1]'))
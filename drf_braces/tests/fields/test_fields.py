@@ -1,8 +1,14 @@
 from __future__ import absolute_import, print_function, unicode_literals
+import os
+import sys
 import unittest
 
-from ...fields import _fields
+from rest_framework import fields
+
+from ... import fields as drf_braces_fields
+from ...fields import _fields, custom, modified
 from ...fields.mixins import AllowBlankNullFieldMixin, EmptyStringFieldMixin
+from ...utils import get_import_time_report
 
 
 class TestFields(unittest.TestCase):
@@ -11,3 +17,47 @@ class TestFields(unittest.TestCase):
             f = getattr(_fields, f)
             self.assertTrue(issubclass(f, EmptyStringFieldMixin))
             self.assertTrue(issubclass(f, AllowBlankNullFieldMixin))
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'Requires module __getattr__ and -X importtime')
+class TestLazyFields(unittest.TestCase):
+    def get_report(self, module, code=''):
+        env = os.environ.copy()
+        env['PYTHONPATH'] = os.pathsep.join(sys.path)
+        env.setdefault('DJANGO_SETTINGS_MODULE', 'tests.settings')
+        return get_import_time_report(
+            module,
+            setup='import django\ndjango.setup()\n{}'.format(code),
+            env=env,
+        )
+
+    def test_import_time(self):
+        report = self.get_report('drf_braces.fields', code='import rest_framework.fields')
+        modules = {i.module for i in report}
+
+        self.assertEqual(report[-1].module, 'drf_braces.fields')
+        self.assertNotIn('pytz', modules)
+        self.assertNotIn('dateutil', modules)
+        self.assertNotIn('drf_braces.fields.custom', modules)
+
+    def test_forms_import_time(self):
+        report = self.get_report('drf_braces.forms.serializer_form')
+        modules = {i.module for i in report}
+
+        self.assertIn('drf_braces.forms.fields', modules)
+        self.assertNotIn('dateutil', modules)
+
+    def test_lazy_generation(self):
+        self.assertIn('CharField', dir(_fields))
+        self.assertIs(_fields.CharField, _fields.CharField)
+        self.assertIs(_fields.SkipField, fields.SkipField)
+        with self.assertRaises(AttributeError):
+            _fields.FooField
+
+    def test_package(self):
+        self.assertIs(drf_braces_fields.CharField, _fields.CharField)
+        self.assertIs(drf_braces_fields.BooleanField, modified.BooleanField)
+        self.assertIs(drf_braces_fields.NumericField, custom.NumericField)
+        self.assertIn('NumericField', drf_braces_fields.__all__)
+        with self.assertRaises(AttributeError):
+            drf_braces_fields.FooField
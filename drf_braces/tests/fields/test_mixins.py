@@ -2,13 +2,17 @@ from __future__ import absolute_import, print_function, unicode_literals
 import unittest
 
 import mock
+from hypothesis import given, strategies as st
 from rest_framework import fields
 
+from ...fields.custom import NumericField
 from ...fields.mixins import (
     AllowBlankNullFieldMixin,
     EmptyStringFieldMixin,
+    SharedValidatorsFieldMixin,
     ValueAsTextFieldMixin,
 )
+from ...fields.validators import ValidatorRegistry
 
 
 class TestEmptyStringFieldMixin(unittest.TestCase):
@@ -94,3 +98,94 @@ class TestValueAsTextFieldMixin(unittest.TestCase):
         self.assertEqual(self.field.run_validation(50), '50')
         with self.assertRaises(fields.ValidationError):
             self.field.run_validation(500)
+
+    @mock.patch.object(fields.IntegerField, 'to_internal_value')
+    def test_run_validation_digit_string(self, mock_to_internal_value):
+        self.assertEqual(self.field.run_validation('50'), '50')
+        self.assertFalse(mock_to_internal_value.called)
+
+    def test_run_validation_digit_string_out_of_bounds(self):
+        with self.assertRaises(fields.ValidationError):
+            self.field.run_validation('500')
+        with self.assertRaises(fields.ValidationError):
+            self.field.run_validation('101')
+
+    def test_is_valid_digit_string(self):
+        self.assertTrue(self.field.is_valid_digit_string('100'))
+        self.assertFalse(self.field.is_valid_digit_string('0100'))
+        self.assertFalse(self.field.is_valid_digit_string('-1'))
+        self.assertFalse(self.field.is_valid_digit_string(' 1'))
+        self.assertFalse(self.field.is_valid_digit_string('1.0'))
+        self.assertFalse(self.field.is_valid_digit_string(1))
+
+        self.field.digit_string_fast_path = False
+
+        self.assertFalse(self.field.is_valid_digit_string('100'))
+
+    def test_get_digit_string_bounds(self):
+        self.assertListEqual(self.field.get_digit_string_bounds(), [(False, '100')])
+
+        self.field.validators = self.field.validators + [mock.MagicMock()]
+
+        self.assertIsNone(self.field.get_digit_string_bounds())
+
+    def test_get_digit_string_bounds_custom_conversion(self):
+        class Field(ValueAsTextFieldMixin, fields.IntegerField):
+            def to_internal_value(self, data):
+                return super(Field, self).to_internal_value(data) * 2
+
+        self.assertIsNone(Field().get_digit_string_bounds())
+
+
+def digit_string_inputs():
+    return st.one_of(
+        st.from_regex(r'\A[1-9][0-9]{0,20}\Z'),
+        st.text(alphabet='0123456789 +-.e\t\u0663', max_size=25),
+        st.integers(),
+    )
+
+
+def optional_bounds():
+    return st.one_of(st.none(), st.integers(min_value=-10 ** 20, max_value=10 ** 20))
+
+
+class TestValueAsTextFieldMixinFastPathEquivalence(unittest.TestCase):
+    """
+    Property-based tests that digit string fast path behaves
+    identically to the regular int/text round-trip.
+    """
+
+    def run_field(self, field, value):
+        try:
+            return True, field.run_validation(value)
+        except fields.ValidationError as e:
+            return False, e.detail
+
+    @given(value=digit_string_inputs(), min_value=optional_bounds(), max_value=optional_bounds())
+    def test_equivalence(self, value, min_value, max_value):
+        kwargs = {'min_value': min_value, 'max_value': max_value, 'required': False}
+        fast = NumericField(**kwargs)
+        slow = NumericField(**kwargs)
+        slow.digit_string_fast_path = False
+
+        fast_result = self.run_field(fast, value)
+        slow_result = self.run_field(slow, value)
+
+        self.assertEqual(fast_result, slow_result)
+        self.assertIs(type(fast_result[1]), type(slow_result[1]))
+
+
+class TestSharedValidatorsFieldMixin(unittest.TestCase):
+    def setUp(self):
+        super(TestSharedValidatorsFieldMixin, self).setUp()
+
+        class Field(SharedValidatorsFieldMixin, fields.EmailField):
+            validator_registry = ValidatorRegistry()
+
+        self.field_class = Field
+
+    def test_init(self):
+        field = self.field_class()
+        other = self.field_class()
+
+        self.assertIs(field.validators[-1], other.validators[-1])
@@ -0,0 +1,75 @@
+from __future__ import absolute_import, print_function, unicode_literals
+import copy
+import re
+import unittest
+
+from django.core.validators import EmailValidator, RegexValidator
+
+from ...fields import _fields
+from ...fields.validators import ValidatorRegistry
+
+
+class TestValidatorRegistry(unittest.TestCase):
+    def setUp(self):
+        super(TestValidatorRegistry, self).setUp()
+        self.registry = ValidatorRegistry(maxsize=2)
+
+    def test_compile(self):
+        pattern = self.registry.compile(r'^\d+$')
+
+        self.assertIs(self.registry.compile(r'^\d+$'), pattern)
+        self.assertIsNot(self.registry.compile(r'^\d+$', re.I), pattern)
+        self.assertIs(self.registry.compile(pattern), pattern)
+
+    def test_compile_lru(self):
+        self.registry.compile('a')
+        self.registry.compile('b')
+        self.registry.compile('c')
+
+        self.assertNotIn(('a', 0), self.registry.patterns)
+        self.assertIn(('c', 0), self.registry.patterns)
+
+    def test_intern(self):
+        validator = self.registry.intern(EmailValidator(message='foo'))
+
+        self.assertIs(self.registry.intern(EmailValidator(message='foo')), validator)
+        self.assertIsNot(self.registry.intern(EmailValidator(message='bar')), validator)
+
+    def test_intern_regex(self):
+        validator = self.registry.intern(RegexValidator(r'^\d+$'))
+
+        self.assertIs(self.registry.intern(RegexValidator(r'^\d+$')), validator)
+        self.assertIs(validator.regex, self.registry.compile(r'^\d+$'))
+        self.assertIsNot(self.registry.intern(RegexValidator(r'^\w+$')), validator)
+
+    def test_intern_not_deconstructible(self):
+        def validator(value):
+            pass
+
+        self.assertIs(self.registry.intern(validator), validator)
+
+    def test_clear(self):
+        validator = self.registry.intern(EmailValidator())
+
+        self.registry.clear()
+
+        self.assertIsNot(self.registry.intern(EmailValidator()), validator)
+
+
+class TestSharedValidatorFields(unittest.TestCase):
+    def test_fields_share_validators(self):
+        for field_class, args in [(_fields.EmailField, ()),
+                                  (_fields.URLField, ()),
+                                  (_fields.SlugField, ()),
+                                  (_fields.RegexField, (r'^\d+$',))]:
+            field = field_class(*args)
+            other = copy.deepcopy(field_class(*args))
+
+            self.assertIs(field.validators[-1], other.validators[-1], field_class)
+
+    def test_regex_field(self):
+        field = _fields.RegexField(r'^\d+$')
+
+        self.assertEqual(field.run_validation('123'), '123')
+        with self.assertRaises(_fields.ValidationError):
+            field.run_validation('abc')
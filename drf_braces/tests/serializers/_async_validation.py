@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, unicode_literals
+import asyncio
+import unittest
+
+from asgiref.sync import async_to_sync
+from django import forms
+from django.contrib.auth.models import Group
+from django.test import TestCase
+from rest_framework import serializers
+
+from ...serializers.async_validation import (
+    AsyncValidationSerializerMixin,
+    arun_validators,
+    is_async_callable,
+    is_io_free_field,
+)
+from ...serializers.enforce_validation_serializer import create_enforce_validation_serializer
+from ...serializers.form_serializer import FormSerializer, LazyLoadingValidationsMixin
+
+
+class Barrier(object):
+    """
+    Async validator which only passes once ``parties`` validators run concurrently.
+    """
+
+    def __init__(self, parties):
+        self.parties = parties
+        self.waiting = 0
+        self.event = None
+
+    async def __call__(self, value):
+        if self.event is None:
+            self.event = asyncio.Event()
+        self.waiting += 1
+        if self.waiting == self.parties:
+            self.event.set()
+        try:
+            await asyncio.wait_for(self.event.wait(), 1)
+        except asyncio.TimeoutError:
+            raise serializers.ValidationError('Not validated concurrently.')
+
+
+async def positive(value):
+    await asyncio.sleep(0)
+    if value <= 0:
+        raise serializers.ValidationError('Must be positive.')
+
+
+class ChildSerializer(AsyncValidationSerializerMixin, serializers.Serializer):
+    id = serializers.IntegerField(validators=[positive])
+
+
+class Serializer(AsyncValidationSerializerMixin, serializers.Serializer):
+    foo = serializers.IntegerField(validators=[positive])
+    bar = serializers.CharField(max_length=5)
+    children = ChildSerializer(many=True, required=False)
+
+    async def avalidate_bar(self, value):
+        await asyncio.sleep(0)
+        return value.upper()
+
+    def validate(self, attrs):
+        if attrs['bar'] == 'NONE':
+            raise serializers.ValidationError('Invalid bar.')
+        return attrs
+
+
+class TestHelpers(unittest.TestCase):
+    def test_is_async_callable(self):
+        self.assertTrue(is_async_callable(positive))
+        self.assertTrue(is_async_callable(Barrier(1)))
+        self.assertFalse(is_async_callable(len))
+
+    def test_arun_validators(self):
+        async def fail(value):
+            raise serializers.ValidationError('fail')
+
+        with self.assertRaises(serializers.ValidationError) as e:
+            async_to_sync(arun_validators)([fail, positive, fail], 0, None)
+
+        self.assertEqual(e.exception.detail, ['fail', 'Must be positive.', 'fail'])
+
+
+class TestAsyncValidationSerializerMixin(unittest.TestCase):
+    def test_valid(self):
+        serializer = Serializer(data={'foo': 1, 'bar': 'bar', 'children': [{'id': 1}, {'id': 2}]})
+
+        self.assertTrue(async_to_sync(serializer.ais_valid)())
+        self.assertEqual(serializer.validated_data, {
+            'foo': 1,
+            'bar': 'BAR',
+            'children': [{'id': 1}, {'id': 2}],
+        })
+
+    def test_invalid(self):
+        serializer = Serializer(data={'foo': 0, 'bar': 'too long', 'children': [{'id': 1}, {'id': -1}]})
+
+        self.assertFalse(async_to_sync(serializer.ais_valid)())
+        self.assertEqual(serializer.errors, {
+            'foo': ['Must be positive.'],
+            'bar': ['Ensure this field has no more than 5 characters.'],
+            'children': [{}, {'id': ['Must be positive.']}],
+        })
+
+    def test_validate(self):
+        serializer = Serializer(data={'foo': 1, 'bar': 'none'})
+
+        with self.assertRaises(serializers.ValidationError):
+            async_to_sync(serializer.ais_valid)(raise_exception=True)
+
+        self.assertEqual(serializer.errors, {'non_field_errors': ['Invalid bar.']})
+
+    def test_not_a_mapping(self):
+        serializer = Serializer(data=[])
+
+        self.assertFalse(async_to_sync(serializer.ais_valid)())
+        self.assertIn('non_field_errors', serializer.errors)
+
+    def test_concurrent(self):
+        barrier = Barrier(4)
+
+        class ConcurrentChildSerializer(AsyncValidationSerializerMixin, serializers.Serializer):
+            id = serializers.IntegerField(validators=[barrier])
+
+        class ConcurrentSerializer(AsyncValidationSerializerMixin, serializers.Serializer):
+            foo = serializers.IntegerField(validators=[barrier])
+            bar = serializers.IntegerField(validators=[barrier])
+            children = ConcurrentChildSerializer(many=True)
+
+        serializer = ConcurrentSerializer(data={'foo': 1, 'bar': 2, 'children': [{'id': 1}, {'id': 2}]})
+
+        self.assertTrue(async_to_sync(serializer.ais_valid)(), serializer.errors)
+
+    def test_serializer_validators(self):
+        async def validator(attrs):
+            if attrs['foo'] == attrs['bar']:
+                raise serializers.ValidationError('Must differ.')
+
+        class ValidatorsSerializer(AsyncValidationSerializerMixin, serializers.Serializer):
+            foo = serializers.IntegerField()
+            bar = serializers.IntegerField()
+
+            class Meta(object):
+                validators = [validator]
+
+        serializer = ValidatorsSerializer(data={'foo': 1, 'bar': 1})
+
+        self.assertFalse(async_to_sync(serializer.ais_valid)())
+        self.assertEqual(serializer.errors, {'non_field_errors': ['Must differ.']})
+
+    def assertSameValidation(self, serializer_class, data):
+        serializer = serializer_class(data=data)
+        async_serializer = serializer_class(data=data)
+
+        self.assertEqual(async_to_sync(async_serializer.ais_valid)(), serializer.is_valid())
+        self.assertEqual(async_serializer.errors, serializer.errors)
+        self.assertEqual(async_serializer.validated_data, serializer.validated_data)
+        return async_serializer
+
+    def test_overridden_run_validation(self):
+        class BlockingSerializer(AsyncValidationSerializerMixin, serializers.Serializer):
+            a = serializers.IntegerField()
+
+            def run_validation(self, data=serializers.empty):
+                raise serializers.ValidationError({'a': ['blocked']})
+
+        serializer = self.assertSameValidation(BlockingSerializer, {'a': 1})
+
+        self.assertEqual(serializer.errors, {'a': ['blocked']})
+
+    def test_overridden_to_internal_value(self):
+        class AliasSerializer(AsyncValidationSerializerMixin, serializers.Serializer):
+            a = serializers.IntegerField()
+
+            def to_internal_value(self, data):
+                data = dict(data)
+                data['a'] = data.pop('alias', None)
+                return super(AliasSerializer, self).to_internal_value(data)
+
+        class ParentSerializer(AsyncValidationSerializerMixin, serializers.Serializer):
+            child = AliasSerializer()
+
+        serializer = self.assertSameValidation(AliasSerializer, {'alias': 1})
+        self.assertEqual(serializer.validated_data, {'a': 1})
+
+        serializer = self.assertSameValidation(ParentSerializer, {'child': {'alias': 1}})
+        self.assertEqual(serializer.validated_data, {'child': {'a': 1}})
+
+    def test_is_valid(self):
+        serializer = ChildSerializer(data={'id': 0})
+
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors, {'id': ['Must be positive.']})
+
+        self.assertSameValidation(Serializer, {'foo': 1, 'bar': 'bar', 'children': [{'id': 1}]})
+        self.assertSameValidation(Serializer, {'foo': 0, 'bar': 'too long', 'children': [{'id': -1}]})
+        self.assertSameValidation(Serializer, {'foo': 1, 'bar': 'none'})
+
+    def test_is_valid_async_hooks(self):
+        async def validator(attrs):
+            if attrs['foo'] == attrs['bar']:
+                raise serializers.ValidationError('Must differ.')
+
+        class HooksSerializer(AsyncValidationSerializerMixin, serializers.Serializer):
+            foo = serializers.IntegerField()
+            bar = serializers.IntegerField()
+
+            class Meta(object):
+                validators = [validator]
+
+            async def avalidate(self, attrs):
+                attrs = await super(HooksSerializer, self).avalidate(attrs)
+                if attrs['foo'] > attrs['bar']:
+                    raise serializers.ValidationError('Must be ordered.')
+                return attrs
+
+        self.assertSameValidation(HooksSerializer, {'foo': 1, 'bar': 2})
+        serializer = self.assertSameValidation(HooksSerializer, {'foo': 1, 'bar': 1})
+        self.assertEqual(serializer.errors, {'non_field_errors': ['Must differ.']})
+        serializer = self.assertSameValidation(HooksSerializer, {'foo': 2, 'bar': 1})
+        self.assertEqual(serializer.errors, {'non_field_errors': ['Must be ordered.']})
+
+    def test_overridden_validation_async_validators(self):
+        class OverriddenSerializer(ChildSerializer):
+            def to_internal_value(self, data):
+                return super(OverriddenSerializer, self).to_internal_value(data)
+
+        serializer = self.assertSameValidation(OverriddenSerializer, {'id': 0})
+        self.assertEqual(serializer.errors, {'id': ['Must be positive.']})
+
+
+class TestRelatedField(TestCase):
+    def test_primary_key_related_field(self):
+        group = Group.objects.create(name='foo')
+
+        class RelatedSerializer(AsyncValidationSerializerMixin, serializers.Serializer):
+            group = serializers.PrimaryKeyRelatedField(queryset=Group.objects.all())
+            name = serializers.CharField()
+
+        serializer = RelatedSerializer(data={'group': group.pk, 'name': 'bar'})
+        self.assertTrue(async_to_sync(serializer.ais_valid)(), serializer.errors)
+        self.assertEqual(serializer.validated_data, {'group': group, 'name': 'bar'})
+
+        serializer = RelatedSerializer(data={'group': group.pk + 1, 'name': 'bar'})
+        self.assertFalse(async_to_sync(serializer.ais_valid)())
+        self.assertEqual(list(serializer.errors), ['group'])
+
+    def test_is_io_free_field(self):
+        self.assertTrue(is_io_free_field(serializers.CharField(max_length=5)))
+        self.assertFalse(is_io_free_field(serializers.IntegerField(validators=[lambda value: None])))
+        self.assertFalse(is_io_free_field(serializers.PrimaryKeyRelatedField(queryset=Group.objects.all())))
+
+
+class TestForm(forms.Form):
+    name = forms.CharField(max_length=12)
+    color = forms.ChoiceField()
+
+    def __init__(self, *args, **kwargs):
+        super(TestForm, self).__init__(*args, **kwargs)
+        self.fields['color'].choices = [('red', 'Red')]
+
+    def clean_name(self):
+        return self.cleaned_data['name'].title()
+
+
+class TestAsyncFormSerializer(unittest.TestCase):
+    def setUp(self):
+        super(TestAsyncFormSerializer, self).setUp()
+
+        class AsyncFormSerializer(AsyncValidationSerializerMixin, LazyLoadingValidationsMixin, FormSerializer):
+            class Meta(object):
+                form = TestForm
+
+        self.serializer_class = AsyncFormSerializer
+
+    def test_valid(self):
+        serializer = self.serializer_class(data={'name': 'foo bar', 'color': 'red'})
+
+        self.assertTrue(async_to_sync(serializer.ais_valid)(), serializer.errors)
+        self.assertEqual(serializer.validated_data, {'name': 'Foo Bar', 'color': 'red'})
+
+    def test_invalid_choice(self):
+        serializer = self.serializer_class(data={'name': 'foo', 'color': 'blue'})
+
+        self.assertFalse(async_to_sync(serializer.ais_valid)())
+        self.assertEqual(list(serializer.errors), ['color'])
+
+
+class TestAsyncEnforceValidationSerializer(unittest.TestCase):
+    def test_skip_field(self):
+        @create_enforce_validation_serializer
+        class EnforcedSerializer(AsyncValidationSerializerMixin, serializers.Serializer):
+            foo = serializers.IntegerField(validators=[positive])
+            bar = serializers.IntegerField(validators=[positive])
+            must_validate_fields = ['foo']
+
+        serializer = EnforcedSerializer(data={'foo': 1, 'bar': -1})
+        self.assertTrue(async_to_sync(serializer.ais_valid)(), serializer.errors)
+        self.assertEqual(serializer.validated_data, {'foo': 1})
+
+        serializer = EnforcedSerializer(data={'foo': -1, 'bar': 1})
+        self.assertFalse(async_to_sync(serializer.ais_valid)())
+        self.assertEqual(serializer.errors, {'foo': ['Must be positive.']})
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, unicode_literals
+import sys
+
+import django
+
+
+# async tests use Python 3.5+ syntax and asgiref which Django 3.0+ depends on
+if sys.version_info >= (3, 5) and django.VERSION >= (3, 0):
+    from ._async_validation import *  # noqa
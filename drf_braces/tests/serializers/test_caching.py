@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, unicode_literals
+import unittest
+
+import mock
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_delete, post_save
+from rest_framework import serializers
+
+from ...serializers.caching import (
+    CachedRepresentationSerializerMixin,
+    DjangoRepresentationCache,
+    LocalMemoryRepresentationCache,
+    cached_representation,
+    invalidate_representation,
+    invalidate_representation_on_save,
+)
+from ...serializers.sparse import SparseFieldsetSerializerMixin
+from ...serializers.swapping import SwappingSerializerMixin
+
+
+class Model(object):
+    def __init__(self, pk, name, updated_at=1):
+        self.pk = pk
+        self.name = name
+        self.updated_at = updated_at
+
+    @property
+    def title(self):
+        return self.name.upper()
+
+
+class ChildSerializer(serializers.Serializer):
+    name = serializers.CharField()
+
+
+class OtherChildSerializer(serializers.Serializer):
+    name = serializers.CharField(source='title')
+
+
+class TestCachedRepresentationSerializerMixin(unittest.TestCase):
+    def setUp(self):
+        super(TestCachedRepresentationSerializerMixin, self).setUp()
+        self.cache = LocalMemoryRepresentationCache(maxsize=10)
+
+        class Serializer(CachedRepresentationSerializerMixin, ChildSerializer):
+            class Meta(object):
+                representation_cache = self.cache
+
+        self.serializer_class = Serializer
+
+    def test_cached(self):
+        instance = Model(1, 'foo')
+
+        self.assertEqual(self.serializer_class(instance).data, {'name': 'foo'})
+        instance.name = 'bar'
+        self.assertEqual(self.serializer_class(instance).data, {'name': 'foo'})
+
+    def test_version(self):
+        instance = Model(1, 'foo')
+        self.serializer_class(instance).data
+
+        instance.name, instance.updated_at = 'bar', 2
+
+        self.assertEqual(self.serializer_class(instance).data, {'name': 'bar'})
+
+    def test_version_callable(self):
+        self.serializer_class.Meta.representation_cache_version = lambda instance: instance.name
+        instance = Model(1, 'foo')
+        self.serializer_class(instance).data
+
+        instance.name = 'bar'
+
+        self.assertEqual(self.serializer_class(instance).data, {'name': 'bar'})
+
+    def test_version_none(self):
+        instance = Model(1, 'foo', updated_at=None)
+        self.serializer_class(instance).data
+
+        instance.name = 'bar'
+
+        self.assertEqual(self.serializer_class(instance).data, {'name': 'bar'})
+        self.assertIsNone(self.cache.get((self.serializer_class, 1)))
+
+    def test_version_missing(self):
+        self.serializer_class.Meta.representation_cache_version = 'modified'
+
+        with self.assertRaises(ImproperlyConfigured):
+            self.serializer_class(Model(1, 'foo')).data
+
+    def test_no_pk(self):
+        instance = Model(None, 'foo')
+        self.serializer_class(instance).data
+
+        instance.name = 'bar'
+
+        self.assertEqual(self.serializer_class(instance).data, {'name': 'bar'})
+
+    def test_many(self):
+        serializer = self.serializer_class([Model(1, 'foo'), Model(2, 'bar')], many=True)
+
+        with mock.patch.object(ChildSerializer, 'to_representation', return_value={}) as mock_to_representation:
+            serializer.data
+            self.serializer_class([Model(1, 'foo'), Model(2, 'bar')], many=True).data
+
+        self.assertEqual(mock_to_representation.call_count, 2)
+
+    def test_lru(self):
+        self.serializer_class.Meta.representation_cache = LocalMemoryRepresentationCache(maxsize=1)
+        instance = Model(1, 'foo')
+        self.serializer_class(instance).data
+        self.serializer_class(Model(2, 'other')).data
+
+        instance.name = 'bar'
+
+        self.assertEqual(self.serializer_class(instance).data, {'name': 'bar'})
+
+    def test_timeout(self):
+        self.serializer_class.Meta.representation_cache = LocalMemoryRepresentationCache(timeout=10)
+        instance = Model(1, 'foo')
+
+        with mock.patch('time.time', return_value=100):
+            self.serializer_class(instance).data
+        instance.name = 'bar'
+        with mock.patch('time.time', return_value=105):
+            self.assertEqual(self.serializer_class(instance).data, {'name': 'foo'})
+        with mock.patch('time.time', return_value=111):
+            self.assertEqual(self.serializer_class(instance).data, {'name': 'bar'})
+
+    def test_sparse_variants(self):
+        class Serializer(SparseFieldsetSerializerMixin, CachedRepresentationSerializerMixin, serializers.Serializer):
+            id = serializers.IntegerField(source='pk')
+            name = serializers.CharField()
+
+            class Meta(object):
+                representation_cache = self.cache
+
+        instance = Model(1, 'foo')
+
+        self.assertEqual(Serializer(instance).data, {'id': 1, 'name': 'foo'})
+        self.assertEqual(Serializer(instance, context={'requested_fields': 'name'}).data, {'name': 'foo'})
+        self.assertEqual(len(self.cache._cache._data), 1)
+
+    def test_swapped(self):
+        class Serializer(SwappingSerializerMixin, serializers.Serializer):
+            child = ChildSerializer(source='*')
+
+            class Meta(object):
+                swappable_fields = {
+                    ChildSerializer: cached_representation(OtherChildSerializer),
+                }
+
+        instance = Model(1, 'foo')
+        self.assertEqual(Serializer(instance).data, {'child': {'name': 'FOO'}})
+
+        instance.name = 'bar'
+
+        self.assertEqual(Serializer(instance).data, {'child': {'name': 'FOO'}})
+        self.assertEqual(ChildSerializer(instance).data, {'name': 'bar'})
+        invalidate_representation(OtherChildSerializer, instance)
+        self.assertEqual(Serializer(instance).data, {'child': {'name': 'BAR'}})
+
+    def test_invalidate_representation(self):
+        instance = Model(1, 'foo')
+        self.serializer_class(instance).data
+
+        instance.name = 'bar'
+        invalidate_representation(self.serializer_class, 1)
+
+        self.assertEqual(self.serializer_class(instance).data, {'name': 'bar'})
+
+
+class TestCachedRepresentation(unittest.TestCase):
+    def test_cached_representation(self):
+        cached = cached_representation(ChildSerializer)
+
+        self.assertTrue(issubclass(cached, CachedRepresentationSerializerMixin))
+        self.assertTrue(issubclass(cached, ChildSerializer))
+        self.assertIs(cached_representation(ChildSerializer), cached)
+        self.assertIs(cached_representation(cached), cached)
+
+
+class TestDjangoRepresentationCache(unittest.TestCase):
+    def setUp(self):
+        super(TestDjangoRepresentationCache, self).setUp()
+        self.cache = DjangoRepresentationCache(timeout=60)
+        cache.clear()
+
+    def test_cache(self):
+        self.cache.set((ChildSerializer, 1), {'version': 1, 'variants': {}})
+
+        self.assertEqual(self.cache.get((ChildSerializer, 1)), {'version': 1, 'variants': {}})
+        self.assertEqual(
+            cache.get('drf-braces-repr:drf_braces.tests.serializers.test_caching.ChildSerializer:1'),
+            {'version': 1, 'variants': {}},
+        )
+
+        self.cache.delete((ChildSerializer, 1))
+
+        self.assertIsNone(self.cache.get((ChildSerializer, 1)))
+
+    def test_serializer(self):
+        class Serializer(CachedRepresentationSerializerMixin, serializers.Serializer):
+            name = serializers.CharField()
+
+            class Meta(object):
+                representation_cache = self.cache
+
+        instance = Model(1, 'foo')
+        Serializer(instance).data
+        instance.name = 'bar'
+
+        self.assertEqual(Serializer(instance).data, {'name': 'foo'})
+
+
+class TestInvalidateRepresentationOnSave(unittest.TestCase):
+    def test_invalidate(self):
+        class GroupSerializer(serializers.ModelSerializer):
+            class Meta(object):
+                model = Group
+                fields = ['name']
+
+        receiver = invalidate_representation_on_save(GroupSerializer)
+        for signal in (post_save, post_delete):
+            self.addCleanup(signal.disconnect, receiver, sender=Group)
+
+        with mock.patch('drf_braces.serializers.caching.invalidate_representation') as mock_invalidate:
+            receiver(Group, Group(pk=1))
+
+        mock_invalidate.assert_called_once_with(GroupSerializer, mock.ANY)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, unicode_literals
+import unittest
+from collections import OrderedDict
+
+import mock
+from django.contrib.auth.models import Permission
+from rest_framework import serializers
+
+from ...serializers.sparse import (
+    SparseFieldsetSerializerMixin,
+    parse_requested_fields,
+)
+
+
+class ChildSerializer(serializers.Serializer):
+    foo = serializers.IntegerField()
+    bar = serializers.CharField()
+
+
+class SparseChildSerializer(SparseFieldsetSerializerMixin, ChildSerializer):
+    pass
+
+
+class ParentSerializer(SparseFieldsetSerializerMixin, serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    child = SparseChildSerializer()
+    children = ChildSerializer(many=True)
+
+
+class PermissionSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    class Meta(object):
+        model = Permission
+        fields = '__all__'
+
+
+class TestParseRequestedFields(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(
+            parse_requested_fields('id, child.foo,child.bar,,children,children.foo,other.'),
+            OrderedDict([
+                ('id', None),
+                ('child', OrderedDict([('foo', None), ('bar', None)])),
+                ('children', None),
+            ])
+        )
+        self.assertEqual(parse_requested_fields(['a.b', 'a']), {'a': None})
+
+
+class TestSparseFieldsetSerializerMixin(unittest.TestCase):
+    def setUp(self):
+        super(TestSparseFieldsetSerializerMixin, self).setUp()
+        self.data = {
+            'id': 1,
+            'name': 'parent',
+            'child': {'foo': 2, 'bar': 'child'},
+            'children': [{'foo': 3, 'bar': 'children'}],
+        }
+
+    def test_all_fields(self):
+        self.assertEqual(ParentSerializer(self.data).data, self.data)
+
+    def test_requested_fields(self):
+        serializer = ParentSerializer(self.data, context={
+            'requested_fields': 'name,child.foo,children.bar,missing',
+        })
+
+        self.assertEqual(serializer.data, {
+            'name': 'parent',
+            'child': {'foo': 2},
+            'children': [{'bar': 'children'}],
+        })
+
+    def test_requested_fields_many(self):
+        serializer = ParentSerializer([self.data], many=True, context={
+            'requested_fields': parse_requested_fields('id,child'),
+        })
+
+        self.assertEqual(serializer.data, [{'id': 1, 'child': {'foo': 2, 'bar': 'child'}}])
+
+    def test_fields_not_copied(self):
+        with mock.patch.object(serializers.IntegerField, '__deepcopy__', create=True) as mock_deepcopy:
+            mock_deepcopy.side_effect = lambda memo: serializers.IntegerField()
+
+            ParentSerializer(context={'requested_fields': 'name'}).fields
+
+        self.assertFalse(mock_deepcopy.called)
+
+    def test_model_serializer(self):
+        serializer = PermissionSerializer(context={'requested_fields': 'codename'})
+
+        with mock.patch.object(PermissionSerializer, 'build_field', wraps=serializer.build_field) as mock_build_field:
+            self.assertEqual(list(serializer.fields), ['codename'])
+
+        self.assertEqual(mock_build_field.call_count, 1)
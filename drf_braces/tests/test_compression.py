@@ -0,0 +1,111 @@
+from __future__ import absolute_import, print_function, unicode_literals
+import gzip
+import unittest
+import zlib
+
+import six
+from rest_framework.exceptions import UnsupportedMediaType
+
+from ..compression import (
+    GZIP_WBITS,
+    ZLIB_WBITS,
+    DecompressingStream,
+    DecompressionError,
+    get_decompressed_stream,
+)
+
+
+def gzip_compress(data):
+    stream = six.BytesIO()
+    with gzip.GzipFile(fileobj=stream, mode='wb') as f:
+        f.write(data)
+    return stream.getvalue()
+
+
+def raw_deflate_compress(data):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class TestDecompressingStream(unittest.TestCase):
+    def setUp(self):
+        super(TestDecompressingStream, self).setUp()
+        self.data = b''.join(six.text_type(i).encode('ascii') for i in range(10000))
+
+    def test_read(self):
+        stream = DecompressingStream(six.BytesIO(gzip_compress(self.data)), chunk_size=100)
+
+        self.assertEqual(stream.read(10), self.data[:10])
+        self.assertEqual(stream.read(), self.data[10:])
+        self.assertEqual(stream.read(10), b'')
+
+    def test_read_chunks(self):
+        stream = DecompressingStream(six.BytesIO(gzip_compress(self.data)), chunk_size=7)
+
+        self.assertEqual(b''.join(iter(lambda: stream.read(13), b'')), self.data)
+
+    def test_read_sizes(self):
+        stream = DecompressingStream(six.BytesIO(gzip_compress(self.data)), chunk_size=10)
+        sizes = [0, 3, 7, 10, 25, 1, 1000]
+
+        parts = [stream.read(i) for i in sizes]
+
+        self.assertEqual([len(i) for i in parts], sizes)
+        self.assertEqual(b''.join(parts) + stream.read(), self.data)
+        self.assertEqual(stream.buffered, 0)
+
+    def test_read_multiple_members(self):
+        compressed = gzip_compress(self.data) + gzip_compress(b'end')
+
+        stream = DecompressingStream(six.BytesIO(compressed), chunk_size=100)
+
+        self.assertEqual(stream.read(), self.data + b'end')
+
+    def test_read_deflate(self):
+        for compressed in [zlib.compress(self.data), raw_deflate_compress(self.data)]:
+            stream = DecompressingStream(six.BytesIO(compressed), wbits=ZLIB_WBITS, chunk_size=100)
+
+            self.assertEqual(stream.read(), self.data)
+
+    def test_read_empty(self):
+        self.assertEqual(DecompressingStream(six.BytesIO(b'')).read(), b'')
+
+    def test_read_invalid(self):
+        compressed = gzip_compress(self.data)
+
+        for data, wbits in [(b'not compressed', GZIP_WBITS),
+                            (compressed[:-20], GZIP_WBITS),
+                            (compressed + b'garbage', GZIP_WBITS),
+                            (zlib.compress(self.data) + b'garbage', ZLIB_WBITS)]:
+            with self.assertRaises(DecompressionError):
+                DecompressingStream(six.BytesIO(data), wbits=wbits).read()
+
+    def test_read_max_size(self):
+        bomb = gzip_compress(b'\x00' * 10 * 1024 * 1024)
+        stream = DecompressingStream(six.BytesIO(bomb), max_size=100000, chunk_size=1024)
+
+        with self.assertRaises(DecompressionError):
+            stream.read()
+
+        # bomb is rejected without decompressing or even reading all of it
+        self.assertLess(stream.size, 100000 + 1024 + 1)
+        self.assertLess(stream.stream.tell(), len(bomb))
+
+
+class TestGetDecompressedStream(unittest.TestCase):
+    def test_identity(self):
+        stream = six.BytesIO(b'data')
+
+        self.assertIs(get_decompressed_stream(stream, None), stream)
+        self.assertIs(get_decompressed_stream(stream, 'identity'), stream)
+
+    def test_multiple_encodings(self):
+        stream = six.BytesIO(zlib.compress(gzip_compress(b'data')))
+
+        actual = get_decompressed_stream(stream, 'gzip, identity, Deflate')
+
+        self.assertEqual(actual.read(), b'data')
+
+    def test_unsupported(self):
+        with self.assertRaises(UnsupportedMediaType):
+            get_decompressed_stream(six.BytesIO(b''), 'br')
@@ -0,0 +1,115 @@
+from __future__ import absolute_import, print_function, unicode_literals
+import threading
+import unittest
+
+import mock
+from django.core.cache import cache
+
+from ..idempotency import DjangoCacheIdempotencyStore, LocalMemoryIdempotencyStore
+
+
+class TestLocalMemoryIdempotencyStore(unittest.TestCase):
+    def setUp(self):
+        super(TestLocalMemoryIdempotencyStore, self).setUp()
+        self.store = LocalMemoryIdempotencyStore(timeout=10, lock_timeout=5)
+
+    def test_get_set(self):
+        with mock.patch('time.time', return_value=100):
+            self.store.set('key', 'value')
+            self.assertEqual(self.store.get('key'), 'value')
+        with mock.patch('time.time', return_value=111):
+            self.assertIsNone(self.store.get('key'))
+
+    def test_acquire(self):
+        token = self.store.acquire('key')
+        self.assertTrue(token)
+        self.assertIsNone(self.store.acquire('key'))
+
+        self.store.release('key', token)
+
+        self.assertTrue(self.store.acquire('key'))
+
+    def test_release_other_token(self):
+        token = self.store.acquire('key')
+
+        self.store.release('key', 'other')
+        self.assertIsNone(self.store.acquire('key'))
+
+        self.store.release('key', token)
+        self.assertTrue(self.store.acquire('key'))
+
+    def test_acquire_expired(self):
+        with mock.patch('time.time', return_value=100):
+            expired = self.store.acquire('key')
+        with mock.patch('time.time', return_value=106):
+            self.assertTrue(self.store.acquire('key'))
+            # expired lock holder cannot release lock of another request
+            self.store.release('key', expired)
+            self.assertIsNone(self.store.acquire('key'))
+
+    def test_wait(self):
+        token = self.store.acquire('key')
+
+        def complete():
+            self.store.set('key', 'value')
+            self.store.release('key', token)
+
+        timer = threading.Timer(0.05, complete)
+        timer.start()
+        self.addCleanup(timer.join)
+
+        self.assertEqual(self.store.wait('key', 5), 'value')
+
+    def test_wait_timeout(self):
+        self.store.acquire('key')
+
+        self.assertIsNone(self.store.wait('key', 0.01))
+
+
+class TestDjangoCacheIdempotencyStore(unittest.TestCase):
+    def setUp(self):
+        super(TestDjangoCacheIdempotencyStore, self).setUp()
+        self.store = DjangoCacheIdempotencyStore(poll_interval=0.01)
+        cache.clear()
+
+    def test_get_set(self):
+        self.store.set('key', 'value')
+
+        self.assertEqual(self.store.get('key'), 'value')
+        self.assertEqual(cache.get('drf-braces-idempotency:key'), 'value')
+
+    def test_acquire(self):
+        token = self.store.acquire('key')
+        self.assertTrue(token)
+        self.assertIsNone(self.store.acquire('key'))
+
+        self.store.release('key', token)
+
+        self.assertTrue(self.store.acquire('key'))
+
+    def test_release_other_token(self):
+        token = self.store.acquire('key')
+
+        self.store.release('key', 'other')
+        self.assertIsNone(self.store.acquire('key'))
+
+        self.store.release('key', token)
+        self.assertTrue(self.store.acquire('key'))
+
+    def test_wait(self):
+        token = self.store.acquire('key')
+
+        def complete():
+            self.store.set('key', 'value')
+            self.store.release('key', token)
+
+        timer = threading.Timer(0.05, complete)
+        timer.start()
+        self.addCleanup(timer.join)
+
+        self.assertEqual(self.store.wait('key', 5), 'value')
+
+    def test_wait_timeout(self):
+        self.store.acquire('key')
+
+        self.assertIsNone(self.store.wait('key', 0.05))
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, unicode_literals
+import datetime
+import decimal
+import json
+import unittest
+import uuid
+from collections import OrderedDict
+
+import mock
+from django.core.exceptions import ImproperlyConfigured
+from django.test.utils import override_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from ..jsonbackends import (
+    ORDERED_DICTS,
+    OrjsonJSONBackend,
+    StdlibJSONBackend,
+    get_json_backend,
+)
+from ..renderers import DoubleAsStrJsonEncoder
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class TestGetJSONBackend(unittest.TestCase):
+    def test_default(self):
+        self.assertIsInstance(get_json_backend(), StdlibJSONBackend)
+        self.assertIs(get_json_backend(), get_json_backend())
+
+    @override_settings(DRF_BRACES_JSON_BACKEND='drf_braces.jsonbackends.OrjsonJSONBackend')
+    def test_setting(self):
+        if orjson is None:
+            self.skipTest('Requires orjson')
+
+        self.assertIsInstance(get_json_backend(), OrjsonJSONBackend)
+
+    def test_path(self):
+        self.assertIsInstance(
+            get_json_backend('drf_braces.jsonbackends.StdlibJSONBackend'),
+            StdlibJSONBackend,
+        )
+
+    def test_invalid(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_json_backend('drf_braces.jsonbackends.DoesNotExist')
+
+
+class JSONBackendConformanceMixin(object):
+    """
+    Conformance tests which all JSON backends must pass.
+    """
+    backend_class = None
+
+    def setUp(self):
+        super(JSONBackendConformanceMixin, self).setUp()
+        self.backend = self.backend_class()
+
+    def dumps(self, data, **kwargs):
+        kwargs.setdefault('ensure_ascii', False)
+        kwargs.setdefault('separators', (',', ':'))
+        return self.backend.dumps(data, **kwargs)
+
+    def test_loads(self):
+        content = '{"b": [1, 2.5, true, false, null, "é"], "a": {"d": 1, "c": 2}}'
+
+        actual = self.backend.loads(content)
+
+        self.assertEqual(actual, json.loads(content))
+        if ORDERED_DICTS:
+            self.assertEqual(list(actual), ['b', 'a'])
+            self.assertEqual(list(actual['a']), ['d', 'c'])
+
+    def test_loads_ordered(self):
+        content = '{"b": 1, "a": {"d": 1, "c": 2}}'
+
+        actual = self.backend.loads(content, object_pairs_hook=OrderedDict)
+
+        self.assertIs(type(actual), OrderedDict)
+        self.assertIs(type(actual['a']), OrderedDict)
+        self.assertEqual(list(actual), ['b', 'a'])
+        self.assertEqual(list(actual['a']), ['d', 'c'])
+
+    def test_loads_big_integers(self):
+        for value in [2 ** 63 - 1, 2 ** 63, 2 ** 64, -2 ** 63 - 1, 12345678901234567890123]:
+            actual = self.backend.loads(json.dumps({'a': [value]}))
+
+            self.assertEqual(actual, {'a': [value]})
+            self.assertIsInstance(actual['a'][0], int)
+
+    def test_loads_non_finite(self):
+        actual = self.backend.loads('[NaN, Infinity, -Infinity, 1e400]')
+
+        self.assertNotEqual(actual[0], actual[0])
+        self.assertEqual(actual[1:], [float('inf'), float('-inf'), float('inf')])
+
+    def test_loads_duplicate_keys(self):
+        self.assertEqual(self.backend.loads('{"a": 1, "a": 2}'), {'a': 2})
+
+    def test_loads_lone_surrogate(self):
+        self.assertEqual(self.backend.loads('"\\ud800"'), '\ud800')
+
+    def test_loads_invalid(self):
+        for content in ['', '{', '[1,]', "{'a': 1}", '[1] 2']:
+            with self.assertRaises(ValueError):
+                self.backend.loads(content)
+
+    def test_dumps(self):
+        data = OrderedDict([
+            ('b', [1, 2.5, True, False, None, 'é ']),
+            ('a', OrderedDict([('d', (1,)), ('c', {})])),
+        ])
+
+        actual = self.dumps(data)
+
+        self.assertIsInstance(actual, bytes)
+        self.assertEqual(json.loads(actual.decode('utf-8')), json.loads(json.dumps(data)))
+        self.assertLess(actual.index(b'"b"'), actual.index(b'"a"'))
+        self.assertLess(actual.index(b'"d"'), actual.index(b'"c"'))
+
+    def test_dumps_encoder(self):
+        data = {
+            'decimal': decimal.Decimal('1.10'),
+            'datetime': datetime.datetime(2010, 1, 2, 3, 4, 5, 123456),
+            'date': datetime.date(2010, 1, 2),
+            'time': datetime.time(3, 4, 5),
+            'timedelta': datetime.timedelta(seconds=5),
+            'uuid': uuid.UUID(int=1),
+            'generator': (i for i in range(2)),
+        }
+        expected = json.loads(json.dumps(dict(data, generator=[0, 1]), cls=JSONEncoder))
+
+        actual = self.dumps(data, encoder_class=JSONEncoder)
+
+        self.assertEqual(json.loads(actual.decode('utf-8')), expected)
+
+    def test_dumps_big_integers_as_str(self):
+        data = {'a': 12345678901234567890, 'b': [123, -99999999999999], 'c': (2 ** 70,)}
+
+        actual = self.dumps(data, encoder_class=DoubleAsStrJsonEncoder)
+
+        self.assertEqual(json.loads(actual.decode('utf-8')), {
+            'a': '12345678901234567890',
+            'b': [123, '-99999999999999'],
+            'c': [str(2 ** 70)],
+        })
+
+    def test_dumps_big_integers(self):
+        data = [2 ** 64, -2 ** 63 - 1]
+
+        self.assertEqual(json.loads(self.dumps(data).decode('utf-8')), data)
+
+    def test_dumps_non_str_keys(self):
+        data = {1: 'a', 2.5: 'b', None: 'c', False: 'd'}
+
+        self.assertEqual(
+            json.loads(self.dumps(data).decode('utf-8')),
+            json.loads(json.dumps(data)),
+        )
+
+    def test_dumps_ensure_ascii(self):
+        actual = self.dumps({'a': 'é'}, ensure_ascii=True)
+
+        self.assertEqual(actual, b'{"a":"\\u00e9"}')
+
+    def test_dumps_formatting(self):
+        data = OrderedDict([('a', [1]), ('b', 2)])
+
+        for kwargs in [{'indent': 2, 'separators': (',', ': ')},
+                       {'indent': 4, 'separators': (',', ': ')},
+                       {'separators': (', ', ': ')},
+                       {'separators': (',', ':')}]:
+            self.assertEqual(
+                self.dumps(data, **kwargs),
+                json.dumps(data, **kwargs).encode('utf-8'),
+            )
+
+    def test_dumps_invalid(self):
+        with self.assertRaises(TypeError):
+            self.dumps({'a': object()}, encoder_class=JSONEncoder)
+
+
+class TestStdlibJSONBackend(JSONBackendConformanceMixin, unittest.TestCase):
+    backend_class = StdlibJSONBackend
+
+
+@unittest.skipIf(orjson is None, 'Requires orjson')
+class TestOrjsonJSONBackend(JSONBackendConformanceMixin, unittest.TestCase):
+    backend_class = OrjsonJSONBackend
+
+    def test_no_fallback(self):
+        with mock.patch.object(self.backend, 'fallback') as mock_fallback:
+            self.backend.loads('{"a": [1, "b"]}')
+            self.dumps({'a': datetime.date(2010, 1, 2)}, encoder_class=DoubleAsStrJsonEncoder)
+            self.dumps({'a': 1}, indent=2, separators=(',', ': '))
+
+        self.assertFalse(mock_fallback.loads.called)
+        self.assertFalse(mock_fallback.dumps.called)
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, print_function, unicode_literals
+import json
+import math
+import sys
+import unittest
+from collections import OrderedDict
+
+import six
+from hypothesis import given, strategies as st
+
+from ..jsonstream import MISSING, JSONStreamDecoder, JSONStreamError, find_path
+
+
+def decode(content, **kwargs):
+    if isinstance(content, six.text_type):
+        content = content.encode('utf-8')
+    return JSONStreamDecoder(six.BytesIO(content), **kwargs).decode()
+
+
+json_values = st.recursive(
+    st.none() | st.booleans() | st.integers() | st.text() | st.floats(allow_nan=False),
+    lambda children: st.lists(children, max_size=5) | st.dictionaries(st.text(max_size=5), children, max_size=5),
+    max_leaves=20,
+)
+
+
+class TestJSONStreamDecoder(unittest.TestCase):
+    def assertDecodes(self, content, chunk_sizes=(1, 2, 3, 7, 64)):
+        expected = json.loads(content, object_pairs_hook=OrderedDict)
+        for chunk_size in chunk_sizes:
+            actual = decode(content, chunk_size=chunk_size)
+            self.assertEqual(actual, expected, chunk_size)
+            self.assertEqual(type(actual), type(expected), chunk_size)
+
+    def test_decode(self):
+        self.assertDecodes(json.dumps(OrderedDict([
+            ('b', [1, 2.5, -3e10, True, False, None, '']),
+            ('a', {'nested': {'deep': ['x' * 100]}}),
+            ('c', 'escaped " \\ \n é 😀'),
+            ('d', []),
+            ('e', {}),
+        ])))
+
+    def test_decode_scalars(self):
+        for content in ['1', '-0', '12345678901234567890', '1.5e-10', '"foo"',
+                        'true', 'false', 'null', ' \n 5 \t ']:
+            self.assertDecodes(content)
+
+    def test_decode_constants(self):
+        self.assertTrue(math.isnan(decode('NaN')))
+        self.assertEqual(decode('[Infinity, -Infinity]', chunk_size=1), [float('inf'), float('-inf')])
+
+    def test_decode_multibyte(self):
+        self.assertDecodes('{"a": "éé€\U0001F600"}')
+
+    def test_decode_duplicate_keys(self):
+        self.assertDecodes('{"a": 1, "b": 2, "a": 3}')
+
+    def test_decode_ordered(self):
+        self.assertEqual(list(decode('{"b": 1, "a": 2, "c": 3}').keys()), ['b', 'a', 'c'])
+
+    def test_decode_object_pairs_hook(self):
+        self.assertIs(type(decode('{"a": {}}', object_pairs_hook=dict)), dict)
+
+    def test_decode_deeply_nested(self):
+        depth = sys.getrecursionlimit() * 2
+        value = decode('[' * depth + ']' * depth, chunk_size=4096)
+
+        for _ in range(depth - 1):
+            value = value[0]
+        self.assertEqual(value, [])
+
+    def test_decode_invalid(self):
+        for content in ['', '{', '[1,]', '[1 2]', '{"a" 1}', '{1: 2}', '"abc', '"\\x"',
+                        'tru', '-', '[1] 2', '{"a": 1,}', '"a\nb"', 'nul']:
+            for chunk_size in (1, 64):
+                with self.assertRaises(ValueError, msg=content):
+                    decode(content, chunk_size=chunk_size)
+
+    def test_decode_invalid_encoding(self):
+        with self.assertRaises(ValueError):
+            JSONStreamDecoder(six.BytesIO(b'"\xff"')).decode()
+
+    def test_max_size(self):
+        content = json.dumps(['a' * 100])
+
+        self.assertEqual(decode(content, max_size=len(content)), ['a' * 100])
+        with self.assertRaises(JSONStreamError) as e:
+            decode(content, max_size=50, chunk_size=10)
+
+        self.assertIn('Maximum size of 50 bytes exceeded', six.text_type(e.exception))
+
+    def test_max_size_stops_reading(self):
+        stream = six.BytesIO(b'[' + b'1,' * 1000 + b'1]')
+
+        with self.assertRaises(JSONStreamError):
+            JSONStreamDecoder(stream, chunk_size=10, max_size=100).decode()
+
+        self.assertEqual(stream.tell(), 110)
+
+    def test_max_depth(self):
+        self.assertEqual(decode('[[{"a": []}]]', max_depth=4), [[{'a': []}]])
+        with self.assertRaises(JSONStreamError) as e:
+            decode('[[{"a": [[]]}]]', max_depth=4)
+
+        self.assertIn('Maximum nesting depth of 4 exceeded', six.text_type(e.exception))
+
+    def test_max_members(self):
+        self.assertEqual(decode('[1, 2, {"a": 1, "b": 2}]', max_members=3), [1, 2, {'a': 1, 'b': 2}])
+        with self.assertRaises(JSONStreamError):
+            decode('[1, 2, 3, 4]', max_members=3)
+        with self.assertRaises(JSONStreamError):
+            decode('{"a": 1, "b": 2, "c": 3, "d": 4}', max_members=3)
+
+    @given(value=json_values, chunk_size=st.integers(min_value=1, max_value=32))
+    def test_decode_equivalence(self, value, chunk_size):
+        content = json.dumps(value, ensure_ascii=bool(chunk_size % 2))
+
+        self.assertEqual(
+            decode(content, chunk_size=chunk_size),
+            json.loads(content, object_pairs_hook=OrderedDict),
+        )
+
+
+def lookup(value, path):
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return MISSING
+        value = value[key]
+    return value
+
+
+class TestJSONStreamDecoderPath(unittest.TestCase):
+    def decode_path(self, content, path, **kwargs):
+        decoder = JSONStreamDecoder(six.BytesIO(content.encode('utf-8')), **kwargs)
+        return decoder.decode_path(path)
+
+    def test_decode_path(self):
+        content = json.dumps(OrderedDict([
+            ('audit', [{'who': 'x' * 100, 'escaped': '\\"\u00e9'}]),
+            ('envelope', OrderedDict([
+                ('attachments', ['a' * 100]),
+                ('application', {'foo': [1, 2]}),
+            ])),
+            ('trailer', {'a': None}),
+        ]))
+
+        for chunk_size in (1, 3, 64):
+            self.assertEqual(
+                self.decode_path(content, ['envelope', 'application'], chunk_size=chunk_size),
+                {'foo': [1, 2]},
+            )
+
+    def test_decode_path_missing(self):
+        content = '{"foo": {"bar": 1}, "baz": [1]}'
+
+        self.assertIs(self.decode_path(content, ['bar']), MISSING)
+        self.assertIs(self.decode_path(content, ['foo', 'baz']), MISSING)
+        self.assertIs(self.decode_path(content, ['baz', '0']), MISSING)
+        self.assertIs(self.decode_path('[1, 2]', ['foo']), MISSING)
+
+    def test_decode_path_duplicate_keys(self):
+        self.assertEqual(self.decode_path('{"a": 1, "b": 2, "a": 3}', ['a']), 3)
+        self.assertEqual(self.decode_path('{"a": {"b": 1}, "a": {"c": 2}}', ['a', 'b']), 1)
+
+    def test_decode_path_validates_skipped(self):
+        for content in ['{"a": 1, "b": [1,]}', '{"a": 1, "b": "\\x"}', '{"a": 1, "b": "foo}',
+                        '{"b": tru, "a": 1}', '{"a": 1} 2', '{"a": 1, "b": "\x01"}']:
+            for chunk_size in (1, 64):
+                with self.assertRaises(ValueError, msg=content):
+                    self.decode_path(content, ['a'], chunk_size=chunk_size)
+
+    def test_decode_path_limits(self):
+        with self.assertRaises(JSONStreamError):
+            self.decode_path('{"a": 1, "b": [[[]]]}', ['a'], max_depth=3)
+        with self.assertRaises(JSONStreamError):
+            self.decode_path('{"a": 1, "b": [1, 2, 3]}', ['a'], max_members=2)
+        with self.assertRaises(JSONStreamError):
+            self.decode_path('{"a": 1, "b": 2, "c": 3}', ['a'], max_members=2)
+
+    def test_decode_path_retain(self):
+        content = '{"foo": {"bar": "' + 'x' * 100 + '"}}'
+        decoder = JSONStreamDecoder(six.BytesIO(content.encode('utf-8')), chunk_size=8)
+        decoder.retain = True
+
+        self.assertIs(decoder.decode_path(['bar']), MISSING)
+        self.assertEqual(decoder.buffer, content)
+
+    def test_decode_path_retain_found(self):
+        content = '{"foo": 1, "bar": "' + 'x' * 100 + '"}'
+        decoder = JSONStreamDecoder(six.BytesIO(content.encode('utf-8')), chunk_size=8)
+        decoder.retain = True
+
+        self.assertEqual(decoder.decode_path(['foo']), 1)
+        self.assertFalse(decoder.retain)
+        self.assertLess(len(decoder.buffer), 16)
+
+    @given(value=json_values,
+           path=st.lists(st.text(max_size=1), max_size=3),
+           chunk_size=st.integers(min_value=1, max_value=32))
+    def test_decode_path_equivalence(self, value, path, chunk_size):
+        content = json.dumps(value, ensure_ascii=bool(chunk_size % 2))
+
+        self.assertEqual(
+            self.decode_path(content, path, chunk_size=chunk_size),
+            lookup(json.loads(content), path),
+        )
+
+
+class TestFindPath(unittest.TestCase):
+    def test_find_path(self):
+        content = ' {"audit": [{"who": "\\"}"}], "envelope" : {"application": {"foo": [1, 2]}}} '
+
+        start, end, value = find_path(content, ['envelope', 'application'])
+
+        self.assertEqual(content[start:end], '{"foo": [1, 2]}')
+        self.assertEqual(value, {'foo': [1, 2]})
+
+    def test_find_path_decoder(self):
+        _, _, value = find_path('{"a": {"c": 1, "b": 2}}', ['a'], json.JSONDecoder(object_pairs_hook=OrderedDict))
+
+        self.assertEqual(list(value.items()), [('c', 1), ('b', 2)])
+        self.assertIsInstance(value, OrderedDict)
+
+    def test_find_path_missing(self):
+        content = '{"foo": {"bar": 1}, "baz": [1]}'
+
+        self.assertIsNone(find_path(content, ['bar']))
+        self.assertIsNone(find_path(content, ['foo', 'baz']))
+        self.assertIsNone(find_path(content, ['baz', '0']))
+        self.assertIsNone(find_path('[1, 2]', ['foo']))
+        self.assertIsNone(find_path('{}', ['foo']))
+
+    def test_find_path_duplicate_keys(self):
+        self.assertEqual(find_path('{"a": 1, "b": 2, "a": 3}', ['a'])[2], 3)
+
+    def test_find_path_validates_skipped(self):
+        for content in ['{"a": 1, "b": [1,]}', '{"a": 1, "b": "\\x"}', '{"a": 1, "b": "foo}', '{"a" 1}',
+                        '{"b": tru, "a": 1}', '{"a": 1} 2', '{"a": 1 "b": 2}', '{a: 1}', '']:
+            with self.assertRaises(ValueError, msg=content):
+                find_path(content, ['a'])
+
+    @given(value=json_values, path=st.lists(st.text(max_size=1), max_size=3))
+    def test_find_path_equivalence(self, value, path):
+        content = json.dumps(value)
+        found = find_path(content, path)
+
+        self.assertEqual(MISSING if found is None else found[2], lookup(json.loads(content), path))
@@ -0,0 +1,210 @@
+from __future__ import absolute_import, print_function, unicode_literals
+import timeit
+import traceback
+import unittest
+from collections import OrderedDict
+from decimal import Decimal
+
+import six
+from django.core.exceptions import ImproperlyConfigured
+
+from ..mappers import DataMapper, Map, empty
+
+
+class ApplicationMapper(DataMapper):
+    first_name = Map('applicant.name.first')
+    amount = Map('loan.amount', transform=Decimal, default=0)
+    state = Map('applicant.addresses.0.state', target='address.state', transform='get_state')
+    city = Map(['applicant', 'addresses', 0, 'city'], target=['address', 'city'])
+    tags = Map(default=list)
+    size = Map('*', transform=len)
+
+    def get_state(self, value):
+        return value.upper() + self.context.get('suffix', '')
+
+
+def map_application(data):
+    """
+    Hand-written equivalent of ``ApplicationMapper``.
+    """
+    result = OrderedDict()
+    try:
+        result['first_name'] = data['applicant']['name']['first']
+    except (KeyError, IndexError, TypeError):
+        pass
+    try:
+        result['amount'] = Decimal(data['loan']['amount'])
+    except (KeyError, IndexError, TypeError):
+        result['amount'] = 0
+    try:
+        result.setdefault('address', OrderedDict())['state'] = data['applicant']['addresses'][0]['state'].upper()
+    except (KeyError, IndexError, TypeError):
+        pass
+    try:
+        result.setdefault('address', OrderedDict())['city'] = data['applicant']['addresses'][0]['city']
+    except (KeyError, IndexError, TypeError):
+        pass
+    result['tags'] = data.get('tags', [])
+    result['size'] = len(data)
+    return result
+
+
+def map_application_interpreted(data, mappings=ApplicationMapper._declared_mappings):
+    """
+    Naive mapper walking declared mappings for each record.
+    """
+    result = OrderedDict()
+    for name, mapping in mappings.items():
+        source = mapping.source or name
+        value = data
+        try:
+            if source != '*':
+                for key in (source.split('.') if isinstance(source, six.string_types) else source):
+                    value = value[int(key) if isinstance(value, list) else key]
+        except (KeyError, IndexError, TypeError):
+            if mapping.default is empty:
+                continue
+            value = mapping.default() if callable(mapping.default) else mapping.default
+        else:
+            if isinstance(mapping.transform, six.string_types):
+                value = getattr(ApplicationMapper(), mapping.transform)(value)
+            elif mapping.transform is not None:
+                value = mapping.transform(value)
+        target = mapping.target or name
+        target = target.split('.') if isinstance(target, six.string_types) else target
+        container = result
+        for key in target[:-1]:
+            container = container.setdefault(key, OrderedDict())
+        container[target[-1]] = value
+    return result
+
+
+class TestDataMapper(unittest.TestCase):
+    def setUp(self):
+        super(TestDataMapper, self).setUp()
+        self.data = {
+            'applicant': {
+                'name': {'first': 'John'},
+                'addresses': [{'state': 'il', 'city': 'Chicago'}],
+            },
+            'loan': {'amount': '100.50'},
+            'tags': ['a'],
+        }
+
+    def test_map(self):
+        actual = ApplicationMapper(context={'suffix': '!'})(self.data)
+
+        self.assertEqual(actual, OrderedDict([
+            ('first_name', 'John'),
+            ('amount', Decimal('100.50')),
+            ('address', OrderedDict([('state', 'IL!'), ('city', 'Chicago')])),
+            ('tags', ['a']),
+            ('size', 3),
+        ]))
+        self.assertEqual(list(actual), ['first_name', 'amount', 'address', 'tags', 'size'])
+
+    def test_map_missing(self):
+        data = {'applicant': {'name': None, 'addresses': []}}
+
+        actual = ApplicationMapper()(data)
+
+        self.assertEqual(actual, {'amount': 0, 'tags': [], 'size': 1})
+        # callable defaults are not shared
+        self.assertIsNot(actual['tags'], ApplicationMapper()(data)['tags'])
+
+    def test_map_many(self):
+        self.assertEqual(ApplicationMapper()([{}, {}]), [{'amount': 0, 'tags': [], 'size': 0}] * 2)
+
+    def test_map_lazy(self):
+        def records():
+            yield {}
+            raise AssertionError('Records must be mapped lazily')
+
+        actual = ApplicationMapper()(records())
+
+        self.assertEqual(next(actual), {'amount': 0, 'tags': [], 'size': 0})
+
+    def test_inheritance(self):
+        class Mapper(ApplicationMapper):
+            first_name = Map('applicant.name.last')
+            last = Map(target='last_name')
+
+        actual = Mapper()({'applicant': {'name': {'last': 'Doe'}}, 'last': 'Doe'})
+
+        self.assertEqual(list(actual), ['first_name', 'amount', 'tags', 'size', 'last_name'])
+        self.assertEqual(actual['first_name'], 'Doe')
+        self.assertNotIn('applicant.name.last', ApplicationMapper.get_source())
+
+    def test_invalid(self):
+        with self.assertRaises(ImproperlyConfigured):
+            class ConflictingMapper(DataMapper):
+                a = Map(target='x.y')
+                b = Map(target='x')
+
+        with self.assertRaises(ImproperlyConfigured):
+            class InvalidTransformMapper(DataMapper):
+                a = Map(transform='missing')
+
+    def test_get_source(self):
+        class Mapper(DataMapper):
+            a = Map(transform=int)
+
+        try:
+            Mapper()({'a': 'foo'})
+        except ValueError:
+            tb = traceback.format_exc()
+
+        self.assertIn("value = data['a']", Mapper.get_source())
+        # compiled source shows up in tracebacks
+        self.assertIn('value = transform_0(value)', tb)
+
+    def test_numeric_keys(self):
+        class Mapper(DataMapper):
+            index = Map('rates.1')
+            key = Map(['rates', '1'], default=None)
+            year = Map(['years', '2019'])
+            dotted_year = Map('years.2019', default=None)
+
+        self.assertEqual(Mapper()({'rates': [1, 2], 'years': {'2019': 3}}), {
+            'index': 2,
+            'key': None,
+            'year': 3,
+            'dotted_year': None,
+        })
+
+    def test_equivalence(self):
+        for data in [self.data, {}, {'applicant': {'addresses': [{}]}}]:
+            self.assertEqual(ApplicationMapper()(data), map_application(data))
+            self.assertEqual(map_application_interpreted(data), map_application(data))
+
+
+def benchmark():
+    """
+    Compare compiled mapper with hand-written mapping
+    and with interpreting mappings for each record.
+
+    Timings depend on the machine hence they are only printed
+    instead of being asserted by tests::
+
+        make benchmark
+    """
+    record = {
+        'applicant': {
+            'name': {'first': 'John'},
+            'addresses': [{'state': 'il', 'city': 'Chicago'}],
+        },
+        'loan': {'amount': '100.50'},
+        'tags': ['a'],
+    }
+    records = [record, {'loan': {'amount': '1'}}] * 500
+    mapper = ApplicationMapper()
+
+    for name, func in [('compiled', mapper),
+                       ('hand-written', map_application),
+                       ('interpreted', map_application_interpreted)]:
+        timing = min(timeit.repeat(lambda: [func(i) for i in records], number=3, repeat=5))
+        print('{:<15}{:.4f}s'.format(name, timing))
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -1,14 +1,41 @@
 from __future__ import absolute_import, print_function, unicode_literals
+import json
+import threading
 import unittest
 
 import mock
-from rest_framework.generics import GenericAPIView
+from django.contrib.auth.models import Group, Permission, User
+from django.db import connection
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import permissions, serializers, status
+from django.utils import timezone
+from rest_framework.generics import GenericAPIView, ListAPIView, RetrieveAPIView
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
 
+from ..idempotency import LocalMemoryIdempotencyStore
+from ..mappers import DataMapper, Map
 from ..mixins import (
+    ConditionalGetViewMixin,
+    IdempotentViewMixin,
+    KeysetStreamingResponseViewMixin,
     MapDataViewMixin,
+    MemoizedViewMixin,
     MultipleSerializersViewMixin,
+    OptimizedQuerysetViewMixin,
+    SparseFieldsetViewMixin,
+    StreamingListViewMixin,
+    StreamingResponseViewMixin,
     StrippingJSONViewMixin,
 )
+from ..renderers import StreamingDoubleAsStrJsonRenderer, WrappingJSONRenderer
+from ..serializers.sparse import SparseFieldsetSerializerMixin
+from ..testing import QueryCountTestMixin
+from .test_querysets import PermissionSerializer, UserSerializer
 
 
 class TestMultipleSerializersViewMixin(unittest.TestCase):
@@ -53,6 +80,17 @@ class TestMultipleSerializersViewMixin(unittest.TestCase):
         serializer_class.assert_called_once_with(hello='world', context=context)
         mock_get_serializer_context.assert_called_once_with()
 
+    @mock.patch.object(GenericAPIView, 'get_serializer_context')
+    def test_get_serializer_context_memoized(self, mock_get_serializer_context):
+        mock_get_serializer_context.return_value = {'context': 'here'}
+        self.view.request = mock.sentinel.request
+
+        self.view.get_serializer(serializer_class=mock.MagicMock())
+        self.view.get_serializer(serializer_class=mock.MagicMock())
+
+        self.assertIs(self.view.get_serializer_context(), mock_get_serializer_context.return_value)
+        mock_get_serializer_context.assert_called_once_with()
+
 
 class TestMapDataViewMixin(unittest.TestCase):
     def setUp(self):
@@ -80,6 +118,24 @@ class TestMapDataViewMixin(unittest.TestCase):
         )
         mapper.return_value.assert_called_once_with(mock.sentinel.data)
 
+    @mock.patch.object(GenericAPIView, 'get_serializer_context')
+    def test_get_data_memoized(self, mock_get_serializer_context):
+        mock_get_serializer_context.return_value = {'context': 'here'}
+        mapper = self.view.data_mapper_class = mock.MagicMock()
+        mapper.return_value.side_effect = lambda data: {'data': data}
+
+        actual = self.view.get_data()
+        self.assertIs(self.view.get_data(), actual)
+        self.assertIs(self.view.get_mapper_context(), mock_get_serializer_context.return_value)
+
+        self.assertEqual(mapper.call_count, 1)
+        mock_get_serializer_context.assert_called_once_with()
+
+        self.view.invalidate_memoized()
+        self.view.get_data()
+
+        self.assertEqual(mapper.call_count, 2)
+
     @mock.patch.object(GenericAPIView, 'get_serializer_context')
     def test_get_data_provided(self, mock_get_serializer_context):
         mapper = mock.MagicMock()
@@ -92,6 +148,49 @@ class TestMapDataViewMixin(unittest.TestCase):
         mapper.return_value.assert_called_once_with(mock.sentinel.data)
 
 
+class TestMemoizedViewMixin(unittest.TestCase):
+    def setUp(self):
+        super(TestMemoizedViewMixin, self).setUp()
+        self.view = MemoizedViewMixin()
+        self.view.request = mock.sentinel.request
+        self.func = mock.Mock(side_effect=lambda *args: object())
+
+    def test_memoize(self):
+        value = self.view.memoize('key', self.func, 1)
+
+        self.assertIs(self.view.memoize('key', self.func, 1), value)
+        self.assertIsNot(self.view.memoize('other', self.func, 1), value)
+        self.func.assert_has_calls([mock.call(1), mock.call(1)])
+        self.assertEqual(self.func.call_count, 2)
+
+    def test_memoize_per_request(self):
+        value = self.view.memoize('key', self.func)
+        self.view.request = mock.sentinel.other_request
+
+        self.assertIsNot(self.view.memoize('key', self.func), value)
+
+    def test_memoize_iterator(self):
+        self.func.side_effect = lambda: iter([])
+
+        self.view.memoize('key', self.func)
+        self.view.memoize('key', self.func)
+
+        self.assertEqual(self.func.call_count, 2)
+
+    def test_invalidate_memoized(self):
+        a = self.view.memoize('a', self.func)
+        b = self.view.memoize('b', self.func)
+
+        self.view.invalidate_memoized('a')
+
+        self.assertIsNot(self.view.memoize('a', self.func), a)
+        self.assertIs(self.view.memoize('b', self.func), b)
+
+        self.view.invalidate_memoized()
+
+        self.assertIsNot(self.view.memoize('b', self.func), b)
+
+
 class TestStrippingJSONViewMixin(unittest.TestCase):
     def setUp(self):
         super(TestStrippingJSONViewMixin, self).setUp()
@@ -109,3 +208,610 @@ class TestStrippingJSONViewMixin(unittest.TestCase):
 
         self.assertIn('parse_root', actual)
         self.assertEqual(actual['parse_root'], mock.sentinel.parser_root)
+
+    def test_round_trip(self):
+        class View(StrippingJSONViewMixin, GenericAPIView):
+            parser_root = ['data', 'item']
+            renderer_classes = (WrappingJSONRenderer,)
+
+            def post(self, request):
+                return Response(request.data)
+
+        request = APIRequestFactory().post(
+            '/', '{"data": {"item": {"a": 1}, "meta": {}}}', content_type='application/json'
+        )
+
+        response = View.as_view()(request)
+        response.render()
+
+        self.assertEqual(json.loads(response.content.decode('utf-8')), {'data': {'item': {'a': 1}}})
+
+
+class TestStreamingListViewMixin(unittest.TestCase):
+    def setUp(self):
+        super(TestStreamingListViewMixin, self).setUp()
+
+        class Serializer(serializers.Serializer):
+            id = serializers.IntegerField()
+
+        class View(StreamingListViewMixin, GenericAPIView):
+            serializer_class = Serializer
+
+            def post(self, request):
+                self.validated = []
+                for data in self.get_validated_records():
+                    self.validated.append(data)
+                return Response(status=status.HTTP_201_CREATED)
+
+        self.view_class = View
+        self.factory = APIRequestFactory()
+
+    def post(self, content, **initkwargs):
+        request = self.factory.post('/', content, content_type='application/x-ndjson')
+        views = []
+
+        class View(self.view_class):
+            def initial(self, *args, **kwargs):
+                views.append(self)
+                return super(View, self).initial(*args, **kwargs)
+
+        response = View.as_view(**initkwargs)(request)
+        return response, views[0]
+
+    def test_get_validated_records(self):
+        response, view = self.post(b'{"id": 1}\n{"id": "2"}\n')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(view.validated, [{'id': 1}, {'id': 2}])
+
+    def test_get_validated_records_lazy(self):
+        view = self.view_class()
+        view.format_kwarg = None
+        view.request = mock.MagicMock()
+        records = iter([{'id': 1}, {'id': 2}])
+
+        validated = view.get_validated_records(records)
+
+        self.assertEqual(next(validated), {'id': 1})
+        self.assertEqual(list(records), [{'id': 2}])
+
+    def test_get_validated_records_invalid(self):
+        response, view = self.post(b'{"id": 1}\n{"id": "a"}\n{"id": 3}\n{}\n')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {1, 3})
+        self.assertIn('id', response.data[1])
+        self.assertEqual(view.validated, [{'id': 1}, {'id': 3}])
+
+    def test_get_validated_records_fail_fast(self):
+        response, view = self.post(b'{"id": "a"}\n{"id": 2}\n{}\n', fail_fast=True)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {0})
+        self.assertEqual(view.validated, [])
+
+    def test_get_records_mapped(self):
+        class Mapper(DataMapper):
+            id = Map('record.pk')
+
+        class View(MapDataViewMixin, self.view_class):
+            data_mapper_class = Mapper
+
+        self.view_class = View
+
+        response, view = self.post(b'{"record": {"pk": 1}}\n{"record": {"pk": 2}}\n')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(view.validated, [{'id': 1}, {'id': 2}])
+
+    def test_parse_error(self):
+        response, view = self.post(b'{"id": 1}\n{"id": \n')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(view.validated, [{'id': 1}])
+
+
+class TestStreamingResponseViewMixin(unittest.TestCase):
+    def setUp(self):
+        super(TestStreamingResponseViewMixin, self).setUp()
+        self.consumed = consumed = []
+        self.chunk_sizes = chunk_sizes = []
+
+        class Serializer(serializers.Serializer):
+            id = serializers.IntegerField()
+            big = serializers.IntegerField()
+
+        class QuerySet(list):
+            def iterator(self, chunk_size=None):
+                chunk_sizes.append(chunk_size)
+                for i in self:
+                    consumed.append(i['id'])
+                    yield i
+
+        class View(StreamingResponseViewMixin, ListAPIView):
+            renderer_classes = (StreamingDoubleAsStrJsonRenderer,)
+            serializer_class = Serializer
+
+            def get_queryset(self):
+                return QuerySet({'id': i, 'big': 10 ** 15} for i in range(1000))
+
+        self.view = View.as_view()
+        self.factory = APIRequestFactory(HTTP_ACCEPT='application/json; double=str')
+
+    def test_list(self):
+        response = self.view(self.factory.get('/'))
+
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json; double=str')
+        self.assertEqual(self.consumed, [])
+
+        content = b''.join(response.streaming_content)
+
+        self.assertEqual(
+            json.loads(content.decode('utf-8')),
+            [{'id': i, 'big': '1000000000000000'} for i in range(1000)],
+        )
+        self.assertEqual(len(self.consumed), 1000)
+        self.assertEqual(self.chunk_sizes, [2000])
+
+    @mock.patch('django.VERSION', (1, 11))
+    def test_list_old_django(self):
+        response = self.view(self.factory.get('/'))
+
+        self.assertEqual(len(json.loads(b''.join(response.streaming_content).decode('utf-8'))), 1000)
+        self.assertEqual(self.chunk_sizes, [None])
+
+    @mock.patch.object(StreamingDoubleAsStrJsonRenderer, 'chunk_size', 100)
+    def test_list_lazy(self):
+        response = self.view(self.factory.get('/'))
+
+        next(iter(response.streaming_content))
+
+        self.assertLess(len(self.consumed), 1000)
+
+    def test_not_streaming(self):
+        class View(StreamingResponseViewMixin, GenericAPIView):
+            renderer_classes = (JSONRenderer,)
+
+            def get(self, request):
+                return Response({'foo': 'bar'}, headers={'X-Foo': 'bar'})
+
+        response = View.as_view()(self.factory.get('/'))
+
+        self.assertNotIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response.data, {'foo': 'bar'})
+
+    def test_headers(self):
+        class View(StreamingResponseViewMixin, GenericAPIView):
+            renderer_classes = (StreamingDoubleAsStrJsonRenderer,)
+
+            def get(self, request):
+                return Response({'foo': 'bar'}, status=201, headers={'X-Foo': 'bar'})
+
+        response = View.as_view()(self.factory.get('/'))
+
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['X-Foo'], 'bar')
+        self.assertEqual(b''.join(response.streaming_content), b'{"foo":"bar"}')
+
+
+class TestKeysetStreamingResponseViewMixin(TestCase):
+    def setUp(self):
+        super(TestKeysetStreamingResponseViewMixin, self).setUp()
+
+        class CodenameSerializer(serializers.ModelSerializer):
+            class Meta(object):
+                model = Permission
+                fields = ['codename']
+
+        class View(KeysetStreamingResponseViewMixin, MultipleSerializersViewMixin,
+                   OptimizedQuerysetViewMixin, ListAPIView):
+            queryset = Permission.objects.order_by('name')
+            serializer_class = PermissionSerializer
+            renderer_classes = (StreamingDoubleAsStrJsonRenderer,)
+            iterator_chunk_size = 10
+
+        self.codename_serializer_class = CodenameSerializer
+        self.view_class = View
+        self.count = Permission.objects.count()
+
+    def get(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.view_class.as_view()(
+                APIRequestFactory(HTTP_ACCEPT='application/json; double=str').get('/')
+            )
+            data = json.loads(b''.join(response.streaming_content).decode('utf-8'))
+        return data, context.captured_queries
+
+    def test_list(self):
+        data, queries = self.get()
+
+        self.assertEqual(
+            [i['codename'] for i in data],
+            list(Permission.objects.order_by('pk').values_list('codename', flat=True)),
+        )
+        self.assertEqual(data[0]['content_type']['model'], Permission.objects.order_by('pk')[0].content_type.model)
+        # select with related content types and prefetch of groups per chunk
+        chunks = -(-self.count // 10)
+        self.assertEqual(len(queries), chunks * 2 + (0 if self.count % 10 else 1))
+        self.assertFalse(any('OFFSET' in i['sql'] for i in queries))
+
+    def test_keyset_fields(self):
+        self.view_class.keyset_fields = ('-content_type_id', 'codename')
+        self.view_class.streaming_serializer_class = self.codename_serializer_class
+
+        data, _ = self.get()
+
+        self.assertEqual(
+            [i['codename'] for i in data],
+            list(Permission.objects.order_by('-content_type_id', 'codename').values_list('codename', flat=True)),
+        )
+        self.assertEqual(set(data[0]), {'codename'})
+
+    def test_streaming_serializer_class(self):
+        class View(KeysetStreamingResponseViewMixin, ListAPIView):
+            queryset = Permission.objects.all()
+            serializer_class = PermissionSerializer
+            streaming_serializer_class = self.codename_serializer_class
+            renderer_classes = (StreamingDoubleAsStrJsonRenderer,)
+
+        self.view_class = View
+
+        data, _ = self.get()
+
+        self.assertEqual(len(data), self.count)
+        self.assertEqual(set(data[0]), {'codename'})
+
+    def test_get_keyset_filter(self):
+        view = self.view_class()
+        view.keyset_fields = ('-content_type_id', 'codename')
+        last = Permission(content_type_id=5, codename='foo')
+
+        self.assertEqual(
+            str(view.get_keyset_filter(last)),
+            str(Q(content_type_id__lt=5) | Q(content_type_id=5) & Q(codename__gt='foo')),
+        )
+
+
+class TestOptimizedQuerysetViewMixin(QueryCountTestMixin, TestCase):
+    def setUp(self):
+        super(TestOptimizedQuerysetViewMixin, self).setUp()
+        self.permissions = list(Permission.objects.all()[:3])
+
+        class View(OptimizedQuerysetViewMixin, ListAPIView):
+            queryset = User.objects.all()
+            serializer_class = UserSerializer
+            renderer_classes = (JSONRenderer,)
+
+        self.view_class = View
+
+    def get(self):
+        response = self.view_class.as_view()(APIRequestFactory().get('/'))
+        response.render()
+        return response
+
+    def grow(self):
+        for _ in range(3):
+            user = User.objects.create(username='user{}'.format(User.objects.count()))
+            group = Group.objects.create(name=user.username)
+            group.permissions.set(self.permissions)
+            user.groups.add(group)
+            user.user_permissions.set(self.permissions)
+
+    def test_get_queryset(self):
+        self.assertConstantQueries(self.get, self.grow)
+        self.assertEqual(len(json.loads(self.get().content.decode('utf-8'))), 6)
+
+    def test_get_queryset_not_optimized(self):
+        self.view_class.optimize_queryset = False
+
+        with self.assertRaises(AssertionError):
+            self.assertConstantQueries(self.get, self.grow)
+
+
+class TestSparseFieldsetViewMixin(QueryCountTestMixin, TestCase):
+    def setUp(self):
+        super(TestSparseFieldsetViewMixin, self).setUp()
+
+        class Serializer(SparseFieldsetSerializerMixin, PermissionSerializer):
+            pass
+
+        class View(SparseFieldsetViewMixin, OptimizedQuerysetViewMixin, ListAPIView):
+            queryset = Permission.objects.all()
+            serializer_class = Serializer
+            renderer_classes = (JSONRenderer,)
+
+        self.view = View.as_view()
+
+    def get(self, query):
+        response = self.view(APIRequestFactory().get('/', query))
+        response.render()
+        return json.loads(response.content.decode('utf-8'))
+
+    def test_fields(self):
+        with CaptureQueriesContext(connection) as context:
+            data = self.get({'fields': 'codename,content_type.model'})
+
+        self.assertEqual(set(data[0]), {'codename', 'content_type'})
+        self.assertEqual(set(data[0]['content_type']), {'model'})
+        self.assertEqual(len(context), 1)
+        self.assertNotIn('"auth_permission"."name"', context.captured_queries[0]['sql'])
+        self.assertNotIn('"django_content_type"."app_label", ', context.captured_queries[0]['sql'])
+
+    def test_all_fields(self):
+        with CaptureQueriesContext(connection) as context:
+            data = self.get({})
+
+        self.assertEqual(set(data[0]), {'codename', 'content_type', 'app_label', 'group_names'})
+        self.assertEqual(len(context), 2)
+        self.assertIn('"auth_permission"."name"', context.captured_queries[0]['sql'])
+
+    def test_get_requested_fields_unsafe_method(self):
+        view = SparseFieldsetViewMixin()
+        view.request = mock.Mock(method='POST', query_params={'fields': 'id'})
+
+        self.assertIsNone(view.get_requested_fields())
+
+
+class TestConditionalGetViewMixin(TestCase):
+    def setUp(self):
+        super(TestConditionalGetViewMixin, self).setUp()
+        self.user = User.objects.create(username='foo', last_login=timezone.now())
+        User.objects.create(username='bar')
+
+        class Serializer(serializers.ModelSerializer):
+            class Meta(object):
+                model = User
+                fields = ['id', 'username']
+
+        class ListView(ConditionalGetViewMixin, ListAPIView):
+            queryset = User.objects.all()
+            serializer_class = Serializer
+            renderer_classes = (JSONRenderer,)
+            fingerprint_field = 'last_login'
+
+        class DetailView(ConditionalGetViewMixin, RetrieveAPIView):
+            queryset = User.objects.all()
+            serializer_class = Serializer
+            renderer_classes = (JSONRenderer,)
+            fingerprint_field = 'last_login'
+
+        self.list_view = ListView
+        self.detail_view = DetailView
+
+    def get(self, view_class, etag=None, **kwargs):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        with CaptureQueriesContext(connection) as context:
+            response = view_class.as_view()(APIRequestFactory().get('/', **headers), **kwargs)
+            if isinstance(response, Response):
+                response.render()
+        return response, len(context)
+
+    def test_not_modified(self):
+        response, _ = self.get(self.list_view)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.content.decode('utf-8'))), 2)
+
+        not_modified, queries = self.get(self.list_view, etag=response['ETag'])
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+        self.assertEqual(not_modified.content, b'')
+        self.assertEqual(queries, 1)
+
+    def test_weak_etag(self):
+        response, _ = self.get(self.list_view)
+
+        self.assertEqual(self.get(self.list_view, etag='W/' + response['ETag'])[0].status_code, 304)
+        self.assertEqual(self.get(self.list_view, etag='*')[0].status_code, 304)
+
+    def test_modified(self):
+        response, _ = self.get(self.list_view)
+
+        User.objects.create(username='other')
+
+        modified, _ = self.get(self.list_view, etag=response['ETag'])
+        self.assertEqual(modified.status_code, 200)
+        self.assertNotEqual(modified['ETag'], response['ETag'])
+
+    def test_detail(self):
+        response, _ = self.get(self.detail_view, pk=self.user.pk)
+
+        self.assertEqual(self.get(self.detail_view, etag=response['ETag'], pk=self.user.pk)[0].status_code, 304)
+
+        self.user.last_login = timezone.now() + timezone.timedelta(seconds=1)
+        self.user.save()
+
+        self.assertEqual(self.get(self.detail_view, etag=response['ETag'], pk=self.user.pk)[0].status_code, 200)
+
+    def test_detail_object_permissions(self):
+        allowed = []
+
+        class Permission(permissions.BasePermission):
+            def has_object_permission(self, request, view, obj):
+                return bool(allowed)
+
+        self.detail_view.permission_classes = (Permission,)
+        self.detail_view.rendered_cache_maxsize = 10
+        allowed.append(True)
+        response, queries = self.get(self.detail_view, pk=self.user.pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, 1)
+
+        allowed.pop()
+
+        self.assertEqual(self.get(self.detail_view, etag=response['ETag'], pk=self.user.pk)[0].status_code, 403)
+        self.assertEqual(self.get(self.detail_view, pk=self.user.pk)[0].status_code, 403)
+
+    def test_detail_not_found(self):
+        response, _ = self.get(self.detail_view, pk=0)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_no_fingerprint(self):
+        self.list_view.fingerprint_field = None
+
+        self.assertFalse(self.get(self.list_view)[0].has_header('ETag'))
+
+    def test_rendered_cache(self):
+        self.list_view.rendered_cache_maxsize = 10
+        response, _ = self.get(self.list_view)
+
+        cached, queries = self.get(self.list_view)
+
+        self.assertEqual(cached.status_code, 200)
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached['Content-Type'], response['Content-Type'])
+        self.assertEqual(cached['ETag'], response['ETag'])
+        self.assertEqual(queries, 1)
+
+    def test_rendered_cache_max_length(self):
+        self.list_view.rendered_cache_maxsize = 10
+        self.list_view.rendered_cache_max_length = 10
+        self.get(self.list_view)
+
+        self.assertEqual(self.get(self.list_view)[1], 2)
+
+    def test_rendered_cache_users(self):
+        class View(self.list_view):
+            rendered_cache_maxsize = 10
+
+            def get_fingerprint(self):
+                return 1
+
+            def list(self, request, *args, **kwargs):
+                return Response({'username': request.user.username})
+
+        other = User.objects.get(username='bar')
+        responses = []
+        for user in [self.user, other, None, self.user, other, None]:
+            request = APIRequestFactory().get('/')
+            force_authenticate(request, user)
+            response = View.as_view()(request)
+            if isinstance(response, Response):
+                response.render()
+            responses.append(response)
+
+        self.assertEqual(
+            [json.loads(i.content.decode('utf-8'))['username'] for i in responses],
+            ['foo', 'bar', '', 'foo', 'bar', ''],
+        )
+        self.assertEqual(len({i['ETag'] for i in responses}), 3)
+
+
+class TestIdempotentViewMixin(unittest.TestCase):
+    def setUp(self):
+        super(TestIdempotentViewMixin, self).setUp()
+        self.calls = calls = []
+        self.started = started = threading.Event()
+        self.proceed = proceed = threading.Event()
+        proceed.set()
+
+        class View(IdempotentViewMixin, GenericAPIView):
+            idempotency_store = LocalMemoryIdempotencyStore()
+            authentication_classes = ()
+            permission_classes = ()
+            renderer_classes = (JSONRenderer,)
+
+            def post(self, request):
+                started.set()
+                proceed.wait(5)
+                calls.append(request.data)
+                if request.data.get('fail'):
+                    return Response(status=status.HTTP_503_SERVICE_UNAVAILABLE)
+                return Response({'id': len(calls)}, status=status.HTTP_201_CREATED, headers={'Location': '/foo/'})
+
+        self.view_class = View
+        self.view = View.as_view()
+
+    def post(self, data='{"foo": "bar"}', key='key', path='/'):
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+        response = self.view(APIRequestFactory().post(path, data, content_type='application/json', **headers))
+        if isinstance(response, Response):
+            response.render()
+        return response
+
+    def test_replay(self):
+        response = self.post()
+        replayed = self.post(data='invalid json')
+
+        self.assertEqual(replayed.status_code, 201)
+        self.assertEqual(replayed.content, response.content)
+        self.assertEqual(replayed['Location'], '/foo/')
+        self.assertEqual(replayed['Content-Type'], response['Content-Type'])
+        self.assertEqual(replayed['Idempotent-Replayed'], 'true')
+        self.assertFalse(response.has_header('Idempotent-Replayed'))
+        self.assertEqual(self.calls, [{'foo': 'bar'}])
+
+    def test_different_keys(self):
+        self.post(key='foo')
+        self.post(key='bar')
+        self.post(key='foo', path='/other/')
+        self.post(key=None)
+        self.post(key=None)
+
+        self.assertEqual(len(self.calls), 5)
+
+    def test_key_too_long(self):
+        self.assertEqual(self.post(key='a' * 256).status_code, 400)
+        self.assertEqual(self.calls, [])
+
+    def test_server_error_not_stored(self):
+        self.assertEqual(self.post(data='{"fail": true}').status_code, 503)
+        self.assertEqual(self.post().status_code, 201)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_unhandled_error_releases_key(self):
+        with mock.patch.object(self.view_class, 'post', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.post()
+
+        self.assertEqual(self.post().status_code, 201)
+
+    def test_concurrent_duplicates(self):
+        self.proceed.clear()
+        responses = []
+        thread = threading.Thread(target=lambda: responses.append(self.post()))
+        thread.start()
+        self.addCleanup(thread.join)
+        self.started.wait(5)
+
+        threading.Timer(0.05, self.proceed.set).start()
+        duplicate = self.post()
+        thread.join()
+
+        self.assertEqual(duplicate.status_code, 201)
+        self.assertEqual(duplicate.content, responses[0].content)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_concurrent_duplicates_conflict(self):
+        self.view_class.idempotency_wait_timeout = 0.01
+        self.proceed.clear()
+        thread = threading.Thread(target=self.post)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.proceed.set)
+        self.started.wait(5)
+
+        self.assertEqual(self.post().status_code, 409)
+
+    def test_concurrent_duplicates_after_failure(self):
+        self.proceed.clear()
+        responses = []
+        thread = threading.Thread(target=lambda: responses.append(self.post(data='{"fail": true}')))
+        thread.start()
+        self.addCleanup(thread.join)
+        self.started.wait(5)
+
+        threading.Timer(0.05, self.proceed.set).start()
+        duplicate = self.post()
+        thread.join()
+
+        self.assertEqual(responses[0].status_code, 503)
+        self.assertEqual(duplicate.status_code, 201)
+        self.assertEqual(self.calls, [{'fail': True}, {'foo': 'bar'}])
@@ -0,0 +1,140 @@
+from __future__ import absolute_import, print_function, unicode_literals
+import unittest
+from collections import OrderedDict
+
+import mock
+import six
+from hypothesis import given, strategies as st
+
+from .. import msgpackcodec
+from ..msgpackcodec import MsgPackError, Packer, Unpacker, packb, unpackb
+
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+values = st.recursive(
+    st.one_of(
+        st.none(),
+        st.booleans(),
+        st.floats(allow_nan=False),
+        st.text(),
+        st.binary(),
+        st.integers(min_value=-2 ** 63, max_value=2 ** 64 - 1),
+    ),
+    lambda children: st.lists(children) | st.dictionaries(st.text(), children).map(
+        lambda i: OrderedDict(sorted(i.items()))
+    ),
+)
+
+
+class TestPacker(unittest.TestCase):
+    def test_pack(self):
+        self.assertEqual(Packer().pack(None), b'\xc0')
+        self.assertEqual(Packer().pack([True, False]), b'\x92\xc3\xc2')
+        self.assertEqual(Packer().pack(OrderedDict([('a', 1)])), b'\x81\xa1a\x01')
+        self.assertEqual(Packer().pack(-1), b'\xff')
+        self.assertEqual(Packer().pack(-33), b'\xd0\xdf')
+        self.assertEqual(Packer().pack(256), b'\xcd\x01\x00')
+        self.assertEqual(Packer().pack(b'a'), b'\xc4\x01a')
+        self.assertEqual(Packer().pack('a' * 32), b'\xd9\x20' + b'a' * 32)
+        self.assertEqual(Packer().pack(1.5), b'\xcb?\xf8\x00\x00\x00\x00\x00\x00')
+
+    def test_pack_big_int(self):
+        packer = Packer(is_big_int=lambda i: i >= 1000)
+
+        self.assertEqual(packer.pack([999, 1000]), b'\x92\xcd\x03\xe7\xa41000')
+
+    def test_pack_default(self):
+        self.assertEqual(Packer(default=six.text_type).pack({1j}), b'\xa4{1j}')
+        with self.assertRaises(TypeError):
+            Packer().pack(1j)
+
+    def test_pack_overflow(self):
+        with self.assertRaises(MsgPackError):
+            Packer().pack(2 ** 64)
+
+    @unittest.skipIf(msgpack is None, 'msgpack is not installed')
+    @given(values)
+    def test_pack_equivalence(self, value):
+        self.assertEqual(Packer().pack(value), msgpack.packb(value, use_bin_type=True))
+
+
+class TestUnpacker(unittest.TestCase):
+    def test_unpack(self):
+        data = b'\x83\xa1a\x92\xc3\xc0\xa1b\xcb?\xf8\x00\x00\x00\x00\x00\x00\xa1c\x80'
+
+        actual = Unpacker(data).unpack()
+
+        self.assertEqual(actual, OrderedDict([('a', [True, None]), ('b', 1.5), ('c', OrderedDict())]))
+        self.assertIsInstance(actual, OrderedDict)
+
+    def test_unpack_object_pairs_hook(self):
+        self.assertIs(type(Unpacker(b'\x80', object_pairs_hook=dict).unpack()), dict)
+
+    def test_unpack_invalid(self):
+        for data in [b'',
+                     b'\x92\x01',
+                     b'\x01\x02',
+                     b'\xa2a',
+                     b'\xa1\xff',
+                     b'\xc1',
+                     b'\xd4\x01\x01',
+                     b'\x81\x90\x01',
+                     b'\xdd\xff\xff\xff\xff']:
+            with self.assertRaises(MsgPackError, msg=repr(data)):
+                Unpacker(data).unpack()
+
+    def test_unpack_max_depth(self):
+        Unpacker(b'\x91\x90', max_depth=2).unpack()
+        with self.assertRaises(MsgPackError):
+            Unpacker(b'\x91\x91\x90', max_depth=2).unpack()
+
+    def test_unpack_deep(self):
+        depth = 100000
+
+        self.assertEqual(len(Unpacker(b'\x91' * depth + b'\x90').unpack()), 1)
+
+    @given(values)
+    def test_round_trip(self, value):
+        self.assertEqual(Unpacker(Packer().pack(value)).unpack(), value)
+
+
+class TestMsgPackCodec(unittest.TestCase):
+    def test_packb_pure_python(self):
+        with mock.patch.object(msgpackcodec, 'msgpack', None):
+            self.assertEqual(packb([2 ** 64], is_big_int=lambda i: i > 10), b'\x91\xb418446744073709551616')
+
+    def test_unpackb_pure_python(self):
+        with mock.patch.object(msgpackcodec, 'msgpack', None):
+            self.assertEqual(unpackb(b'\x81\xa1a\x01'), OrderedDict([('a', 1)]))
+            with self.assertRaises(MsgPackError):
+                unpackb(b'\x81')
+
+    @unittest.skipIf(msgpack is None, 'msgpack is not installed')
+    def test_packb(self):
+        data = OrderedDict([('b', [2 ** 64, {1j}]), ('a', OrderedDict([(2 ** 64, 1)]))])
+
+        actual = packb(data, default=lambda o: [2 ** 64], is_big_int=lambda i: i > 10)
+
+        self.assertEqual(
+            unpackb(actual),
+            OrderedDict([
+                ('b', ['18446744073709551616', ['18446744073709551616']]),
+                ('a', OrderedDict([('18446744073709551616', 1)])),
+            ])
+        )
+        self.assertEqual(
+            actual,
+            Packer(default=lambda o: [2 ** 64], is_big_int=lambda i: i > 10).pack(data)
+        )
+
+    @unittest.skipIf(msgpack is None, 'msgpack is not installed')
+    def test_unpackb(self):
+        self.assertIsInstance(unpackb(b'\x81\xa1a\x01'), OrderedDict)
+        for data in [b'', b'\x01\x02', b'\xd4\x01\x01', b'\x81\x90\x01', b'\xa1\xff']:
+            with self.assertRaises(MsgPackError, msg=repr(data)):
+                unpackb(data)
@@ -1,12 +1,23 @@
 from __future__ import absolute_import, print_function, unicode_literals
+import gzip
 import json
+import sys
 import unittest
 from collections import OrderedDict
 
 import six
-from rest_framework import parsers
+import mock
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from rest_framework import exceptions, parsers
 
-from ..parsers import SortedJSONParser, StrippingJSONParser
+from ..parsers import (
+    MsgPackParser,
+    NDJSONParser,
+    SortedJSONParser,
+    StrippingJSONParser,
+)
+from ..utils import get_memory_usage
 
 
 class TestSortedJSONParser(unittest.TestCase):
@@ -33,6 +44,98 @@ class TestSortedJSONParser(unittest.TestCase):
         with self.assertRaises(parsers.ParseError):
             self.parser.parse(stream=stream)
 
+    def test_parser_streaming(self):
+        self.parser.streaming = True
+        self.parser.chunk_size = 4
+        content = json.dumps(OrderedDict([('hello', 'world'), ('foo', [1, 2])])).encode('utf-8')
+        stream = six.BytesIO(content)
+
+        actual_data = self.parser.parse(stream=stream)
+
+        self.assertEqual(actual_data, OrderedDict([('hello', 'world'), ('foo', [1, 2])]))
+        self.assertIsInstance(actual_data, OrderedDict)
+
+    def test_parser_streaming_limits(self):
+        self.parser.streaming = True
+        self.parser.max_depth = 1
+        stream = six.BytesIO(json.dumps({'hello': {'world': 1}}).encode('utf-8'))
+
+        with self.assertRaises(parsers.ParseError):
+            self.parser.parse(stream=stream)
+
+
+class TestSortedJSONParserCompact(unittest.TestCase):
+    def setUp(self):
+        super(TestSortedJSONParserCompact, self).setUp()
+        self.parser = SortedJSONParser()
+        self.parser.compact = True
+
+    def get_bulk_content(self, rows=10000):
+        return json.dumps({'rows': [
+            OrderedDict([
+                ('id', i),
+                ('first_name', 'John'),
+                ('last_name', 'Smith'),
+                ('email', 'john{}@example.com'.format(i)),
+                ('active', True),
+                ('amount', '12.50'),
+            ])
+            for i in range(rows)
+        ]}).encode('utf-8')
+
+    def test_parser(self):
+        for streaming in (False, True):
+            self.parser.streaming = streaming
+            content = json.dumps(OrderedDict([('b', {'d': 1, 'c': 2}), ('a', [])])).encode('utf-8')
+
+            actual_data = self.parser.parse(stream=six.BytesIO(content))
+
+            self.assertEqual(actual_data, {'b': {'d': 1, 'c': 2}, 'a': []})
+            self.assertEqual(list(actual_data), ['b', 'a'])
+            self.assertEqual(list(actual_data['b']), ['d', 'c'])
+            if sys.version_info >= (3, 7):
+                self.assertIs(type(actual_data), dict)
+            else:
+                self.assertIs(type(actual_data), OrderedDict)
+
+    def test_parser_interns_keys(self):
+        for streaming in (False, True):
+            self.parser.streaming = streaming
+
+            actual_data = self.parser.parse(stream=six.BytesIO(self.get_bulk_content(rows=2)))
+
+            for a, b in zip(actual_data['rows'][0], actual_data['rows'][1]):
+                self.assertIs(a, b)
+
+    def test_parser_json_backend(self):
+        self.parser.json_backend = 'drf_braces.jsonbackends.OrjsonJSONBackend'
+        content = json.dumps({'hello': 12345678901234567890123}).encode('utf-8')
+
+        try:
+            actual_data = self.parser.parse(stream=six.BytesIO(content))
+        except ImproperlyConfigured:
+            self.skipTest('Requires orjson')
+
+        self.assertEqual(actual_data, {'hello': 12345678901234567890123})
+
+    def test_parser_memory(self):
+        if sys.version_info < (3, 7):
+            self.skipTest('Requires insertion-ordered dicts')
+
+        content = self.get_bulk_content()
+
+        for streaming in (False, True):
+            self.parser.streaming = streaming
+            default_parser = SortedJSONParser()
+            default_parser.streaming = streaming
+
+            expected, default_usage = get_memory_usage(default_parser.parse, six.BytesIO(content))
+            actual, compact_usage = get_memory_usage(self.parser.parse, six.BytesIO(content))
+
+            self.assertEqual(actual, expected)
+            # objects are roughly half the size of OrderedDict
+            self.assertLess(compact_usage.retained, default_usage.retained * 0.75)
+
 
 class TestStrippingJSONParser(unittest.TestCase):
     def setUp(self):
@@ -71,3 +174,248 @@ class TestStrippingJSONParser(unittest.TestCase):
         )
 
         self.assertEqual(actual_data, {'root': {'hello': 'world'}})
+
+    def test_parser_different_root_no_fallback(self):
+        self.parser.fallback_to_document = False
+        content = json.dumps({'root': {'hello': 'world'}}).encode('utf-8')
+
+        for streaming in [False, True]:
+            self.parser.streaming = streaming
+            with self.assertRaises(parsers.ParseError):
+                self.parser.parse(
+                    stream=six.BytesIO(content),
+                    parser_context={'parse_root': 'foo'}
+                )
+
+    def test_parser_dotted_root(self):
+        content = json.dumps({'envelope.root': {'hello': 'world'}}).encode('utf-8')
+
+        actual_data = self.parser.parse(
+            stream=six.BytesIO(content),
+            parser_context={'parse_root': 'envelope.root'}
+        )
+
+        self.assertEqual(actual_data, OrderedDict([('hello', 'world')]))
+
+    def test_parser_nested_root(self):
+        content = json.dumps(OrderedDict([
+            ('audit', ['x' * 100]),
+            ('envelope', {'root': {'hello': 'world'}, 'attachments': [{}]}),
+            ('root', {'hello': 'other'}),
+        ])).encode('utf-8')
+
+        for streaming in [False, True]:
+            self.parser.streaming = streaming
+            actual_data = self.parser.parse(
+                stream=six.BytesIO(content),
+                parser_context={'parse_root': ['envelope', 'root']}
+            )
+
+            self.assertEqual(actual_data, OrderedDict([('hello', 'world')]))
+            self.assertIsInstance(actual_data, OrderedDict)
+
+    def test_parser_nested_root_missing(self):
+        content = json.dumps({'root': {'hello': 'world'}}).encode('utf-8')
+
+        for streaming in [False, True]:
+            self.parser.streaming = streaming
+            actual_data = self.parser.parse(
+                stream=six.BytesIO(content),
+                parser_context={'parse_root': ['root', 'foo']}
+            )
+
+            self.assertEqual(actual_data, {'root': {'hello': 'world'}})
+
+    def test_parser_json_backend(self):
+        content = b'{"audit": [1, {"a": 2}], "root": {"hello": "world"}}'
+
+        with mock.patch.object(self.parser, 'get_json_backend') as get_json_backend:
+            actual_data = self.parser.parse(six.BytesIO(content), parser_context={'parse_root': 'root'})
+
+        loads = get_json_backend.return_value.loads
+        self.assertIs(actual_data, loads.return_value)
+        loads.assert_called_once_with('{"hello": "world"}', object_pairs_hook=OrderedDict)
+
+    def test_parser_siblings_not_retained(self):
+        if sys.version_info < (3, 4):
+            self.skipTest('Requires tracemalloc')
+
+        self.parser.streaming = True
+        self.parser.fallback_to_document = False
+        audit = ['x' * 100] * 40000
+        content = json.dumps(OrderedDict([('audit', audit), ('root', {'hello': 'world'})])).encode('utf-8')
+
+        actual_data, usage = get_memory_usage(
+            self.parser.parse, six.BytesIO(content), parser_context={'parse_root': 'root'}
+        )
+
+        self.assertEqual(actual_data, OrderedDict([('hello', 'world')]))
+        self.assertLess(usage.peak, len(content) / 2)
+
+    def test_parser_no_context(self):
+        content = json.dumps({'root': {'hello': 'world'}}).encode('utf-8')
+        stream = six.BytesIO(content)
+
+        actual_data = self.parser.parse(stream=stream)
+
+        self.assertEqual(actual_data, {'root': {'hello': 'world'}})
+
+    def test_parser_invalid_json(self):
+        for content in [b'{"root": {"hello": "world"}, "audit": [1,]}',
+                        b'{"root": {"hello": "world"}} []',
+                        b'{"root" {"hello": "world"}}']:
+            for streaming in [False, True]:
+                self.parser.streaming = streaming
+                with self.assertRaises(parsers.ParseError):
+                    self.parser.parse(
+                        stream=six.BytesIO(content),
+                        parser_context={'parse_root': 'root'}
+                    )
+
+
+class TestNDJSONParser(unittest.TestCase):
+    def setUp(self):
+        super(TestNDJSONParser, self).setUp()
+        self.parser = NDJSONParser()
+        self.parser.chunk_size = 4
+
+    def test_parser(self):
+        stream = six.BytesIO('{"b": 1, "a": "é"}\r\n\n[1, 2]\n"foo"'.encode('utf-8'))
+
+        actual_data = self.parser.parse(stream=stream)
+
+        self.assertNotIsInstance(actual_data, (list, dict))
+        actual_data = list(actual_data)
+        self.assertEqual(actual_data, [{'b': 1, 'a': 'é'}, [1, 2], 'foo'])
+        self.assertIsInstance(actual_data[0], OrderedDict)
+        self.assertEqual(list(actual_data[0]), ['b', 'a'])
+
+    def test_parser_lazy(self):
+        content = b''.join([b'{"id": 1}\n'] * 100)
+        stream = six.BytesIO(content)
+
+        actual_data = self.parser.parse(stream=stream)
+
+        self.assertEqual(stream.tell(), 0)
+        self.assertEqual(next(actual_data), {'id': 1})
+        self.assertLess(stream.tell(), 20)
+
+    def test_parser_invalid_json(self):
+        stream = six.BytesIO(b'{"id": 1}\n{"id": \n{"id": 3}\n')
+
+        actual_data = self.parser.parse(stream=stream)
+
+        self.assertEqual(next(actual_data), {'id': 1})
+        with self.assertRaises(parsers.ParseError) as e:
+            next(actual_data)
+        self.assertIn('line 2', six.text_type(e.exception.detail))
+
+    def test_parser_max_line_size(self):
+        self.parser.max_line_size = 10
+        stream = six.BytesIO(b'{"id": 1}\n{"id": "' + b'x' * 100 + b'"}\n')
+
+        actual_data = self.parser.parse(stream=stream)
+
+        self.assertEqual(next(actual_data), {'id': 1})
+        with self.assertRaises(parsers.ParseError):
+            next(actual_data)
+
+
+class TestMsgPackParser(unittest.TestCase):
+    def setUp(self):
+        super(TestMsgPackParser, self).setUp()
+        self.parser = MsgPackParser()
+
+    def test_parser(self):
+        stream = six.BytesIO(b'\x82\xa1b\x01\xa1a\x92\xa2\xc3\xa9\xc0')
+
+        actual_data = self.parser.parse(stream=stream)
+
+        self.assertEqual(actual_data, {'b': 1, 'a': ['é', None]})
+        self.assertIsInstance(actual_data, OrderedDict)
+        self.assertEqual(list(actual_data), ['b', 'a'])
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'dicts are not ordered')
+    def test_parser_compact(self):
+        self.parser.compact = True
+
+        actual_data = self.parser.parse(stream=six.BytesIO(b'\x81\xa1a\x80'))
+
+        self.assertIs(type(actual_data), dict)
+        self.assertIs(type(actual_data['a']), dict)
+
+    def test_parser_invalid(self):
+        with self.assertRaises(parsers.ParseError):
+            self.parser.parse(stream=six.BytesIO(b'\x82\xa1b\x01'))
+
+    def test_parser_limits(self):
+        self.parser.max_size = 3
+        self.assertEqual(self.parser.parse(stream=six.BytesIO(b'\x92\x01\x02')), [1, 2])
+        with self.assertRaises(parsers.ParseError):
+            self.parser.parse(stream=six.BytesIO(b'\x93\x01\x02\x03'))
+
+        self.parser.max_depth = 1
+        with self.assertRaises(parsers.ParseError):
+            self.parser.parse(stream=six.BytesIO(b'\x91\x90'))
+
+
+class TestDecompressingParserMixin(unittest.TestCase):
+    def get_context(self, content_encoding='gzip'):
+        request = mock.Mock(META={'HTTP_CONTENT_ENCODING': content_encoding})
+        return {'request': request}
+
+    def compress(self, data):
+        stream = six.BytesIO()
+        with gzip.GzipFile(fileobj=stream, mode='wb') as f:
+            f.write(data)
+        return six.BytesIO(stream.getvalue())
+
+    def test_parsers(self):
+        for parser, data, expected in [
+            (SortedJSONParser(), b'{"b": 1, "a": 2}', {'b': 1, 'a': 2}),
+            (StrippingJSONParser(), b'{"b": 1, "a": 2}', {'b': 1, 'a': 2}),
+            (NDJSONParser(), b'{"a": 1}\n{"a": 2}\n', [{'a': 1}, {'a': 2}]),
+            (MsgPackParser(), b'\x92\x01\x02', [1, 2]),
+        ]:
+            actual = parser.parse(self.compress(data), parser_context=self.get_context())
+            if isinstance(parser, NDJSONParser):
+                actual = list(actual)
+            self.assertEqual(actual, expected, msg=parser)
+
+    def test_parse_root(self):
+        context = self.get_context()
+        context['parse_root'] = 'a'
+
+        actual = StrippingJSONParser().parse(self.compress(b'{"b": 1, "a": 2}'), parser_context=context)
+
+        self.assertEqual(actual, 2)
+
+    def test_streaming(self):
+        parser = SortedJSONParser()
+        parser.streaming = True
+        parser.chunk_size = 4
+
+        actual = parser.parse(self.compress(b'{"b": 1, "a": [1, 2, 3]}'), parser_context=self.get_context())
+
+        self.assertEqual(actual, {'b': 1, 'a': [1, 2, 3]})
+
+    def test_invalid(self):
+        for parser in [SortedJSONParser(), MsgPackParser()]:
+            with self.assertRaises(parsers.ParseError, msg=parser):
+                parser.parse(six.BytesIO(b'{}'), parser_context=self.get_context())
+
+    @override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=100)
+    def test_max_decompressed_size(self):
+        stream = self.compress(b'[' + b'1, ' * 100 + b'1]')
+
+        with self.assertRaises(parsers.ParseError):
+            SortedJSONParser().parse(stream, parser_context=self.get_context())
+
+        parser = SortedJSONParser()
+        parser.max_decompressed_size = 1000
+        stream.seek(0)
+        self.assertEqual(len(parser.parse(stream, parser_context=self.get_context())), 101)
+
+    def test_unsupported(self):
+        with self.assertRaises(exceptions.UnsupportedMediaType):
+            SortedJSONParser().parse(six.BytesIO(b'{}'), parser_context=self.get_context('br'))
@@ -0,0 +1,130 @@
+from __future__ import absolute_import, print_function, unicode_literals
+import unittest
+
+from django.contrib.auth.models import Permission, User
+from django.contrib.contenttypes.models import ContentType
+from rest_framework import serializers
+
+from ..querysets import (
+    RelatedLookups,
+    get_cached_related_lookups,
+    get_related_lookups,
+    optimize_queryset,
+)
+from ..serializers.swapping import SwappingSerializerMixin
+
+
+class ContentTypeSerializer(serializers.ModelSerializer):
+    class Meta(object):
+        model = ContentType
+        fields = ['app_label', 'model']
+
+
+class ContentTypePermissionsSerializer(serializers.ModelSerializer):
+    permission_set = serializers.StringRelatedField(many=True)
+
+    class Meta(object):
+        model = ContentType
+        fields = ['model', 'permission_set']
+
+
+class PermissionSerializer(serializers.ModelSerializer):
+    content_type = ContentTypeSerializer()
+    app_label = serializers.CharField(source='content_type.app_label')
+    group_names = serializers.StringRelatedField(source='group_set', many=True)
+
+    class Meta(object):
+        model = Permission
+        fields = ['codename', 'content_type', 'app_label', 'group_names']
+
+
+class GroupSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    permissions = PermissionSerializer(many=True)
+
+
+class UserSerializer(serializers.ModelSerializer):
+    groups = GroupSerializer(many=True)
+    full_name = serializers.CharField(source='get_full_name')
+    password = serializers.CharField(write_only=True)
+
+    class Meta(object):
+        model = User
+        fields = ['username', 'full_name', 'password', 'groups', 'user_permissions']
+
+
+class TestGetRelatedLookups(unittest.TestCase):
+    def test_model_serializer(self):
+        actual = get_related_lookups(PermissionSerializer(), Permission)
+
+        self.assertEqual(actual, RelatedLookups(['content_type'], ['group_set']))
+
+    def test_only(self):
+        actual = get_related_lookups(PermissionSerializer(), Permission, only=True)
+
+        self.assertEqual(actual.only, [
+            'codename',
+            'content_type',
+            'content_type__app_label',
+            'content_type__model',
+        ])
+
+    def test_only_unknown(self):
+        class Serializer(serializers.Serializer):
+            codename = serializers.CharField()
+            name = serializers.CharField(source='__str__')
+
+        self.assertIsNone(get_related_lookups(Serializer(), Permission, only=True).only)
+
+    def test_nested(self):
+        actual = get_related_lookups(UserSerializer(many=True), User)
+
+        self.assertEqual(actual, RelatedLookups([], [
+            'groups',
+            'groups__permissions',
+            'groups__permissions__content_type',
+            'groups__permissions__group_set',
+            'user_permissions',
+        ]))
+
+    def test_pk_only(self):
+        class Serializer(serializers.Serializer):
+            content_type = serializers.PrimaryKeyRelatedField(read_only=True)
+            content_type_id = serializers.PrimaryKeyRelatedField(source='content_type.pk', read_only=True)
+
+        actual = get_related_lookups(Serializer(), Permission)
+
+        self.assertEqual(actual, RelatedLookups(['content_type'], []))
+
+    def test_swapped(self):
+        class Serializer(SwappingSerializerMixin, PermissionSerializer):
+            class Meta(PermissionSerializer.Meta):
+                swappable_fields = {
+                    ContentTypeSerializer: ContentTypePermissionsSerializer,
+                }
+
+        actual = get_related_lookups(Serializer(), Permission)
+
+        self.assertEqual(actual, RelatedLookups(['content_type'], ['content_type__permission_set', 'group_set']))
+
+    def test_get_cached_related_lookups(self):
+        class Serializer(PermissionSerializer):
+            pass
+
+        first = get_cached_related_lookups(Serializer, Permission, Serializer)
+        second = get_cached_related_lookups(Serializer, Permission, None)
+        sparse = get_cached_related_lookups(Serializer, Permission, Serializer, {'codename': None})
+
+        self.assertIs(first, second)
+        self.assertIsNone(first.only)
+        self.assertIsNot(sparse, first)
+        self.assertIsNotNone(sparse.only)
+
+    def test_optimize_queryset(self):
+        queryset = optimize_queryset(
+            Permission.objects.all(), RelatedLookups(['content_type'], ['group_set'], ['codename', 'content_type'])
+        )
+
+        self.assertEqual(queryset.query.select_related, {'content_type': {}})
+        self.assertEqual(queryset._prefetch_related_lookups, ('group_set',))
+        self.assertEqual(queryset.query.deferred_loading, ({'codename', 'content_type'}, False))
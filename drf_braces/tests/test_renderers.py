@@ -3,8 +3,36 @@ from __future__ import absolute_import, print_function, unicode_literals
 import datetime
 import json
 import unittest
+from collections import OrderedDict
 
-from ..renderers import DoubleAsStrJsonEncoder
+import mock
+import six
+from hypothesis import given, strategies as st
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from ..fields.custom import RawJSONField
+from ..jsonbackends import OrjsonJSONBackend, RawJSON, StdlibJSONBackend
+from ..msgpackcodec import unpackb
+from ..parsers import MsgPackParser
+from ..renderers import (
+    ANY,
+    SCAN,
+    DerivedPlan,
+    DoubleAsStrJsonEncoder,
+    DoubleAsStrJsonRenderer,
+    MsgPackRenderer,
+    StreamingDoubleAsStrJsonRenderer,
+    StreamingWrappingDoubleAsStrJsonRenderer,
+    WrappingJSONRenderer,
+    apply_plan,
+    get_data_plan,
+    get_field_plan,
+    get_serializer_plan,
+)
 
 
 class TestDoubleAsStrJsonEncoder(unittest.TestCase):
@@ -21,3 +49,460 @@ class TestDoubleAsStrJsonEncoder(unittest.TestCase):
                 'c': '2010-01-02',
             }
         )
+
+    def test_encode_boundaries(self):
+        data = [10 ** 14 - 1, 10 ** 14, -10 ** 13 + 1, -10 ** 13, True, False, 1.5e20]
+
+        self.assertEqual(
+            DoubleAsStrJsonEncoder().encode(data),
+            '[99999999999999, "100000000000000", -9999999999999, "-10000000000000", true, false, 1.5e+20]',
+        )
+
+    def test_encode_natively(self):
+        data = ReturnDict([
+            ('a', ReturnList([10 ** 15], serializer=None)),
+            ('b', (i for i in [1, 10 ** 15])),
+            ('c', (10 ** 15,)),
+        ], serializer=None)
+
+        self.assertEqual(
+            DoubleAsStrJsonEncoder(separators=(',', ':')).encode(data),
+            '{"a":["1000000000000000"],"b":[1,"1000000000000000"],"c":["1000000000000000"]}',
+        )
+
+    def test_encode_keys(self):
+        data = OrderedDict([(10 ** 15, 1), (True, 2), (None, 3), (1.5, 4)])
+
+        self.assertEqual(
+            DoubleAsStrJsonEncoder().encode(data),
+            json.dumps(data),
+        )
+        with self.assertRaises(TypeError):
+            DoubleAsStrJsonEncoder().encode({(1,): 1})
+        self.assertEqual(DoubleAsStrJsonEncoder(skipkeys=True).encode({(1,): 1, 'a': 2}), '{"a": 2}')
+
+    def test_encode_invalid(self):
+        data = []
+        data.append(data)
+
+        with self.assertRaises(ValueError):
+            DoubleAsStrJsonEncoder().encode(data)
+        with self.assertRaises(ValueError):
+            DoubleAsStrJsonEncoder(allow_nan=False).encode([float('nan')])
+        with self.assertRaises(TypeError):
+            DoubleAsStrJsonEncoder().encode([object()])
+
+    def test_iterencode(self):
+        chunks = list(DoubleAsStrJsonEncoder(separators=(',', ':')).iterencode([{'a': 1}, [10 ** 15]]))
+
+        self.assertEqual(chunks, ['[', '{"a":1}', ',', '["1000000000000000"]', ']'])
+
+    def test_transform(self):
+        self.assertEqual(
+            DoubleAsStrJsonEncoder().transform({'a': [10 ** 15, True], 'b': (i for i in [-10 ** 13])}),
+            {'a': ['1000000000000000', True], 'b': ['-10000000000000']},
+        )
+
+    @given(value=st.recursive(
+        st.none() | st.booleans() | st.integers() | st.text() | st.floats(),
+        lambda children: st.lists(children, max_size=5) | st.dictionaries(
+            st.text(max_size=5) | st.integers(), children, max_size=5
+        ),
+        max_leaves=20,
+    ), options=st.fixed_dictionaries({
+        'indent': st.sampled_from([None, 0, 2, '\t']),
+        'sort_keys': st.booleans(),
+        'ensure_ascii': st.booleans(),
+    }))
+    def test_encode_equivalence(self, value, options):
+        def transform(o):
+            if isinstance(o, dict):
+                return {k: transform(v) for k, v in o.items()}
+            elif isinstance(o, list):
+                return [transform(i) for i in o]
+            elif isinstance(o, six.integer_types) and len(six.text_type(o)) >= 15:
+                return six.text_type(o)
+            return o
+
+        try:
+            expected = json.JSONEncoder(**options).encode(transform(value))
+        except TypeError:
+            # keys of different types cannot be sorted
+            with self.assertRaises(TypeError):
+                DoubleAsStrJsonEncoder(**options).encode(value)
+        else:
+            self.assertEqual(DoubleAsStrJsonEncoder(**options).encode(value), expected)
+
+
+class TestDoubleAsStrJsonRenderer(unittest.TestCase):
+    def setUp(self):
+        super(TestDoubleAsStrJsonRenderer, self).setUp()
+        self.renderer = DoubleAsStrJsonRenderer()
+
+    def test_render(self):
+        actual = self.renderer.render({'a': 12345678901234567890, 'b': ' '})
+
+        self.assertEqual(actual, b'{"a":"12345678901234567890","b":"\\u2028"}')
+
+    def test_render_none(self):
+        self.assertEqual(self.renderer.render(None), b'')
+
+    def test_render_indent(self):
+        actual = self.renderer.render(
+            {'a': 1}, accepted_media_type='application/json; indent=2'
+        )
+
+        self.assertEqual(actual, b'{\n  "a": 1\n}')
+
+    def test_render_json_backend(self):
+        self.renderer.json_backend = 'drf_braces.tests.test_renderers.Backend'
+
+        self.assertEqual(self.renderer.render({'a': 1}), b'rendered')
+
+
+class TestStreamingDoubleAsStrJsonRenderer(unittest.TestCase):
+    def setUp(self):
+        super(TestStreamingDoubleAsStrJsonRenderer, self).setUp()
+        self.renderer = StreamingDoubleAsStrJsonRenderer()
+        self.renderer.chunk_size = 20
+
+    def test_render(self):
+        data = [{'a': 12345678901234567890, 'b': '\u2028é'}] * 5
+
+        chunks = list(self.renderer.render(data))
+
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(isinstance(i, bytes) for i in chunks))
+        self.assertEqual(b''.join(chunks), DoubleAsStrJsonRenderer().render(data))
+
+    def test_render_indent(self):
+        data = {'a': [1, 2]}
+
+        chunks = self.renderer.render(data, accepted_media_type='application/json; indent=4')
+
+        self.assertEqual(
+            b''.join(chunks),
+            DoubleAsStrJsonRenderer().render(data, accepted_media_type='application/json; indent=4'),
+        )
+
+    def test_render_none(self):
+        self.assertEqual(list(self.renderer.render(None)), [])
+
+    def test_render_lazy(self):
+        consumed = []
+
+        def rows():
+            for i in range(100):
+                consumed.append(i)
+                yield {'id': i}
+
+        chunks = self.renderer.render(rows())
+
+        first = next(chunks)
+
+        self.assertEqual(first, b'[{"id":0},{"id":1},{"id":2}')
+        self.assertEqual(consumed, [0, 1, 2])
+        self.assertEqual(
+            json.loads((first + b''.join(chunks)).decode('utf-8')),
+            [{'id': i} for i in range(100)],
+        )
+
+
+class Backend(StdlibJSONBackend):
+    def dumps(self, *args, **kwargs):
+        return b'rendered'
+
+
+class PlanChildSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class PlanSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    created = serializers.DateTimeField()
+    password = serializers.IntegerField(write_only=True)
+    choice = serializers.ChoiceField(choices=[(10 ** 15, 'big')])
+    child = PlanChildSerializer()
+    children = PlanChildSerializer(many=True)
+    names = serializers.ListField(child=serializers.CharField())
+    numbers = serializers.ListField(child=serializers.IntegerField())
+    mapping = serializers.DictField(child=serializers.IntegerField())
+    method = serializers.SerializerMethodField()
+
+    def get_method(self, obj):
+        return {'big': [10 ** 15]}
+
+
+class DeclaredPlanSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    other = serializers.IntegerField()
+    children = PlanChildSerializer(many=True)
+
+    class Meta:
+        double_as_str_fields = ['id', 'children.*.id']
+
+
+class TestSerializerPlan(unittest.TestCase):
+    def get_instance(self, big=10 ** 15):
+        return {
+            'id': big,
+            'name': 'foo',
+            'created': datetime.datetime(2010, 1, 2),
+            'password': big,
+            'choice': big,
+            'child': {'id': big, 'name': 'bar'},
+            'children': [{'id': 1, 'name': 'a'}, {'id': big, 'name': 'b'}],
+            'names': ['a'],
+            'numbers': [1, big, -big],
+            'mapping': {'a': big, 'b': 1},
+            'other': big,
+        }
+
+    def test_get_serializer_plan(self):
+        self.assertEqual(get_serializer_plan(PlanSerializer()), {
+            'id': True,
+            'name': None,
+            'created': None,
+            'choice': True,
+            'child': {'id': True, 'name': None},
+            'children': {ANY: {'id': True, 'name': None}},
+            'names': None,
+            'numbers': {ANY: True},
+            'mapping': {ANY: True},
+            'method': SCAN,
+        })
+        self.assertEqual(get_serializer_plan(PlanSerializer(many=True)), {ANY: get_serializer_plan(PlanSerializer())})
+
+    def test_get_serializer_plan_declared(self):
+        self.assertEqual(get_serializer_plan(DeclaredPlanSerializer()), {
+            'id': True,
+            'children': {ANY: {'id': True}},
+        })
+
+    def test_get_serializer_plan_custom(self):
+        class Field(serializers.CharField):
+            def to_representation(self, value):
+                return value
+
+        class Serializer(PlanChildSerializer):
+            def to_representation(self, instance):
+                return instance
+
+        self.assertEqual(get_field_plan(Field()), SCAN)
+        self.assertEqual(get_field_plan(serializers.ReadOnlyField()), SCAN)
+        self.assertEqual(get_serializer_plan(Serializer()), SCAN)
+        self.assertIsNone(get_field_plan(serializers.CharField()))
+
+    def test_get_data_plan(self):
+        data = PlanChildSerializer([{'id': 1, 'name': 'a'}], many=True).data
+
+        self.assertEqual(get_data_plan(data), {ANY: {'id': True, 'name': None}})
+        self.assertEqual(get_data_plan(OrderedDict([('count', 1), ('next', None), ('results', data)])), {
+            'count': SCAN,
+            'results': {ANY: {'id': True, 'name': None}},
+        })
+        self.assertIsNone(get_data_plan({'a': 1}))
+        self.assertIsNone(get_data_plan([1]))
+
+    def test_apply_plan(self):
+        data = {'a': [{'b': 1, 'c': 10 ** 15}], 'd': 10 ** 15}
+
+        self.assertIs(apply_plan(data, {'a': {ANY: {'b': True}}}, DoubleAsStrJsonEncoder()), data)
+        self.assertEqual(
+            apply_plan(data, {'a': {ANY: {'c': True}}, 'x': True}, DoubleAsStrJsonEncoder()),
+            {'a': [{'b': 1, 'c': '1000000000000000'}], 'd': 10 ** 15},
+        )
+        self.assertEqual(data, {'a': [{'b': 1, 'c': 10 ** 15}], 'd': 10 ** 15})
+
+    def test_apply_plan_derived(self):
+        data = {'a': 10 ** 15, 'b': 10 ** 15, 'c': {'d': [10 ** 15]}}
+
+        self.assertEqual(
+            apply_plan(data, DerivedPlan(a=None, b=True), DoubleAsStrJsonEncoder()),
+            {'a': 10 ** 15, 'b': '1000000000000000', 'c': {'d': ['1000000000000000']}},
+        )
+
+    def test_render(self):
+        renderer = DoubleAsStrJsonRenderer()
+        scanning_renderer = DoubleAsStrJsonRenderer()
+        scanning_renderer.use_serializer_plan = False
+
+        for data in [PlanSerializer(self.get_instance()).data,
+                     PlanSerializer([self.get_instance(), self.get_instance(big=1)], many=True).data,
+                     {'count': 10 ** 15, 'results': PlanSerializer([self.get_instance()], many=True).data}]:
+            self.assertEqual(renderer.render(data), scanning_renderer.render(data))
+
+    def test_render_modified_data(self):
+        data = PlanSerializer(self.get_instance()).data
+        data['total'] = 10 ** 16
+        data['child']['extra'] = [10 ** 16]
+
+        rendered = json.loads(DoubleAsStrJsonRenderer().render(data).decode('utf-8'))
+
+        self.assertEqual(rendered['total'], '10000000000000000')
+        self.assertEqual(rendered['child']['extra'], ['10000000000000000'])
+
+    def test_render_declared(self):
+        data = DeclaredPlanSerializer(self.get_instance()).data
+
+        self.assertEqual(json.loads(DoubleAsStrJsonRenderer().render(data).decode('utf-8')), {
+            'id': '1000000000000000',
+            'other': 10 ** 15,
+            'children': [{'id': 1, 'name': 'a'}, {'id': '1000000000000000', 'name': 'b'}],
+        })
+
+
+class RawJSONSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    payload = RawJSONField()
+
+
+class TestRawJSON(unittest.TestCase):
+    def setUp(self):
+        super(TestRawJSON, self).setUp()
+        self.payload = '{"b":  [1, 12345678901234567890], "a": "\\u0000 \u2028"}'
+        self.data = RawJSONSerializer({'id': 10 ** 15, 'payload': self.payload}).data
+        self.expected = (
+            '{"id":"1000000000000000","payload":' + self.payload.replace('\u2028', '\\u2028') + '}'
+        ).encode('utf-8')
+
+    def test_encode(self):
+        self.assertEqual(
+            DoubleAsStrJsonEncoder(separators=(',', ':')).encode([RawJSON(b'[1]'), RawJSON('{}')]),
+            '[[1],{}]',
+        )
+
+    def test_render(self):
+        renderer = DoubleAsStrJsonRenderer()
+
+        self.assertEqual(renderer.render(self.data), self.expected)
+
+        renderer.use_serializer_plan = False
+        self.assertEqual(renderer.render(self.data), self.expected)
+
+    def test_render_orjson(self):
+        renderer = DoubleAsStrJsonRenderer()
+        renderer.json_backend = 'drf_braces.jsonbackends.OrjsonJSONBackend'
+
+        try:
+            OrjsonJSONBackend()
+        except ImportError:
+            self.skipTest('Requires orjson')
+
+        self.assertEqual(renderer.render(self.data), self.expected)
+
+    def test_render_streaming(self):
+        chunks = StreamingDoubleAsStrJsonRenderer().render(self.data)
+
+        self.assertEqual(b''.join(chunks), self.expected)
+
+    def test_render_placeholder_in_data(self):
+        data = {'a': '\x00' + 'f' * 32 + '-0', 'b': RawJSON('[1]')}
+
+        self.assertEqual(
+            json.loads(DoubleAsStrJsonRenderer().render(data).decode('utf-8')),
+            {'a': '\x00' + 'f' * 32 + '-0', 'b': [1]},
+        )
+
+
+class TestWrappingJSONRenderer(unittest.TestCase):
+    def setUp(self):
+        super(TestWrappingJSONRenderer, self).setUp()
+        self.renderer = WrappingJSONRenderer()
+        self.view = mock.Mock(parser_root=['a', 'b'])
+        self.context = {'view': self.view, 'response': mock.Mock(exception=False)}
+
+    def test_render(self):
+        content = self.renderer.render({'c': 1}, 'application/json', self.context)
+
+        self.assertEqual(content, b'{"a":{"b":{"c":1}}}')
+
+    def test_render_root_list(self):
+        self.view.parser_root = ['a', 'b.c']
+
+        content = self.renderer.render([1], 'application/json', self.context)
+
+        self.assertEqual(json.loads(content.decode('utf-8')), {'a': {'b.c': [1]}})
+
+    def test_render_unicode_root(self):
+        self.view.parser_root = '\u2028'
+        self.renderer.ensure_ascii = False
+
+        content = self.renderer.render(1, 'application/json', self.context)
+
+        self.assertEqual(content, b'{"\\u2028":1}')
+
+    def test_render_not_wrapped(self):
+        self.view.parser_root = None
+        self.assertEqual(self.renderer.render({'c': 1}, 'application/json', self.context), b'{"c":1}')
+
+        self.view.parser_root = 'a'
+        self.assertEqual(self.renderer.render(None, 'application/json', self.context), b'')
+
+        self.context['response'].exception = True
+        self.assertEqual(
+            self.renderer.render({'detail': 'error'}, 'application/json', self.context),
+            b'{"detail":"error"}'
+        )
+
+    def test_render_indent(self):
+        content = self.renderer.render({'c': 1}, 'application/json; indent=2', self.context)
+
+        self.assertEqual(content, json.dumps({'a': {'b': {'c': 1}}}, indent=2).encode('utf-8'))
+
+    def test_render_raw_json(self):
+        data = RawJSONSerializer({'id': 1, 'payload': '{"d":  [1]}'}).data
+
+        content = self.renderer.render(data, 'application/json', self.context)
+
+        self.assertEqual(content, b'{"a":{"b":{"id":1,"payload":{"d":  [1]}}}}')
+
+    def test_render_streaming(self):
+        renderer = StreamingWrappingDoubleAsStrJsonRenderer()
+
+        content = b''.join(renderer.render(
+            OrderedDict([('c', 12345678901234567890), ('d', [1, 2])]),
+            'application/json; double=str',
+            self.context,
+        ))
+
+        self.assertEqual(content, b'{"a":{"b":{"c":"12345678901234567890","d":[1,2]}}}')
+
+
+class TestMsgPackRenderer(unittest.TestCase):
+    def test_render(self):
+        data = OrderedDict([
+            ('b', 12345678901234567890),
+            ('a', [123, datetime.date(2010, 1, 2), RawJSON('{"c": 1e3}')]),
+        ])
+
+        content = MsgPackRenderer().render(data)
+
+        self.assertEqual(
+            unpackb(content),
+            OrderedDict([('b', '12345678901234567890'), ('a', [123, '2010-01-02', {'c': 1000.0}])])
+        )
+
+    def test_render_none(self):
+        self.assertEqual(MsgPackRenderer().render(None), b'')
+
+    def test_content_negotiation(self):
+        class View(APIView):
+            parser_classes = (MsgPackParser,)
+            renderer_classes = (DoubleAsStrJsonRenderer, MsgPackRenderer)
+
+            def post(self, request):
+                return Response(request.data)
+
+        request = APIRequestFactory().post(
+            '/', b'\x81\xa1a\xcf\x00\x00\x00\x00\xff\xff\xff\xff',
+            content_type='application/msgpack', HTTP_ACCEPT='application/msgpack',
+        )
+
+        response = View.as_view()(request)
+        response.render()
+
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(unpackb(response.content), {'a': 4294967295})
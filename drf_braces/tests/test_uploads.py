@@ -0,0 +1,165 @@
+from __future__ import absolute_import, print_function, unicode_literals
+import struct
+import unittest
+
+import mock
+from django.core.files.uploadhandler import SkipFile
+
+from ..uploads import (
+    StreamingUploadValidator,
+    StreamingValidationUploadHandler,
+    UploadRejected,
+    get_image_dimensions,
+    sniff_content_type,
+)
+
+
+def png_header(width=10, height=20):
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n\x00\x00\x00\x0dIHDR',
+        struct.pack(str('>II'), width, height),
+        b'\x08\x02\x00\x00\x00',
+    ])
+
+
+def gif_header(width=10, height=20):
+    return b'GIF89a' + struct.pack(str('<HH'), width, height) + b'\x00' * 10
+
+
+def jpeg_header(width=10, height=20):
+    app0 = b'\xff\xe0' + struct.pack(str('>H'), 16) + b'JFIF\x00' + b'\x00' * 9
+    sof = b'\xff\xc0' + struct.pack(str('>HBHH'), 17, 8, height, width) + b'\x00' * 10
+    return b'\xff\xd8' + app0 + sof
+
+
+def bmp_header(width=10, height=20):
+    return b'BM' + b'\x00' * 12 + struct.pack(str('<Iii'), 40, width, -height) + b'\x00' * 10
+
+
+def webp_header(width=10, height=20):
+    return b''.join([
+        b'RIFF\x00\x00\x00\x00WEBPVP8X',
+        b'\x00' * 8,
+        struct.pack(str('<I'), width - 1)[:3],
+        struct.pack(str('<I'), height - 1)[:3],
+    ])
+
+
+class TestSniffContentType(unittest.TestCase):
+    def test_sniff_content_type(self):
+        self.assertEqual(sniff_content_type(png_header()), 'image/png')
+        self.assertEqual(sniff_content_type(jpeg_header()), 'image/jpeg')
+        self.assertEqual(sniff_content_type(webp_header()), 'image/webp')
+        self.assertEqual(sniff_content_type(b'%PDF-1.4\n'), 'application/pdf')
+        self.assertIsNone(sniff_content_type(b'hello world'))
+        self.assertIsNone(sniff_content_type(b'\x00\x00\x00\x00\x00\x00\x00\x00WEBP'))
+
+
+class TestGetImageDimensions(unittest.TestCase):
+    def test_get_image_dimensions(self):
+        for header, content_type in [(png_header(), 'image/png'),
+                                     (gif_header(), 'image/gif'),
+                                     (jpeg_header(), 'image/jpeg'),
+                                     (bmp_header(), 'image/bmp'),
+                                     (webp_header(), 'image/webp')]:
+            self.assertEqual(get_image_dimensions(header), (content_type, 10, 20))
+
+    def test_get_image_dimensions_partial(self):
+        self.assertIsNone(get_image_dimensions(png_header()[:20]))
+        self.assertIsNone(get_image_dimensions(jpeg_header()[:25]))
+
+    def test_get_image_dimensions_invalid(self):
+        with self.assertRaises(ValueError):
+            get_image_dimensions(b'%PDF-1.4' + b'\x00' * 20)
+        with self.assertRaises(ValueError):
+            get_image_dimensions(png_header(width=0))
+        with self.assertRaises(ValueError):
+            get_image_dimensions(b'\xff\xd8\x00' + b'\x00' * 20)
+
+
+class TestStreamingUploadValidator(unittest.TestCase):
+    def test_max_size(self):
+        validator = StreamingUploadValidator(max_size=10)
+        validator.feed(b'a' * 5)
+
+        with self.assertRaises(UploadRejected) as e:
+            validator.feed(b'a' * 6)
+
+        self.assertEqual(e.exception.code, 'max_upload_size')
+        self.assertEqual(e.exception.params, {'max_upload_size': 10})
+
+    def test_content_type(self):
+        validator = StreamingUploadValidator(allowed_content_types=['application/pdf'])
+        validator.feed(b'%PDF-1.4' + b'\x00' * 20)
+
+        self.assertEqual(validator.content_type, 'application/pdf')
+        self.assertFalse(validator.needs_header)
+
+        validator = StreamingUploadValidator(allowed_content_types=['application/pdf'])
+        with self.assertRaises(UploadRejected) as e:
+            validator.feed(png_header())
+
+        self.assertEqual(e.exception.code, 'invalid_content_type')
+
+    def test_content_type_short_file(self):
+        validator = StreamingUploadValidator(allowed_content_types=['application/pdf'])
+        validator.feed(b'%PDF')
+
+        with self.assertRaises(UploadRejected):
+            validator.finish()
+
+    def test_image(self):
+        validator = StreamingUploadValidator(image=True)
+        header = jpeg_header()
+        validator.feed(header[:10])
+        validator.feed(header[10:])
+        validator.finish()
+
+        self.assertEqual((validator.width, validator.height), (10, 20))
+
+    def test_image_invalid(self):
+        validator = StreamingUploadValidator(image=True)
+        validator.feed(jpeg_header()[:10])
+
+        with self.assertRaises(UploadRejected) as e:
+            validator.finish()
+
+        self.assertEqual(e.exception.code, 'invalid_image')
+
+    def test_image_header_too_large(self):
+        validator = StreamingUploadValidator(image=True)
+        validator.max_header_size = 30
+        validator.feed(b'\xff\xd8\xff\xe1' + struct.pack(str('>H'), 1000))
+
+        with self.assertRaises(UploadRejected):
+            validator.feed(b'\x00' * 100)
+
+    def test_max_image_pixels(self):
+        validator = StreamingUploadValidator(image=True, max_image_pixels=100)
+
+        with self.assertRaises(UploadRejected) as e:
+            validator.feed(png_header())
+
+        self.assertEqual(e.exception.code, 'max_image_pixels')
+
+
+class TestStreamingValidationUploadHandler(unittest.TestCase):
+    def setUp(self):
+        super(TestStreamingValidationUploadHandler, self).setUp()
+
+        class Handler(StreamingValidationUploadHandler):
+            max_size = 10
+
+        self.request = mock.MagicMock(spec=[])
+        self.handler = Handler(self.request)
+        self.handler.new_file('document', 'foo.txt', 'text/plain', 100)
+
+    def test_receive_data_chunk(self):
+        self.assertEqual(self.handler.receive_data_chunk(b'hello', 0), b'hello')
+        self.assertIsNone(self.handler.file_complete(5))
+
+    def test_receive_data_chunk_rejected(self):
+        with self.assertRaises(SkipFile):
+            self.handler.receive_data_chunk(b'hello world', 0)
+
+        self.assertEqual(self.request.rejected_uploads['document'].code, 'max_upload_size')
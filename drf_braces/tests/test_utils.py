@@ -1,13 +1,17 @@
 from __future__ import absolute_import, print_function, unicode_literals
+import sys
 import unittest
 
 from rest_framework import fields
 
 from ..utils import (
+    LRUCache,
     find_class_args,
     find_function_args,
     get_attr_from_base_classes,
     get_class_name_with_new_suffix,
+    get_import_time_report,
+    get_memory_usage,
 )
 
 
@@ -71,3 +75,60 @@ class TestUtils(unittest.TestCase):
                 pass
 
         self.assertSetEqual(set(find_class_args(Foo)), {'a', 'b', 'c', 'd'})
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_get_set(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        self.assertEqual(cache.get('a'), 1)
+
+        cache.set('c', 3)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+
+    def test_get_or_set(self):
+        cache = LRUCache()
+
+        self.assertEqual(cache.get_or_set('a', lambda: 1), 1)
+        self.assertEqual(cache.get_or_set('a', lambda: 2), 1)
+
+    def test_pop_clear(self):
+        cache = LRUCache(maxsize=None)
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        self.assertEqual(cache.pop('a'), 1)
+        self.assertIsNone(cache.pop('a'))
+
+        cache.clear()
+
+        self.assertEqual(len(cache), 0)
+
+    def test_get_import_time_report(self):
+        if sys.version_info < (3, 7):
+            self.skipTest('Requires -X importtime')
+
+        report = get_import_time_report('colorsys')
+
+        self.assertEqual(report[-1].module, 'colorsys')
+        self.assertGreaterEqual(report[-1].cumulative, report[-1].self)
+
+    def test_get_import_time_report_failed(self):
+        with self.assertRaises(RuntimeError):
+            get_import_time_report('drf_braces_does_not_exist')
+
+    def test_get_memory_usage(self):
+        if sys.version_info < (3, 4):
+            self.skipTest('Requires tracemalloc')
+
+        result, usage = get_memory_usage(lambda n: [None] * n, n=100000)
+
+        self.assertEqual(len(result), 100000)
+        self.assertGreaterEqual(usage.retained, 8 * 100000)
+        self.assertGreaterEqual(usage.peak, usage.retained)
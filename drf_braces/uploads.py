@@ -0,0 +1,300 @@
+from __future__ import absolute_import, print_function, unicode_literals
+import struct
+
+import six
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+
+# (offset, magic bytes, content type)
+MAGIC_NUMBERS = [
+    (0, b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (0, b'GIF87a', 'image/gif'),
+    (0, b'GIF89a', 'image/gif'),
+    (0, b'\xff\xd8\xff', 'image/jpeg'),
+    (8, b'WEBP', 'image/webp'),
+    (0, b'BM', 'image/bmp'),
+    (0, b'II*\x00', 'image/tiff'),
+    (0, b'MM\x00*', 'image/tiff'),
+    (0, b'%PDF-', 'application/pdf'),
+    (0, b'PK\x03\x04', 'application/zip'),
+    (0, b'\x1f\x8b', 'application/gzip'),
+]
+
+# number of leading bytes required to sniff content type
+SNIFF_SIZE = 16
+
+IMAGE_CONTENT_TYPES = [
+    'image/bmp',
+    'image/gif',
+    'image/jpeg',
+    'image/png',
+    'image/webp',
+]
+
+# JPEG start-of-frame markers which contain image dimensions
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def sniff_content_type(header):
+    """
+    Guess content type from the leading bytes of a file.
+
+    Returns:
+        Content type (str) or ``None`` when it could not be determined.
+    """
+    for offset, magic, content_type in MAGIC_NUMBERS:
+        if header[offset:offset + len(magic)] == magic:
+            if content_type == 'image/webp' and header[:4] != b'RIFF':
+                continue
+            return content_type
+    return None
+
+
+def _get_jpeg_dimensions(header):
+    position = 2
+    while True:
+        if len(header) < position + 4:
+            return None
+        if six.indexbytes(header, position) != 0xFF:
+            raise ValueError('Invalid JPEG marker')
+
+        marker = six.indexbytes(header, position + 1)
+        # padding between markers
+        if marker == 0xFF:
+            position += 1
+            continue
+        # standalone markers without payload
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            position += 2
+            continue
+
+        if marker in JPEG_SOF_MARKERS:
+            if len(header) < position + 9:
+                return None
+            height, width = struct.unpack(str('>HH'), header[position + 5:position + 9])
+            return width, height
+
+        length, = struct.unpack(str('>H'), header[position + 2:position + 4])
+        if length < 2:
+            raise ValueError('Invalid JPEG segment length')
+        position += 2 + length
+
+
+def _get_webp_dimensions(header):
+    if len(header) < 30:
+        return None
+
+    chunk = header[12:16]
+    if chunk == b'VP8X':
+        width, = struct.unpack(str('<I'), header[24:27] + b'\x00')
+        height, = struct.unpack(str('<I'), header[27:30] + b'\x00')
+        return width + 1, height + 1
+    elif chunk == b'VP8L':
+        bits, = struct.unpack(str('<I'), header[21:25])
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    elif chunk == b'VP8 ':
+        if header[23:26] != b'\x9d\x01\x2a':
+            raise ValueError('Invalid VP8 frame')
+        width, height = struct.unpack(str('<HH'), header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+
+    raise ValueError('Unsupported WEBP chunk')
+
+
+def get_image_dimensions(header):
+    """
+    Get image dimensions by only parsing image header.
+
+    Unlike decoding the image, this only requires leading bytes
+    of the file so it can be done while the file is being uploaded.
+
+    Args:
+        header (bytes): Leading bytes of the image file
+
+    Returns:
+        ``(content_type, width, height)`` tuple or ``None`` when
+        more bytes are needed to determine the dimensions.
+
+    Raises:
+        ValueError: When header is not a header of a supported image.
+    """
+    if len(header) < SNIFF_SIZE:
+        return None
+
+    content_type = sniff_content_type(header)
+    dimensions = None
+
+    if content_type == 'image/png':
+        if len(header) < 24:
+            return None
+        if header[12:16] != b'IHDR':
+            raise ValueError('Invalid PNG header')
+        dimensions = struct.unpack(str('>II'), header[16:24])
+
+    elif content_type == 'image/gif':
+        dimensions = struct.unpack(str('<HH'), header[6:10])
+
+    elif content_type == 'image/bmp':
+        if len(header) < 26:
+            return None
+        dib_size, = struct.unpack(str('<I'), header[14:18])
+        if dib_size == 12:
+            dimensions = struct.unpack(str('<HH'), header[18:22])
+        else:
+            width, height = struct.unpack(str('<ii'), header[18:26])
+            dimensions = width, abs(height)
+
+    elif content_type == 'image/jpeg':
+        dimensions = _get_jpeg_dimensions(header)
+
+    elif content_type == 'image/webp':
+        dimensions = _get_webp_dimensions(header)
+
+    else:
+        raise ValueError('Unsupported image type')
+
+    if dimensions is None:
+        return None
+
+    width, height = dimensions
+    if width <= 0 or height <= 0:
+        raise ValueError('Invalid image dimensions')
+
+    return content_type, width, height
+
+
+class UploadRejected(Exception):
+    """
+    Raised by ``StreamingUploadValidator`` when an upload is not valid.
+
+    ``code`` matches error message code of the streaming file fields.
+    """
+
+    def __init__(self, code, **params):
+        super(UploadRejected, self).__init__(code)
+        self.code = code
+        self.params = params
+
+
+class StreamingUploadValidator(object):
+    """
+    Incrementally validates upload as its chunks are received.
+
+    Validation is done by only looking at each chunk once
+    hence any invalid upload is rejected as soon as possible
+    without needing to buffer the whole file.
+
+    Args:
+        max_size (int): Maximum allowed size of the upload in bytes
+        allowed_content_types (list): Content types allowed to be uploaded
+            as detected by the leading bytes of the file
+        image (bool): Whether upload must be an image with valid header
+        max_image_pixels (int): Maximum number of pixels allowed in the image
+    """
+    # maximum amount of bytes buffered to find image dimensions
+    # which allows for some metadata before the image frame
+    max_header_size = 256 * 1024
+
+    def __init__(self, max_size=None, allowed_content_types=None, image=False, max_image_pixels=None):
+        self.max_size = max_size
+        self.allowed_content_types = allowed_content_types
+        self.image = image
+        self.max_image_pixels = max_image_pixels
+
+        self.size = 0
+        self.content_type = None
+        self.width = None
+        self.height = None
+        self._header = b''
+
+    @property
+    def needs_header(self):
+        if self.content_type is None and self.allowed_content_types is not None:
+            return True
+        return self.image and self.width is None
+
+    def feed(self, chunk):
+        self.size += len(chunk)
+        if self.max_size is not None and self.size > self.max_size:
+            raise UploadRejected('max_upload_size', max_upload_size=self.max_size)
+
+        if self.needs_header:
+            self._header += chunk[:self.max_header_size - len(self._header)]
+            self.validate_header(final=False)
+
+    def finish(self):
+        if self.needs_header:
+            self.validate_header(final=True)
+        self._header = b''
+
+    def validate_header(self, final):
+        header = self._header
+        final = final or len(header) >= self.max_header_size
+
+        if self.content_type is None and (len(header) >= SNIFF_SIZE or final):
+            self.content_type = sniff_content_type(header) or ''
+            if self.allowed_content_types is not None and self.content_type not in self.allowed_content_types:
+                raise UploadRejected('invalid_content_type', content_type=self.content_type)
+
+        if not self.image:
+            return
+
+        try:
+            dimensions = get_image_dimensions(header)
+        except ValueError:
+            raise UploadRejected('invalid_image')
+
+        if dimensions is None:
+            if final:
+                raise UploadRejected('invalid_image')
+            return
+
+        _, self.width, self.height = dimensions
+        if self.max_image_pixels is not None and self.width * self.height > self.max_image_pixels:
+            raise UploadRejected('max_image_pixels', max_image_pixels=self.max_image_pixels)
+
+
+class StreamingValidationUploadHandler(FileUploadHandler):
+    """
+    Upload handler which rejects invalid uploads while they are being received.
+
+    Size and content type limits are checked on each received chunk
+    and as soon as an upload is invalid, the rest of it is skipped
+    without being buffered by the subsequent upload handlers.
+    Therefore this handler must be placed first in ``FILE_UPLOAD_HANDLERS``
+    or ``request.upload_handlers``.
+
+    Skipped uploads are recorded in ``request.rejected_uploads``
+    which streaming file fields then use to report validation errors.
+
+    Configure limits by subclassing::
+
+        class DocumentUploadHandler(StreamingValidationUploadHandler):
+            max_size = 10 * 1024 * 1024
+            allowed_content_types = ['application/pdf']
+    """
+    max_size = None
+    allowed_content_types = None
+
+    def get_validator(self):
+        return StreamingUploadValidator(
+            max_size=self.max_size,
+            allowed_content_types=self.allowed_content_types,
+        )
+
+    def new_file(self, *args, **kwargs):
+        super(StreamingValidationUploadHandler, self).new_file(*args, **kwargs)
+        self.validator = self.get_validator()
+
+    def receive_data_chunk(self, raw_data, start):
+        try:
+            self.validator.feed(raw_data)
+        except UploadRejected as e:
+            if not hasattr(self.request, 'rejected_uploads'):
+                self.request.rejected_uploads = {}
+            self.request.rejected_uploads[self.field_name] = e
+            raise SkipFile
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
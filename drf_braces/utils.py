@@ -1,10 +1,20 @@
 from __future__ import absolute_import, print_function, unicode_literals
 import inspect
 import itertools
+import subprocess
+import sys
+import threading
+from collections import OrderedDict, namedtuple
 
 
 IGNORE_ARGS = ['self', 'cls']
 
+IMPORT_TIME_MARKER = 'drf-braces-import-time-marker'
+
+ImportTime = namedtuple('ImportTime', ['module', 'self', 'cumulative'])
+
+MemoryUsage = namedtuple('MemoryUsage', ['retained', 'peak'])
+
 
 def find_function_args(func):
     """
@@ -203,3 +213,152 @@ def reduce_attr_dict_from_instance(self, getter, default=None):
     data.update(getter(self) or {})
 
     return data
+
+
+class LRUCache(object):
+    """
+    Simple thread-safe least-recently-used cache.
+
+    Once the cache holds ``maxsize`` entries, adding a new entry
+    evicts the entry which was used least recently.
+
+    Args:
+        maxsize (int): Maximum number of entries to keep in the cache.
+            ``None`` makes the cache unbounded.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return default
+            # reinsert to mark key as most recently used
+            self._data[key] = value
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            self._evict()
+
+    def get_or_set(self, key, factory):
+        """
+        Get value for the ``key`` or store result of ``factory()`` when missing.
+        """
+        with self._lock:
+            missing = object()
+            value = self.get(key, missing)
+            if value is missing:
+                value = factory()
+                self.set(key, value)
+            return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def _evict(self):
+        if self.maxsize is None:
+            return
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+def get_import_time_report(module, setup=None, executable=sys.executable, env=None):
+    """
+    Get per-module import cost of importing ``module`` in a fresh interpreter.
+
+    Uses ``python -X importtime`` hence requires Python 3.7+.
+    Only modules which are imported by ``module`` itself are reported
+    so any modules already imported by ``setup`` code are excluded.
+
+    Args:
+        module (str): Dotted path of the module to import
+        setup (str): Python code executed before importing ``module``
+            such as ``django.setup()``
+        executable (str): Python executable to use
+        env (dict): Environment variables for the interpreter
+
+    Returns:
+        List of ``ImportTime(module, self, cumulative)`` tuples
+        (times in microseconds) in the order imports completed
+        hence ``module`` itself is last.
+    """
+    code = '\n'.join([
+        setup or '',
+        'import sys',
+        'sys.stderr.write({!r})'.format(IMPORT_TIME_MARKER + '\n'),
+        'import {}'.format(module),
+        'sys.stderr.write({!r})'.format(IMPORT_TIME_MARKER + '\n'),
+    ])
+    process = subprocess.Popen(
+        [executable, '-X', 'importtime', '-c', code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+    )
+    _, stderr = process.communicate()
+    stderr = stderr.decode('utf-8')
+
+    if process.returncode:
+        raise RuntimeError(
+            'Importing {} failed:\n{}'.format(module, stderr)
+        )
+
+    lines = stderr.split(IMPORT_TIME_MARKER)[1].splitlines()
+    report = []
+    for line in lines:
+        if not line.startswith('import time:'):
+            continue
+        parts = line.split(':', 1)[1].split('|')
+        try:
+            report.append(ImportTime(parts[2].strip(), int(parts[0]), int(parts[1])))
+        except (IndexError, ValueError):
+            continue
+
+    return report
+
+
+def get_memory_usage(func, *args, **kwargs):
+    """
+    Measure memory allocated by Python while calling ``func``.
+
+    Uses ``tracemalloc`` hence requires Python 3.4+
+    and cannot be used while ``tracemalloc`` is already tracing.
+
+    Returns:
+        ``(result, MemoryUsage(retained, peak))`` tuple where
+        ``retained`` is number of bytes still allocated after the call
+        (mostly the result itself) and ``peak`` is maximum number
+        of bytes allocated during the call.
+    """
+    import tracemalloc
+
+    if tracemalloc.is_tracing():
+        raise RuntimeError('tracemalloc is already tracing')
+
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, MemoryUsage(retained, peak)